@@ -0,0 +1,127 @@
+"""Gunicorn configuration.
+
+The application is loaded and warmed up in the master, workers are forked
+from it sharing the warmed up memory. Memory of the master and of every
+worker is logged, after the fork and after the first request, to see the
+pages they share. Workers send their queued error reports on exit.
+
+Live task lists hold a thread of a worker per open stream, so workers
+serve requests with threads, at most TASK_EVENTS_MAX_STREAMS of them
+stream at once. Workers relay task events to each other
+through sockets of TASK_EVENTS_SOCKET_DIR, a new temporary directory of
+the master unless it is set. Several workers need a cache they share,
+without one a single worker is started.
+"""
+import os
+import tempfile
+
+bind = '0.0.0.0:{port}'.format(port=os.getenv('PORT', '8000'))
+workers = int(os.getenv('WEB_CONCURRENCY', '2'))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+preload_app = True
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '0'))
+max_requests_jitter = max_requests // 10
+
+if not os.getenv('TASK_EVENTS_SOCKET_DIR'):
+    os.environ['TASK_EVENTS_SOCKET_DIR'] = tempfile.mkdtemp(
+        prefix='task-events-',
+    )
+
+
+def _log_memory(log, process: str) -> None:
+    from task_manager.warmup import get_memory_usage  # noqa: WPS433
+
+    usage = get_memory_usage()
+    if usage:
+        log.info(
+            'Memory of %s (pid %s): rss %s kB, pss %s kB, shared %s kB, '
+            'private %s kB',
+            process,
+            os.getpid(),
+            usage['rss'],
+            usage['pss'],
+            usage['shared'],
+            usage['private'],
+        )
+
+
+def on_starting(server) -> None:
+    """
+    Start one worker only with a cache of a single process.
+
+    Args:
+        server: arbiter
+    """
+    from django.conf import settings  # noqa: WPS433
+
+    if server.cfg.workers > 1 and not settings.CACHE_SHARED:
+        server.log.warning(
+            'Workers do not share %s, starting one worker instead of %s; '
+            'set CACHE_BACKEND to a shared cache for more',
+            settings.CACHES['default']['BACKEND'],
+            server.cfg.workers,
+        )
+        # Kept on reload, which reads the workers from the configuration.
+        server.cfg.set('workers', 1)
+        server.num_workers = 1
+
+
+def when_ready(server) -> None:
+    """
+    Warm up the preloaded application before the workers are forked.
+
+    Args:
+        server: arbiter
+    """
+    from task_manager.warmup import warm_up  # noqa: WPS433
+
+    _log_memory(server.log, 'master before warm-up')
+    report = warm_up()
+    server.log.info(
+        'Warmed up %s templates, %s URL names, %s languages',
+        report.templates,
+        report.urls,
+        report.languages,
+    )
+    _log_memory(server.log, 'master after warm-up')
+
+
+def post_fork(server, worker) -> None:
+    """
+    Log memory of a new worker.
+
+    Args:
+        server: arbiter
+        worker: forked worker
+    """
+    _log_memory(server.log, 'worker after fork')
+
+
+def post_request(worker, req, environ, resp) -> None:
+    """
+    Log memory of a worker after its first request.
+
+    Args:
+        worker: worker
+        req: request
+        environ: WSGI environment
+        resp: response
+    """
+    if worker.nr == 1:
+        _log_memory(worker.log, 'worker after first request')
+
+
+def worker_exit(server, worker) -> None:
+    """
+    Send error reports queued by the exiting worker, remove its socket.
+
+    Args:
+        server: arbiter
+        worker: exiting worker
+    """
+    from task_manager.error_reporting import flush  # noqa: WPS433
+    from task_manager.tasks import events  # noqa: WPS433
+
+    flush()
+    events.close()
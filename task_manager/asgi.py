@@ -9,8 +9,25 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 
 import os
 
+from asgiref.sync import ThreadSensitiveContext
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_manager.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+
+async def application(scope, receive, send) -> None:
+    """
+    Serve a request, its synchronous code in a thread of its own.
+
+    Django 3.2 otherwise runs the synchronous code of all requests, e.g.
+    of synchronous middleware, in one shared thread.
+
+    Args:
+        scope: connection scope
+        receive: awaitable of events
+        send: awaitable sending events
+    """
+    async with ThreadSensitiveContext():
+        await django_application(scope, receive, send)
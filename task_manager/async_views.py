@@ -0,0 +1,223 @@
+"""Coroutine views running independent reads concurrently.
+
+The ORM is synchronous, so every read runs through sync_to_async(). The
+reads of a page which do not depend on each other, like the page itself
+and the reference rows, run at once in threads of an executor of the
+process, each on the connection of its thread. The
+threads live as long as the process, so their connections are reused up
+to CONN_MAX_AGE like those of request threads; under WSGI the event loop,
+and with it its default executor, lasts one request only. Execute
+wrappers of the request thread, e.g. of the Server-Timing header and of
+the slow query log, are applied to these connections too.
+
+Within a transaction, e.g. of a test case, the reads run one after
+another in the request thread: connections of other threads would not
+see its writes.
+"""
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.http import HttpResponse
+from task_manager.mixins import ConditionalGetMixin
+from task_manager.server_timing import get_timings
+
+ExecuteWrappers = Dict[str, List[Callable[..., Any]]]
+
+_executors: Dict[int, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Get the executor of concurrent reads of the process.
+
+    Returns:
+        ThreadPoolExecutor:
+    """
+    pid = os.getpid()
+    with _executors_lock:
+        if pid not in _executors:
+            # Threads of a parent process do not exist after a fork.
+            _executors.clear()
+            _executors[pid] = ThreadPoolExecutor(
+                max_workers=settings.CONCURRENT_READ_THREADS,
+                thread_name_prefix='concurrent-reads',
+            )
+        return _executors[pid]
+
+
+def _get_connections_state() -> Tuple[bool, ExecuteWrappers]:
+    in_transaction = False
+    wrappers: ExecuteWrappers = {}
+    for connection in connections.all():
+        in_transaction = in_transaction or connection.in_atomic_block
+        wrappers[connection.alias] = list(connection.execute_wrappers)
+    return in_transaction, wrappers
+
+
+def _run_in_worker(func: Callable[[], Any], wrappers: ExecuteWrappers) -> Any:
+    # Connections of the worker are kept or closed like by a request.
+    close_old_connections()
+    try:  # noqa: WPS501
+        with ExitStack() as stack:
+            for alias, alias_wrappers in wrappers.items():
+                for wrapper in alias_wrappers:
+                    stack.enter_context(
+                        connections[alias].execute_wrapper(wrapper),
+                    )
+            return func()
+    finally:
+        close_old_connections()
+
+
+async def run_concurrently(*funcs: Callable[[], Any]) -> List[Any]:
+    """
+    Run synchronous callables concurrently.
+
+    Args:
+        funcs: callables without arguments
+
+    Returns:
+        List: results in the order of the callables
+    """
+    in_transaction, wrappers = await sync_to_async(_get_connections_state)()
+    if in_transaction:
+        return [await sync_to_async(func)() for func in funcs]
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+    # The context carries the active language and the like to the threads.
+    return list(await asyncio.gather(*(
+        loop.run_in_executor(
+            executor,
+            contextvars.copy_context().run,
+            _run_in_worker,
+            func,
+            wrappers,
+        )
+        for func in funcs
+    )))
+
+
+class AsyncConditionalGetMixin(ConditionalGetMixin):
+    """
+    Answer GET and HEAD with a coroutine, other methods synchronously.
+
+    The validators are probed first, like by ConditionalGetMixin.get(), so
+    a client which has the page gets 304 without it. Otherwise the page is
+    built and rendered concurrently with the loads of
+    get_concurrent_loads().
+    """
+
+    async_method_names = ('get', 'head')
+
+    @classmethod
+    def as_view(cls, **initkwargs) -> Callable[..., Any]:
+        """
+        Get the view, marked as a coroutine function for the handler.
+
+        Args:
+            initkwargs: attributes of the view instances
+
+        Returns:
+            Callable:
+        """
+        return markcoroutinefunction(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs) -> Any:
+        """
+        Dispatch, checking the access like the view would.
+
+        Args:
+            request: http request
+            args: positional arguments of the URL
+            kwargs: keyword arguments of the URL
+
+        Returns:
+            Any:
+        """
+        if request.method.lower() not in self.async_method_names:
+            return await sync_to_async(super().dispatch)(
+                request, *args, **kwargs,
+            )
+        response = await sync_to_async(self.get_denied_response)(request)
+        if response is not None:
+            return response
+        return await self.get_async(request, *args, **kwargs)
+
+    def get_denied_response(self, request) -> Optional[HttpResponse]:
+        """
+        Load the user for the concurrent reads, check the access.
+
+        Args:
+            request: http request
+
+        Returns:
+            Optional: None if the access is granted
+        """
+        request.user.is_authenticated  # noqa: WPS428
+        check_access = getattr(self, 'check_access', None)
+        return None if check_access is None else check_access(request)
+
+    def get_concurrent_loads(self) -> Sequence[Callable[[], Any]]:
+        """
+        Get reads independent of the page, e.g. warming caches it reads.
+
+        Returns:
+            Sequence: callables without arguments
+        """
+        return ()
+
+    def render_page(self, request, *args, **kwargs) -> Any:
+        """
+        Get the page rendered, its lazy queries included.
+
+        The rendering is timed for the Server-Timing header, the handler
+        gets the response rendered already.
+
+        Args:
+            request: http request
+            args: positional arguments of the URL
+            kwargs: keyword arguments of the URL
+
+        Returns:
+            Any:
+        """
+        response = self.get_page(request, *args, **kwargs)
+        if callable(getattr(response, 'render', None)):
+            timings = get_timings(request)
+            if timings is not None:
+                timings.start_template(response)
+            response.render()
+        return response
+
+    async def get_async(self, request, *args, **kwargs) -> Any:
+        """
+        Render the page unless the client has it.
+
+        Args:
+            request: http request
+            args: positional arguments of the URL
+            kwargs: keyword arguments of the URL
+
+        Returns:
+            Any:
+        """
+        validators = await sync_to_async(self.get_page_validators)()
+        response = self.get_not_modified_response(*validators)
+        if response is None:
+            page = functools.partial(
+                self.render_page, request, *args, **kwargs,
+            )
+            response = (await run_concurrently(
+                page, *self.get_concurrent_loads(),
+            ))[0]
+        return self.set_validators(response, *validators)
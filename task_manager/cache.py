@@ -0,0 +1,109 @@
+"""Versioned cache namespaces.
+
+Versions in a shared cache are kept until they are evicted. A process
+local cache does not see the bumps of the other processes, so there they
+expire after CACHE_VERSION_TIMEOUT seconds, which bounds how long the
+entries of a namespace stay stale.
+"""
+import hashlib
+import time
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = 'version:{namespace}'
+
+
+def _initial_version() -> int:
+    # Start from a timestamp, so a version evicted from the cache is never
+    # reissued while entries stored under it are still alive.
+    return int(time.time() * 1000)  # noqa: WPS432
+
+
+def _get_version_timeout() -> Optional[int]:
+    if settings.CACHE_SHARED:
+        return None
+    return settings.CACHE_VERSION_TIMEOUT
+
+
+def get_version(namespace: str) -> int:
+    """
+    Get current version of the namespace.
+
+    Args:
+        namespace: cache namespace
+
+    Returns:
+        int:
+    """
+    return cache.get_or_set(
+        VERSION_KEY.format(namespace=namespace),
+        _initial_version,
+        timeout=_get_version_timeout(),
+    )
+
+
+def get_versions(namespaces: Iterable[str]) -> Dict[str, int]:
+    """
+    Get current versions of several namespaces with one cache round trip.
+
+    Args:
+        namespaces: cache namespaces
+
+    Returns:
+        Dict: version by namespace
+    """
+    keys = {
+        VERSION_KEY.format(namespace=namespace): namespace
+        for namespace in namespaces
+    }
+    found = cache.get_many(keys)
+    missing = {key: _initial_version() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, timeout=_get_version_timeout())
+        found.update(missing)
+    return {keys[key]: version for key, version in found.items()}
+
+
+def _incr_version(namespace: str) -> None:
+    key = VERSION_KEY.format(namespace=namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), timeout=_get_version_timeout())
+
+
+def bump_version(namespace: str) -> None:
+    """
+    Invalidate all entries of the namespace.
+
+    The version is bumped right away and once more after the transaction
+    commits, so a reader which cached rows between the write and the commit
+    does not keep them.
+
+    Args:
+        namespace: cache namespace
+    """
+    _incr_version(namespace)
+    transaction.on_commit(lambda: _incr_version(namespace))
+
+
+def make_key(namespace: str, *parts) -> str:
+    """
+    Build a key of the current namespace version.
+
+    Args:
+        namespace: cache namespace
+        parts: parts identifying the entry
+
+    Returns:
+        str:
+    """
+    digest = hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()
+    return '{namespace}:{version}:{digest}'.format(
+        namespace=namespace,
+        version=get_version(namespace),
+        digest=digest,
+    )
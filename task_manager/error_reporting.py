@@ -0,0 +1,290 @@
+"""Error reporting to Rollbar off the request thread.
+
+ErrorReportingMiddleware takes the place of RollbarNotifierMiddleware: the
+failing request only snapshots its data and puts the occurrence into a
+bounded queue, a background thread of the process sends it. The thread
+collects occurrences for ERROR_REPORT_FLUSH_INTERVAL seconds, up to
+ERROR_REPORT_BATCH_SIZE of them, and sends one item per fingerprint, the
+exception class and the line it was raised from, with the count of its
+occurrences. When the queue of ERROR_REPORT_QUEUE_SIZE occurrences is full
+new ones are dropped and counted, a slow endpoint never stalls requests.
+The queue is flushed when the process exits, gunicorn workers flush it in
+the worker_exit hook.
+"""
+import atexit
+import hashlib
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import rollbar
+from django.conf import settings
+from django.http import Http404
+from rollbar.contrib.django.middleware import (  # noqa: WPS450
+    RollbarNotifierMiddleware,
+    _should_ignore_404,
+)
+
+logger = logging.getLogger('task_manager.error_reporting')
+
+# Marks the end of the queue, put by close().
+STOP = None
+
+
+class Occurrence(NamedTuple):
+    """Exception of a request with the request data."""
+
+    fingerprint: str
+    exc_info: Tuple[Any, ...]
+    payload_data: Dict[str, Any]
+
+
+def get_fingerprint(exc_info: Tuple[Any, ...]) -> str:
+    """
+    Get the fingerprint of an exception.
+
+    Args:
+        exc_info: exception class, instance and traceback
+
+    Returns:
+        str: hash of the exception class and of the innermost frame
+    """
+    exc_type, _exc, trace = exc_info
+    location = ''
+    while trace is not None:
+        location = '{file}:{line}'.format(
+            file=trace.tb_frame.f_code.co_filename, line=trace.tb_lineno,
+        )
+        trace = trace.tb_next
+    source = '{module}.{name}@{location}'.format(
+        module=exc_type.__module__,
+        name=exc_type.__qualname__,
+        location=location,
+    )
+    return hashlib.sha1(source.encode()).hexdigest()  # noqa: S303
+
+
+def send_to_rollbar(occurrence: Occurrence, count: int) -> None:
+    """
+    Send an occurrence to Rollbar, blocking until it is posted.
+
+    Args:
+        occurrence: first occurrence of its fingerprint in the batch
+        count: occurrences of the fingerprint in the batch
+    """
+    rollbar.report_exc_info(
+        occurrence.exc_info,
+        extra_data={'occurrences': count},
+        payload_data=dict(
+            occurrence.payload_data, fingerprint=occurrence.fingerprint,
+        ),
+    )
+
+
+class ErrorReporter(object):
+    """Bounded queue of occurrences sent in batches by a thread."""
+
+    def __init__(
+        self,
+        max_size: int,
+        batch_size: int,
+        flush_interval: float,
+        send: Callable[[Occurrence, int], None] = send_to_rollbar,
+    ):
+        """
+        Init reporter, its thread is started by the first report.
+
+        Args:
+            max_size: occurrences waiting in the queue
+            batch_size: occurrences deduplicated at once
+            flush_interval: seconds occurrences are collected for
+            send: callable sending an occurrence with its count
+        """
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.send = send
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(max_size)
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def report(
+        self,
+        exc_info: Tuple[Any, ...],
+        payload_data: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Queue an occurrence without waiting.
+
+        Args:
+            exc_info: exception class, instance and traceback
+            payload_data: data merged into the item
+
+        Returns:
+            bool: False when the queue is full and it is dropped
+        """
+        self._start()
+        occurrence = Occurrence(
+            fingerprint=get_fingerprint(exc_info),
+            exc_info=exc_info,
+            payload_data=payload_data or {},
+        )
+        try:
+            self._queue.put_nowait(occurrence)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        return True
+
+    def close(self, timeout: float) -> None:
+        """
+        Send the queued occurrences and stop the thread.
+
+        Args:
+            timeout: seconds to wait for the thread
+        """
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put(STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning('Error reports are not flushed, the queue is full')
+            return
+        thread.join(timeout)
+        self._pid = None
+
+    def _start(self) -> None:
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            # The thread of a parent process does not exist after a fork.
+            self._queue = queue.Queue(self.max_size)
+            self._thread = threading.Thread(
+                target=self._run, name='error-reporter', daemon=True,
+            )
+            self._thread.start()
+            self._pid = pid
+
+    def _run(self) -> None:
+        stopped = False
+        while not stopped:
+            batch = self._collect()
+            stopped = STOP in batch
+            self._send_batch([
+                occurrence for occurrence in batch if occurrence is not STOP
+            ])
+
+    def _collect(self) -> List[Optional[Occurrence]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while batch[-1] is not STOP and len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _send_batch(self, batch: List[Occurrence]) -> None:
+        groups: Dict[str, List[Occurrence]] = OrderedDict()
+        for occurrence in batch:
+            groups.setdefault(occurrence.fingerprint, []).append(occurrence)
+        for occurrences in groups.values():
+            try:
+                self.send(occurrences[0], len(occurrences))
+            except Exception:
+                logger.exception('Error report is not sent')
+        with self._lock:
+            dropped = self.dropped
+            self.dropped = 0
+        if dropped:
+            logger.warning(
+                'Dropped %s error reports, the queue was full', dropped,
+            )
+
+
+_reporters: List[ErrorReporter] = []
+
+
+def get_reporter() -> ErrorReporter:
+    """
+    Get the reporter of the process, created from settings.
+
+    Returns:
+        ErrorReporter:
+    """
+    if not _reporters:
+        _reporters.append(ErrorReporter(
+            max_size=settings.ERROR_REPORT_QUEUE_SIZE,
+            batch_size=settings.ERROR_REPORT_BATCH_SIZE,
+            flush_interval=settings.ERROR_REPORT_FLUSH_INTERVAL,
+        ))
+    return _reporters[0]
+
+
+@atexit.register
+def flush() -> None:
+    """Send the queued occurrences of the process reporter."""
+    for reporter in _reporters:
+        reporter.close(settings.ERROR_REPORT_SHUTDOWN_TIMEOUT)
+
+
+def get_request_data(request) -> Dict[str, Any]:
+    """
+    Snapshot the data of a request, it is gone when the item is sent.
+
+    Args:
+        request: http request
+
+    Returns:
+        Dict: request, person and context of the item
+    """
+    data: Dict[str, Any] = {
+        'framework': 'django',
+        'request': {
+            'url': request.build_absolute_uri(),
+            'method': request.method,
+            'GET': request.GET.dict(),
+            'POST': request.POST.dict(),
+            'user_ip': request.META.get('REMOTE_ADDR'),
+            'headers': dict(request.headers),
+        },
+    }
+    match = getattr(request, 'resolver_match', None)
+    if match is not None:
+        data['context'] = match.url_name
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        data['person'] = {'id': str(user.pk), 'username': user.username}
+    return data
+
+
+class ErrorReportingMiddleware(RollbarNotifierMiddleware):
+    """Report exceptions of views through the reporter queue."""
+
+    def process_exception(self, request, exc) -> None:
+        """
+        Queue the exception of the view.
+
+        Args:
+            request: http request
+            exc: exception
+        """
+        path = request.get_full_path()
+        if isinstance(exc, Http404) and _should_ignore_404(path):
+            return
+        get_reporter().report(sys.exc_info(), get_request_data(request))
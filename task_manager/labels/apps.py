@@ -7,3 +7,7 @@ class LabelsConfig(AppConfig):
 
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'task_manager.labels'
+
+    def ready(self) -> None:
+        """Connect signals."""
+        from task_manager.labels import signals  # noqa: F401, WPS433
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 19:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0002_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='label',
+            name='task_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
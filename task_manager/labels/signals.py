@@ -0,0 +1,33 @@
+"""Labels signals."""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from task_manager.cache import bump_version
+from task_manager.labels.models import Label
+from task_manager.paginators import get_count_namespace
+from task_manager.reference import invalidate_reference
+
+
+@receiver(post_save, sender=Label)
+@receiver(post_delete, sender=Label)
+def invalidate_labels_count(sender, **kwargs) -> None:
+    """
+    Invalidate cached counts of labels lists.
+
+    Args:
+        sender: model class
+        kwargs: signal arguments
+    """
+    bump_version(get_count_namespace(Label))
+
+
+@receiver(post_save, sender=Label)
+@receiver(post_delete, sender=Label)
+def invalidate_labels_reference(sender, **kwargs) -> None:
+    """
+    Drop cached labels rows.
+
+    Args:
+        sender: model class
+        kwargs: signal arguments
+    """
+    invalidate_reference(Label)
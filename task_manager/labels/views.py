@@ -1,30 +1,35 @@
 """Statuses views."""
-from typing import Union
-
-from django.contrib import messages
 from django.contrib.messages.views import SuccessMessageMixin
-from django.db.models.deletion import ProtectedError
-from django.http.response import (
-    HttpResponsePermanentRedirect,
-    HttpResponseRedirect,
-)
-from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views.generic.edit import CreateView, DeleteView, UpdateView
 from django.views.generic.list import ListView
 from task_manager.labels.forms import LabelForm
 from task_manager.labels.models import Label
-from task_manager.mixins import CustomLoginRequiredMixin
+from task_manager.mixins import (
+    CachedCountPaginationMixin,
+    ConditionalGetMixin,
+    CustomLoginRequiredMixin,
+    InUseListMixin,
+    ProtectedDeleteMixin,
+)
+from task_manager.tasks.models import TaskLabelRelated
 
 
-class LabelListView(CustomLoginRequiredMixin, ListView):
+class LabelListView(  # noqa: WPS215
+    CustomLoginRequiredMixin,
+    InUseListMixin,
+    ConditionalGetMixin,
+    CachedCountPaginationMixin,
+    ListView,
+):
     """Label listing."""
 
     model = Label
     paginate_by = 10
     context_object_name = 'labels_list'
     template_name = 'labels/index.html'
+    in_use_relations = ((TaskLabelRelated, 'label'),)
 
 
 class LabelCreateView(
@@ -54,8 +59,9 @@ class LabelUpdateView(
     success_message = _('SuccessUpdateLabel')
 
 
-class LabelDeleteView(
+class LabelDeleteView(  # noqa: WPS215
     CustomLoginRequiredMixin,
+    ProtectedDeleteMixin,
     SuccessMessageMixin,
     DeleteView,
 ):
@@ -66,24 +72,6 @@ class LabelDeleteView(
     template_name = 'labels/delete.html'
     success_url = reverse_lazy('labels')
     success_message = _('SuccessDeleteLabel')
-
-    def post(self, request, *args, **kwargs) -> Union[
-        HttpResponsePermanentRedirect,
-        HttpResponseRedirect,
-    ]:
-        """
-        Override 'post' in DeletionMixin.
-
-        Args:
-            request: request
-
-        Returns:
-            Union:
-        """
-        try:
-            response = self.delete(request, *args, **kwargs)
-            messages.success(self.request, self.success_message)
-            return response
-        except ProtectedError:
-            messages.error(self.request, _('CannotDeleteLabel'))
-            return redirect('labels')
+    in_use_relations = LabelListView.in_use_relations
+    protected_message = _('CannotDeleteLabel')
+    protected_url = reverse_lazy('labels')
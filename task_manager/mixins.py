@@ -1,12 +1,64 @@
 """Mixins."""
-from typing import Any
+import hashlib
+import operator
+from functools import reduce
+from typing import Any, List, Optional, Sequence, Tuple, Type
 
 from django.conf import settings
 from django.contrib import messages
+from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.http import HttpResponseRedirect
+from django.core.paginator import InvalidPage
+from django.db import models
+from django.db.models.deletion import ProtectedError
+from django.http import Http404, HttpResponse, HttpResponseRedirect
+from django.middleware.csrf import get_token
 from django.shortcuts import redirect
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.utils.translation import get_language
 from django.utils.translation import gettext_lazy as _
+from task_manager.cache import get_version, make_key
+from task_manager.labels.models import Label
+from task_manager.paginators import (
+    MODE_KEYSET,
+    CachedCountPaginator,
+    KeysetPaginator,
+    get_count_namespace,
+)
+from task_manager.reference import get_reference_generation
+from task_manager.request_cache import memoize
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Tasks
+
+# Models with the foreign key referencing the objects with PROTECT.
+Relations = Sequence[Tuple[Type[models.Model], str]]
+
+
+def annotate_in_use(queryset: Any, relations: Relations) -> Any:
+    """
+    Annotate 'in_use', whether rows of the relations reference the objects.
+
+    Every relation is an EXISTS subquery, served by the index leading with
+    its foreign key.
+
+    Args:
+        queryset: objects
+        relations: models with the foreign key referencing the objects
+
+    Returns:
+        Any: queryset
+    """
+    conditions = [
+        models.Q(models.Exists(
+            model.objects.filter(**{field: models.OuterRef('pk')}),
+        ))
+        for model, field in relations
+    ]
+    return queryset.annotate(in_use=models.ExpressionWrapper(
+        reduce(operator.or_, conditions),
+        output_field=models.BooleanField(),
+    ))
 
 
 class CustomLoginRequiredMixin(LoginRequiredMixin):
@@ -14,23 +66,58 @@ class CustomLoginRequiredMixin(LoginRequiredMixin):
 
     redirect_field_name = ''
 
-    def dispatch(self, request, *args, **kwargs) -> Any:
+    def check_access(self, request) -> Optional[HttpResponseRedirect]:
         """
-        Dispatch.
+        Redirect an anonymous user to the login page.
 
         Args:
             request:
 
         Returns:
-            Any:
+            Optional: None if the user is authenticated
         """
         if not request.user.is_authenticated:
             messages.error(request, _('UserNotAuthentication'))
             return redirect(settings.LOGIN_URL)
+        return None
+
+    def dispatch(self, request, *args, **kwargs) -> Any:
+        """
+        Dispatch.
+
+        Args:
+            request:
+
+        Returns:
+            Any:
+        """
+        response = self.check_access(request)
+        if response is not None:
+            return response
         return super().dispatch(request, *args, **kwargs)
 
 
-class CheckUserRightsTestMixin(UserPassesTestMixin):
+class MemoizedObjectMixin(object):
+    """Fetch the object of a single object view once per request."""
+
+    def get_object(self, queryset=None) -> Any:
+        """
+        Get the object, the rights test and the view share one query.
+
+        Args:
+            queryset: queryset to fetch from, not memoized if given
+
+        Returns:
+            Any:
+        """
+        if queryset is not None:
+            return super().get_object(queryset)
+        lookup = tuple(sorted(self.kwargs.items()))
+        key = ('object', type(self), lookup)
+        return memoize(key, super().get_object)
+
+
+class CheckUserRightsTestMixin(MemoizedObjectMixin, UserPassesTestMixin):
     """Deny a request with a permission error if the test_func() == False."""
 
     redirect_url = ''
@@ -62,3 +149,384 @@ class CheckUserRightsTestMixin(UserPassesTestMixin):
             messages.error(request, self.error_message)
             return self.handle_no_permission()
         return super().dispatch(request, *args, **kwargs)
+
+
+class KeysetPaginationMixin(object):
+    """Paginate by an opaque cursor instead of OFFSET in the keyset mode."""
+
+    cursor_kwarg = 'cursor'
+    keyset_ordering = ('-created_at', 'id')
+
+    def get_pagination_mode(self) -> str:
+        """
+        Get pagination mode.
+
+        Returns:
+            str:
+        """
+        return settings.TASKS_PAGINATION_MODE
+
+    def is_keyset_paginated(self, queryset) -> bool:
+        """
+        Check the queryset is paginated by cursor.
+
+        Keyset pages follow keyset_ordering, so a queryset ordered
+        otherwise, e.g. by search relevance, is paginated by offset.
+
+        Args:
+            queryset: queryset to paginate
+
+        Returns:
+            bool:
+        """
+        return (
+            self.get_pagination_mode() == MODE_KEYSET
+            and not queryset.query.order_by
+        )
+
+    def paginate_queryset(self, queryset, page_size) -> Any:
+        """
+        Paginate the queryset.
+
+        Args:
+            queryset:
+            page_size:
+
+        Raises:
+            Http404: cursor is invalid
+
+        Returns:
+            Any:
+        """
+        if not self.is_keyset_paginated(queryset):
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = KeysetPaginator(queryset, page_size, self.keyset_ordering)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidPage as error:
+            raise Http404(str(error))
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+
+class CachedCountPaginationMixin(object):
+    """Serve total count of the paginated list from the cache."""
+
+    paginator_class = CachedCountPaginator
+    count_ignored_params = ('page', 'cursor')
+
+    def get_paginator(  # noqa: WPS211
+        self,
+        queryset,
+        per_page,
+        orphans=0,
+        allow_empty_first_page=True,
+        **kwargs,
+    ) -> CachedCountPaginator:
+        """
+        Get paginator keeping the count under the query string key.
+
+        Args:
+            queryset:
+            per_page:
+            orphans:
+            allow_empty_first_page:
+            kwargs:
+
+        Returns:
+            CachedCountPaginator:
+        """
+        return self.paginator_class(
+            queryset,
+            per_page,
+            orphans=orphans,
+            allow_empty_first_page=allow_empty_first_page,
+            cache_key=self.get_count_cache_key(),
+            count_mode=settings.PAGINATION_COUNT_MODE,
+            **kwargs,
+        )
+
+    def get_count_cache_params(self) -> list:
+        """
+        Get normalized query string which the count depends on.
+
+        Returns:
+            list:
+        """
+        return sorted(
+            (name, sorted(filter(None, query_values)))
+            for name, query_values in self.request.GET.lists()
+            if name not in self.count_ignored_params and any(query_values)
+        )
+
+    def get_count_cache_key(self) -> str:
+        """
+        Get cache key of the count.
+
+        Returns:
+            str:
+        """
+        return make_key(
+            get_count_namespace(self.model),
+            *self.get_count_cache_params(),
+        )
+
+
+def get_csrf_secret(request) -> str:
+    """
+    Get the CSRF secret of the client, a new one is sent with the response.
+
+    Args:
+        request: http request
+
+    Returns:
+        str:
+    """
+    get_token(request)
+    return request.META['CSRF_COOKIE']
+
+
+class ConditionalGetMixin(object):
+    """
+    Answer GET of an unchanged page with 304 Not Modified.
+
+    The validators come from a MAX(updated_at) probe of the shown rows and
+    the write generation of the model, which also changes when rows are
+    added or deleted, so a 304 costs one aggregate query and no rendering.
+    Names of statuses, labels and users are covered by their reference
+    generation, the CSRF tokens of forms by the session and the CSRF
+    secret. Writes of processes which do not share the cache change
+    the generations once their versions expire, see task_manager.cache.
+    """
+
+    updated_field = 'updated_at'
+
+    def get_conditional_queryset(self) -> models.QuerySet:
+        """
+        Get rows the page shows, the object of a detail page.
+
+        Returns:
+            QuerySet:
+        """
+        queryset = self.get_queryset()
+        pk = self.kwargs.get(getattr(self, 'pk_url_kwarg', 'pk'))
+        if pk is not None:
+            queryset = queryset.filter(pk=pk)
+        return queryset
+
+    def get_validator_parts(self) -> List[Any]:
+        """
+        Get other state the page depends on.
+
+        Returns:
+            List:
+        """
+        return [
+            self.request.get_full_path(),
+            get_language(),
+            self.request.user.pk,
+            # Forms of the page carry a token of the CSRF secret, both are
+            # rotated by a login.
+            self.request.session.session_key,
+            get_csrf_secret(self.request),
+            get_version(get_count_namespace(self.model)),
+            get_reference_generation((Status, Label, get_user_model())),
+        ]
+
+    def get_validators(self) -> Tuple[Optional[str], Optional[Any]]:
+        """
+        Get ETag and last modification time of the page.
+
+        Returns:
+            Tuple: None instead of the validators if there are no rows
+        """
+        last_modified = self.get_conditional_queryset().order_by().aggregate(
+            last_modified=models.Max(self.updated_field),
+        )['last_modified']
+        if last_modified is None:
+            return None, None
+        parts = self.get_validator_parts() + [last_modified.isoformat()]
+        digest = hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()
+        return digest, last_modified
+
+    def get_page_validators(self) -> Tuple[Optional[str], Optional[int]]:
+        """
+        Get quoted ETag and last modification timestamp of the page.
+
+        Pages with pending messages are always rendered.
+
+        Returns:
+            Tuple: None instead of the validators if the page has none
+        """
+        if messages.get_messages(self.request):
+            return None, None
+        etag, last_modified = self.get_validators()
+        if etag is None:
+            return None, None
+        return quote_etag(etag), int(last_modified.timestamp())
+
+    def get_not_modified_response(
+        self,
+        etag: Optional[str],
+        last_modified: Optional[int],
+    ) -> Optional[HttpResponse]:
+        """
+        Get 304 Not Modified if the client has the page.
+
+        Args:
+            etag: quoted ETag
+            last_modified: timestamp
+
+        Returns:
+            Optional: None if the page must be rendered
+        """
+        if etag is None:
+            return None
+        return get_conditional_response(
+            self.request, etag=etag, last_modified=last_modified,
+        )
+
+    def set_validators(
+        self,
+        response: HttpResponse,
+        etag: Optional[str],
+        last_modified: Optional[int],
+    ) -> HttpResponse:
+        """
+        Add the validators to the response.
+
+        Args:
+            response: response of the page
+            etag: quoted ETag
+            last_modified: timestamp
+
+        Returns:
+            HttpResponse:
+        """
+        if etag is not None:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get_page(self, request, *args, **kwargs) -> Any:
+        """
+        Get the page regardless of the validators.
+
+        Args:
+            request:
+            args:
+            kwargs:
+
+        Returns:
+            Any:
+        """
+        return super().get(request, *args, **kwargs)  # noqa: WPS613
+
+    def get(self, request, *args, **kwargs) -> Any:
+        """
+        Render the page unless the client has it.
+
+        Args:
+            request:
+            args:
+            kwargs:
+
+        Returns:
+            Any:
+        """
+        etag, last_modified = self.get_page_validators()
+        response = self.get_not_modified_response(etag, last_modified)
+        if response is None:
+            response = self.get_page(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
+
+
+class InUseListMixin(object):
+    """
+    Flag objects of the page referenced by tasks, their deletion is disabled.
+
+    Only the rows of the page are annotated, the count and the validators
+    probe go without the subqueries.
+    """
+
+    in_use_relations: Relations = ()
+
+    def paginate_queryset(self, queryset, page_size) -> Any:
+        """
+        Paginate the queryset, annotate rows of the page.
+
+        Args:
+            queryset:
+            page_size:
+
+        Returns:
+            Any:
+        """
+        paginator, page, object_list, is_paginated = super().paginate_queryset(
+            queryset, page_size,
+        )
+        page.object_list = list(
+            annotate_in_use(object_list, self.in_use_relations),
+        )
+        return (paginator, page, page.object_list, is_paginated)
+
+    def get_validator_parts(self) -> List[Any]:
+        """
+        Add the write version of tasks, the flags change with it.
+
+        Returns:
+            List:
+        """
+        return super().get_validator_parts() + [
+            get_version(get_count_namespace(Tasks)),
+        ]
+
+
+class ProtectedDeleteMixin(object):
+    """
+    Refuse deleting an object referenced by tasks before the collector runs.
+
+    The object is fetched with the 'in_use' annotation, the confirmation
+    page disables the deletion and the post is refused without the deletion
+    collector loading the referencing rows. ProtectedError still covers
+    references added since the object was fetched.
+    """
+
+    in_use_relations: Relations = ()
+    protected_message = ''
+    protected_url = ''
+
+    def get_queryset(self) -> Any:
+        """
+        Get objects annotated with 'in_use'.
+
+        Returns:
+            Any:
+        """
+        return annotate_in_use(super().get_queryset(), self.in_use_relations)
+
+    def post(self, request, *args, **kwargs) -> HttpResponseRedirect:
+        """
+        Delete the object unless it is in use.
+
+        Args:
+            request: request
+            args: positional arguments of the URL
+            kwargs: keyword arguments of the URL
+
+        Returns:
+            HttpResponseRedirect:
+        """
+        self.object = self.get_object()
+        if not self.object.in_use:
+            success_url = self.get_success_url()
+            try:
+                self.object.delete()
+            except ProtectedError:
+                self.object.in_use = True
+            else:
+                messages.success(request, self.success_message)
+                return redirect(success_url)
+        messages.error(request, self.protected_message)
+        return redirect(self.protected_url)
@@ -0,0 +1,485 @@
+"""Paginators."""
+import base64
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import EmptyPage, InvalidPage, Page, Paginator
+from django.db import connections, models
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy
+
+MODE_OFFSET = 'offset'
+MODE_KEYSET = 'keyset'
+
+COUNT_EXACT = 'exact'
+COUNT_ESTIMATED = 'estimated'
+
+CURSOR_NEXT = 'n'
+CURSOR_PREVIOUS = 'p'
+
+INVALID_CURSOR_MESSAGE = 'Invalid cursor'
+
+
+class InvalidCursor(InvalidPage):
+    """The cursor can not be decoded into a position of the keyset."""
+
+
+class KeysetPage(object):
+    """Page of objects fetched by the keyset paginator."""
+
+    def __init__(
+        self,
+        object_list: List[Any],
+        paginator: 'KeysetPaginator',
+        has_next: bool,
+        has_previous: bool,
+    ):
+        """
+        Init page.
+
+        Args:
+            object_list: objects of the page
+            paginator: paginator which built the page
+            has_next: the page is followed by another page
+            has_previous: the page is preceded by another page
+        """
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self) -> str:
+        """
+        Representation.
+
+        Returns:
+            str:
+        """
+        return '<Keyset page of {count} objects>'.format(
+            count=len(self.object_list),
+        )
+
+    def __len__(self) -> int:
+        """
+        Count of objects on the page.
+
+        Returns:
+            int:
+        """
+        return len(self.object_list)
+
+    def __iter__(self):
+        """
+        Iterate over objects of the page.
+
+        Returns:
+            Iterator:
+        """
+        return iter(self.object_list)
+
+    def __getitem__(self, index) -> Any:
+        """
+        Get object of the page.
+
+        Args:
+            index: index or slice
+
+        Returns:
+            Any:
+        """
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        """
+        Check the page is followed by another page.
+
+        Returns:
+            bool:
+        """
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        """
+        Check the page is preceded by another page.
+
+        Returns:
+            bool:
+        """
+        return self._has_previous
+
+    def has_other_pages(self) -> bool:
+        """
+        Check the page is not the only one.
+
+        Returns:
+            bool:
+        """
+        return self._has_next or self._has_previous
+
+    def next_cursor(self) -> Optional[str]:
+        """
+        Cursor of the next page.
+
+        Returns:
+            Optional:
+        """
+        if not self._has_next or not self.object_list:
+            return None
+        return self.paginator.encode_cursor(
+            self.object_list[-1], CURSOR_NEXT,
+        )
+
+    def previous_cursor(self) -> Optional[str]:
+        """
+        Cursor of the previous page.
+
+        Returns:
+            Optional:
+        """
+        if not self._has_previous or not self.object_list:
+            return None
+        return self.paginator.encode_cursor(
+            self.object_list[0], CURSOR_PREVIOUS,
+        )
+
+
+class KeysetPaginator(object):
+    """
+    Paginate a queryset by seeking past the last seen ordering key.
+
+    Every page is a single 'WHERE key < cursor ORDER BY key LIMIT n + 1'
+    query, so its cost does not depend on how deep the page is and no
+    COUNT is run. The ordering must be unique, so the last field is
+    expected to be the primary key.
+    """
+
+    cursor_based = True
+
+    def __init__(
+        self,
+        queryset: models.QuerySet,
+        per_page: int,
+        ordering: Sequence[str] = ('-created_at', 'id'),
+    ):
+        """
+        Init paginator.
+
+        Args:
+            queryset: queryset to paginate
+            per_page: count of objects on a page
+            ordering: unique ordering of the keyset
+        """
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = [
+            (name.lstrip('-'), name.startswith('-')) for name in self.ordering
+        ]
+
+    def page(self, cursor: Optional[str] = None) -> KeysetPage:
+        """
+        Get page which follows or precedes the cursor.
+
+        Args:
+            cursor: opaque cursor, the first page if empty
+
+        Returns:
+            KeysetPage:
+        """
+        if not cursor:
+            object_list = self._fetch(self.queryset, self.ordering)
+            has_next = len(object_list) > self.per_page
+            return KeysetPage(
+                object_list[:self.per_page], self, has_next, has_previous=False,
+            )
+
+        direction, key = self.decode_cursor(cursor)
+        queryset = self.queryset.filter(self._seek(key, direction))
+        if direction == CURSOR_NEXT:
+            object_list = self._fetch(queryset, self.ordering)
+            has_next = len(object_list) > self.per_page
+            return KeysetPage(
+                object_list[:self.per_page], self, has_next, has_previous=True,
+            )
+
+        object_list = self._fetch(queryset, self._reversed_ordering())
+        has_previous = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        object_list.reverse()
+        return KeysetPage(
+            object_list, self, has_next=True, has_previous=has_previous,
+        )
+
+    def encode_cursor(self, instance: Any, direction: str) -> str:
+        """
+        Build opaque cursor pointing at the object.
+
+        Args:
+            instance: boundary object of a page
+            direction: CURSOR_NEXT or CURSOR_PREVIOUS
+
+        Returns:
+            str:
+        """
+        opts = self.queryset.model._meta
+        key = [
+            opts.get_field(name).value_to_string(instance)
+            for name, _descending in self.fields
+        ]
+        payload = json.dumps([direction, key], separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(payload.encode('utf-8'))
+        return encoded.decode('ascii').rstrip('=')
+
+    def decode_cursor(self, cursor: str) -> Tuple[str, List[Any]]:
+        """
+        Decode cursor into direction and ordering key.
+
+        Args:
+            cursor: opaque cursor
+
+        Raises:
+            InvalidCursor: cursor is malformed
+
+        Returns:
+            Tuple:
+        """
+        padding = '=' * (-len(cursor) % 4)
+        try:
+            payload = base64.urlsafe_b64decode(cursor + padding).decode('utf-8')
+        except ValueError:
+            raise InvalidCursor(INVALID_CURSOR_MESSAGE)
+        try:
+            direction, key = json.loads(payload)
+        except (ValueError, TypeError):
+            raise InvalidCursor(INVALID_CURSOR_MESSAGE)
+        if str(direction) not in {CURSOR_NEXT, CURSOR_PREVIOUS}:
+            raise InvalidCursor(INVALID_CURSOR_MESSAGE)
+        return direction, self._to_python(key)
+
+    def _to_python(self, key: Any) -> List[Any]:
+        if not isinstance(key, list):
+            raise InvalidCursor(INVALID_CURSOR_MESSAGE)
+        if len(key) != len(self.fields):
+            raise InvalidCursor(INVALID_CURSOR_MESSAGE)
+        opts = self.queryset.model._meta
+        try:
+            key = [
+                opts.get_field(name).to_python(raw_value)
+                for (name, _descending), raw_value in zip(self.fields, key)
+            ]
+        except ValidationError:
+            raise InvalidCursor(INVALID_CURSOR_MESSAGE)
+        if None in key:
+            raise InvalidCursor(INVALID_CURSOR_MESSAGE)
+        return key
+
+    def _fetch(
+        self,
+        queryset: models.QuerySet,
+        ordering: Sequence[str],
+    ) -> List[Any]:
+        return list(queryset.order_by(*ordering)[:self.per_page + 1])
+
+    def _reversed_ordering(self) -> Tuple[str, ...]:
+        return tuple(
+            name if descending else '-{name}'.format(name=name)
+            for name, descending in self.fields
+        )
+
+    def _seek(self, key: List[Any], direction: str) -> models.Q:
+        forward = direction == CURSOR_NEXT
+        condition = models.Q()
+        equal = models.Q()
+        for (name, descending), field_value in zip(self.fields, key):
+            lookup = '{name}__{op}'.format(
+                name=name, op='lt' if descending == forward else 'gt',
+            )
+            condition |= equal & models.Q(**{lookup: field_value})
+            equal &= models.Q(**{name: field_value})
+        return condition
+
+
+def get_count_namespace(model) -> str:
+    """
+    Get cache namespace of list counts of the model.
+
+    Args:
+        model: model class
+
+    Returns:
+        str:
+    """
+    return 'count:{label}'.format(label=model._meta.label_lower)
+
+
+def get_planner_estimate(queryset: models.QuerySet) -> Optional[int]:
+    """
+    Get count of rows estimated by the query planner.
+
+    Args:
+        queryset: queryset to estimate
+
+    Returns:
+        Optional: None if the database has no usable estimate
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, sql_params = queryset.query.get_compiler(queryset.db).as_sql()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'EXPLAIN (FORMAT JSON) {sql}'.format(sql=sql), sql_params,
+        )
+        plan = cursor.fetchone()[0]
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator which serves the total count from the cache.
+
+    In the estimated mode an expensive COUNT is replaced by the planner
+    estimate, or by a count capped at PAGINATION_COUNT_CAP rows. Such a
+    count is only displayed, pages past it are checked by fetching them.
+    """
+
+    def __init__(  # noqa: WPS211
+        self,
+        object_list,
+        per_page,
+        orphans=0,
+        allow_empty_first_page=True,
+        cache_key: Optional[str] = None,
+        count_mode: str = COUNT_EXACT,
+    ):
+        """
+        Init paginator.
+
+        Args:
+            object_list: queryset to paginate
+            per_page: count of objects on a page
+            orphans: count of objects allowed on the last page
+            allow_empty_first_page: no 404 for the empty first page
+            cache_key: key of the cached count, not cached if None
+            count_mode: COUNT_EXACT or COUNT_ESTIMATED
+        """
+        super().__init__(object_list, per_page, orphans, allow_empty_first_page)
+        self.cache_key = cache_key
+        self.count_mode = count_mode
+        self.count_cap = settings.PAGINATION_COUNT_CAP
+        self.count_capped = False
+        self.count_estimated = False
+
+    @cached_property
+    def count(self) -> int:
+        """
+        Get total count of objects.
+
+        Returns:
+            int:
+        """
+        if self.cache_key is None:
+            return self._count_rows()
+        cached = cache.get(self.cache_key)
+        if cached is None:
+            cached = {
+                'count': self._count_rows(),
+                'capped': self.count_capped,
+                'estimated': self.count_estimated,
+            }
+            cache.set(
+                self.cache_key,
+                cached,
+                settings.PAGINATION_COUNT_CACHE_TIMEOUT,
+            )
+        self.count_capped = cached['capped']
+        self.count_estimated = cached['estimated']
+        return cached['count']
+
+    @property
+    def display_count(self) -> str:
+        """
+        Get total count for display, like '1000+' for a capped count.
+
+        Returns:
+            str:
+        """
+        if self.count_capped:
+            return '{count}+'.format(count=self.count)
+        if self.count_estimated:
+            return '~{count}'.format(count=self.count)
+        return str(self.count)
+
+    @property
+    def count_exact(self) -> bool:
+        """
+        Check the count is neither capped nor estimated.
+
+        Returns:
+            bool:
+        """
+        # Reading the count sets its flags.
+        return not (self.count and (self.count_capped or self.count_estimated))
+
+    def validate_number(self, number) -> int:
+        """
+        Validate the page number, past an inexact count too.
+
+        Args:
+            number: page number
+
+        Raises:
+            EmptyPage: number is less than 1, or past an exact count
+
+        Returns:
+            int:
+        """
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if self.count_exact or int(number) < 1:
+                raise
+            return int(number)
+
+    def page(self, number) -> Page:
+        """
+        Get the page, with an inexact count by fetching a row after it.
+
+        Args:
+            number: page number
+
+        Raises:
+            EmptyPage: page has no rows
+
+        Returns:
+            Page:
+        """
+        number = self.validate_number(number)
+        if self.count_exact:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        # One row more tells whether there is a next page.
+        top = bottom + self.per_page + 1
+        rows = list(self.object_list[bottom:top])
+        if not rows and number > 1:
+            raise EmptyPage(gettext_lazy('That page contains no results'))
+        self.num_pages = max(
+            self.num_pages, number + int(len(rows) > self.per_page),
+        )
+        return self._get_page(rows[:self.per_page], number, self)
+
+    def _count_rows(self) -> int:
+        if self.count_mode != COUNT_ESTIMATED:
+            return self.object_list.count()
+        estimate = get_planner_estimate(self.object_list)
+        if estimate is not None and estimate > self.count_cap:
+            self.count_estimated = True
+            return estimate
+        count = self.object_list[:self.count_cap + 1].count()
+        if count > self.count_cap:
+            self.count_capped = True
+            return self.count_cap
+        return count
@@ -0,0 +1,284 @@
+"""In-process cache of small reference tables.
+
+Rows of statuses, labels and users are kept in the process memory under
+the version of their namespace in the Django cache. Signals bump the
+version on every change, so all processes sharing the cache reload the
+rows on the next access. With a process local cache the other processes
+reload them once the version expires, see task_manager.cache; until then
+choice fields read the rows they do not know from the database.
+"""
+from typing import Any, Dict, Iterable, List, Tuple
+
+import django_filters
+from django import forms
+from django.core.exceptions import ValidationError
+from django.forms.models import ModelChoiceIterator
+from task_manager.cache import bump_version, get_version, get_versions
+
+_rows: Dict[str, Tuple[int, List[Any]]] = {}
+
+
+def get_reference_namespace(model) -> str:
+    """
+    Get cache namespace of reference rows of the model.
+
+    Args:
+        model: model class
+
+    Returns:
+        str:
+    """
+    return 'reference:{label}'.format(label=model._meta.label_lower)
+
+
+def get_reference_rows(model) -> List[Any]:
+    """
+    Get all rows of the model in its default ordering.
+
+    The instances are shared between callers and must not be changed.
+
+    Args:
+        model: model class
+
+    Returns:
+        List:
+    """
+    version = get_version(get_reference_namespace(model))
+    cached = _rows.get(model._meta.label_lower)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    rows = list(model._default_manager.all())
+    _rows[model._meta.label_lower] = (version, rows)
+    return rows
+
+
+def get_reference_map(model) -> Dict[Any, Any]:
+    """
+    Get all rows of the model by primary key.
+
+    Args:
+        model: model class
+
+    Returns:
+        Dict:
+    """
+    return {row.pk: row for row in get_reference_rows(model)}
+
+
+def get_reference_rows_by_pk(model, pks: Iterable[Any]) -> Dict[Any, Any]:
+    """
+    Get rows of the primary keys, the ones not cached from the database.
+
+    Rows created by another process are missing until this one sees the
+    version bump, unknown primary keys are left out.
+
+    Args:
+        model: model class
+        pks: primary keys
+
+    Returns:
+        Dict: row by primary key
+    """
+    pks = list(pks)
+    cached = get_reference_map(model)
+    rows = {pk: cached[pk] for pk in pks if pk in cached}
+    missing = [pk for pk in pks if pk not in rows]
+    if missing:
+        rows.update(model._default_manager.in_bulk(missing))
+    return rows
+
+
+def get_reference_generation(reference_models: Iterable[Any]) -> str:
+    """
+    Get generation of the rows of the models, changed by any write.
+
+    Args:
+        reference_models: model classes
+
+    Returns:
+        str:
+    """
+    namespaces = [get_reference_namespace(model) for model in reference_models]
+    versions = get_versions(namespaces)
+    return '.'.join(str(versions[namespace]) for namespace in namespaces)
+
+
+def invalidate_reference(model) -> None:
+    """
+    Drop cached rows of the model in all processes.
+
+    Args:
+        model: model class
+    """
+    bump_version(get_reference_namespace(model))
+
+
+def attach_reference_rows(objects: List[Any], field_names: List[str]) -> None:
+    """
+    Set cached related rows of foreign keys, instead of joining them.
+
+    Args:
+        objects: model instances
+        field_names: names of foreign keys to reference models
+    """
+    if not objects:
+        return
+    opts = objects[0]._meta
+    for name in field_names:
+        field = opts.get_field(name)
+        related = get_reference_map(field.related_model)
+        for instance in objects:
+            row = related.get(getattr(instance, field.attname))
+            if row is not None:
+                field.set_cached_value(instance, row)
+
+
+class CachedModelChoiceIterator(ModelChoiceIterator):
+    """Iterate over cached rows instead of querying the field queryset."""
+
+    def __iter__(self):
+        """
+        Iterate over choices.
+
+        Yields:
+            Tuple: value and label of a choice
+        """
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        yield from (
+            self.choice(row)
+            for row in get_reference_rows(self.queryset.model)
+        )
+
+    def __len__(self) -> int:
+        """
+        Count choices.
+
+        Returns:
+            int:
+        """
+        empty = 0 if self.field.empty_label is None else 1
+        return len(get_reference_rows(self.queryset.model)) + empty
+
+    def __bool__(self) -> bool:
+        """
+        Check there are any choices.
+
+        Returns:
+            bool:
+        """
+        if self.field.empty_label is not None:
+            return True
+        return bool(get_reference_rows(self.queryset.model))
+
+
+def _to_pk(field: forms.Field, choice_value: Any) -> Any:
+    pk_field = field.queryset.model._meta.pk
+    try:
+        return pk_field.to_python(choice_value)
+    except ValidationError:
+        raise ValidationError(
+            field.error_messages['invalid_choice'],
+            code='invalid_choice',
+            params={'value': choice_value},
+        )
+
+
+class CachedModelChoiceField(forms.ModelChoiceField):
+    """
+    Model choice field served from the reference cache.
+
+    Choices are all rows of the model, the queryset of the field only
+    tells the model.
+    """
+
+    iterator = CachedModelChoiceIterator
+
+    def to_python(self, value) -> Any:
+        """
+        Get the chosen row.
+
+        Args:
+            value: submitted primary key
+
+        Raises:
+            ValidationError: no such row
+
+        Returns:
+            Any:
+        """
+        if self.to_field_name or value in self.empty_values:
+            return super().to_python(value)
+        if isinstance(value, self.queryset.model):
+            return value
+        pk = _to_pk(self, value)
+        row = get_reference_rows_by_pk(self.queryset.model, [pk]).get(pk)
+        if row is None:
+            raise ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+            )
+        return row
+
+
+class CachedModelMultipleChoiceField(forms.ModelMultipleChoiceField):
+    """Model multiple choice field served from the reference cache."""
+
+    iterator = CachedModelChoiceIterator
+
+    def _check_values(self, value) -> Any:
+        if self.to_field_name:
+            return super()._check_values(value)
+        try:
+            value = frozenset(value)
+        except TypeError:
+            raise ValidationError(
+                self.error_messages['invalid_list'],
+                code='invalid_list',
+            )
+        pks = {choice: _to_pk(self, choice) for choice in value}
+        rows = get_reference_rows_by_pk(self.queryset.model, pks.values())
+        for choice_value, choice_pk in pks.items():
+            if choice_pk not in rows:
+                raise ValidationError(
+                    self.error_messages['invalid_choice'],
+                    code='invalid_choice',
+                    params={'value': choice_value},
+                )
+        cached = [
+            row for row in get_reference_rows(self.queryset.model)
+            if row.pk in rows
+        ]
+        cached_pks = {row.pk for row in cached}
+        # Rows created by another process follow the cached ones.
+        return cached + [
+            row for row in rows.values() if row.pk not in cached_pks
+        ]
+
+
+class CachedFilterModelChoiceField(
+    CachedModelChoiceField,
+    django_filters.fields.ModelChoiceField,
+):
+    """Filter field of CachedModelChoiceFilter."""
+
+
+class CachedFilterModelMultipleChoiceField(
+    CachedModelMultipleChoiceField,
+    django_filters.fields.ModelMultipleChoiceField,
+):
+    """Filter field of CachedModelMultipleChoiceFilter."""
+
+
+class CachedModelChoiceFilter(django_filters.ModelChoiceFilter):
+    """Model choice filter served from the reference cache."""
+
+    field_class = CachedFilterModelChoiceField
+
+
+class CachedModelMultipleChoiceFilter(
+    django_filters.ModelMultipleChoiceFilter,
+):
+    """Model multiple choice filter served from the reference cache."""
+
+    field_class = CachedFilterModelMultipleChoiceField
@@ -0,0 +1,62 @@
+"""Memoization of reads within one request.
+
+RequestCacheMiddleware opens an empty cache for every request and drops
+it when the response is returned. Outside of a request, e.g. in commands,
+nothing is memoized.
+"""
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Optional
+
+RequestCache = Dict[Hashable, Any]
+
+_request_cache: ContextVar[Optional[RequestCache]] = ContextVar(
+    'request_cache', default=None,
+)
+
+
+def memoize(key: Hashable, factory: Callable[[], Any]) -> Any:
+    """
+    Get the value of the key computed once per request.
+
+    Args:
+        key: key of the value within the request
+        factory: computes the value
+
+    Returns:
+        Any:
+    """
+    request_cache = _request_cache.get()
+    if request_cache is None:
+        return factory()
+    if key not in request_cache:
+        request_cache[key] = factory()
+    return request_cache[key]
+
+
+class RequestCacheMiddleware(object):
+    """Open the request cache for the duration of every request."""
+
+    def __init__(self, get_response):
+        """
+        Init middleware.
+
+        Args:
+            get_response: next handler
+        """
+        self.get_response = get_response
+
+    def __call__(self, request) -> Any:
+        """
+        Handle the request with an empty cache.
+
+        Args:
+            request: http request
+
+        Returns:
+            Any:
+        """
+        token = _request_cache.set({})
+        try:  # noqa: WPS501
+            return self.get_response(request)
+        finally:
+            _request_cache.reset(token)
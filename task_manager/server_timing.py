@@ -0,0 +1,205 @@
+"""Server-Timing header of sampled requests.
+
+ServerTimingMiddleware, the outermost middleware, reports in milliseconds:
+
+- db: time and count of SQL queries of all databases, the time summed over
+  the threads of concurrent reads, see async_views;
+- view: from the view call until its template is rendered, or until the
+  inner middleware returned the response;
+- tpl: rendering of the template response, lazy queries included; views
+  rendering it themselves report it with start_template();
+- total: the whole middleware chain, without streamed content.
+
+Requests are sampled with the chance SERVER_TIMING_SAMPLE_RATE, the others
+go through untouched. The header exposes the timings to every client, so
+production sampling is opt-in.
+"""
+import random
+import threading
+import time
+from contextlib import ExitStack
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections
+
+HEADER = 'Server-Timing'
+
+
+class RequestTimings(object):
+    """Timings of one request, also the execute wrapper counting queries."""
+
+    def __init__(self):
+        """Init timings."""
+        self.db_time: float = 0
+        self.db_count = 0
+        # Queries of concurrent reads are counted from several threads.
+        self._lock = threading.Lock()
+        self.view_started: Optional[float] = None
+        self.view_time: Optional[float] = None
+        self.template_started: Optional[float] = None
+        self.template_time: Optional[float] = None
+
+    def __call__(  # noqa: WPS211
+        self,
+        execute,
+        sql: str,
+        params: Any,
+        many: bool,
+        context: Dict[str, Any],
+    ) -> Any:
+        """
+        Execute the query, add its duration.
+
+        Args:
+            execute: next wrapper or the cursor method
+            sql: SQL
+            params: parameters
+            many: executemany() call
+            context: connection and cursor
+
+        Returns:
+            Any:
+        """
+        started = time.perf_counter()
+        try:  # noqa: WPS501
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            with self._lock:
+                self.db_time += duration
+                self.db_count += 1
+
+    def start_template(self, response) -> None:
+        """
+        Mark the end of the view and the start of rendering.
+
+        Args:
+            response: template response about to be rendered
+        """
+        self.template_started = time.perf_counter()
+        if self.view_started is not None:
+            self.view_time = self.template_started - self.view_started
+        response.add_post_render_callback(self.finish_template)
+
+    def finish_template(self, response) -> None:
+        """
+        Mark the end of rendering.
+
+        Args:
+            response: rendered response
+        """
+        self.template_time = time.perf_counter() - self.template_started
+
+    def finish_view(self) -> None:
+        """Mark the end of a view without a template response."""
+        if self.view_started is not None and self.view_time is None:
+            self.view_time = time.perf_counter() - self.view_started
+
+    def get_header(self, total: float) -> str:
+        """
+        Format the Server-Timing header.
+
+        Args:
+            total: duration of the request in seconds
+
+        Returns:
+            str:
+        """
+        metrics: List[str] = [
+            'db;dur={dur:.1f};desc="{count} queries"'.format(
+                dur=self.db_time * 1000, count=self.db_count,
+            ),
+        ]
+        if self.view_time is not None:
+            metrics.append('view;dur={dur:.1f}'.format(
+                dur=self.view_time * 1000,
+            ))
+        if self.template_time is not None:
+            metrics.append('tpl;dur={dur:.1f}'.format(
+                dur=self.template_time * 1000,
+            ))
+        metrics.append('total;dur={dur:.1f}'.format(dur=total * 1000))
+        return ', '.join(metrics)
+
+
+def get_timings(request) -> Optional[RequestTimings]:
+    """
+    Get the timings of the request.
+
+    Args:
+        request: http request
+
+    Returns:
+        Optional: None if the request is not sampled
+    """
+    return getattr(request, 'server_timing', None)
+
+
+class ServerTimingMiddleware(object):
+    """Measure phases of sampled requests."""
+
+    def __init__(self, get_response):
+        """
+        Init middleware.
+
+        Args:
+            get_response: next handler
+        """
+        self.get_response = get_response
+
+    def __call__(self, request) -> Any:
+        """
+        Handle the request, add the header if it is sampled.
+
+        Args:
+            request: http request
+
+        Returns:
+            Any:
+        """
+        sample_rate = settings.SERVER_TIMING_SAMPLE_RATE
+        if random.random() >= sample_rate:  # noqa: S311
+            return self.get_response(request)
+        timings = RequestTimings()
+        request.server_timing = timings
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timings))
+            response = self.get_response(request)
+        timings.finish_view()
+        response[HEADER] = timings.get_header(time.perf_counter() - started)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """
+        Mark the start of the view.
+
+        Args:
+            request: http request
+            view_func: view
+            view_args: positional arguments of the view
+            view_kwargs: keyword arguments of the view
+        """
+        timings = get_timings(request)
+        if timings is not None:
+            timings.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response) -> Any:
+        """
+        Time rendering of the response, called right before it.
+
+        A response rendered by the view has no rendering left to time.
+
+        Args:
+            request: http request
+            response: template response
+
+        Returns:
+            Any:
+        """
+        timings = get_timings(request)
+        if timings is not None and not response.is_rendered:
+            timings.start_template(response)
+        return response
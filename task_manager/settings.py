@@ -33,7 +33,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'task_manager.server_timing.ServerTimingMiddleware',
+    'task_manager.slow_queries.SlowQueryLogMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'task_manager.request_cache.RequestCacheMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
@@ -42,7 +45,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'rollbar.contrib.django.middleware.RollbarNotifierMiddleware',
+    'task_manager.error_reporting.ErrorReportingMiddleware',
 ]
 
 ROOT_URLCONF = 'task_manager.urls'
@@ -78,6 +81,27 @@ CONN_MAX_AGE = 500
 db_from_env = dj_database_url.config(conn_max_age=CONN_MAX_AGE)
 DATABASES['default'].update(db_from_env)
 
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    },
+}
+# Caches of a single process, what one worker writes to them the others
+# never see
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+CACHE_SHARED = CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHES
+# Seconds versions of cache namespaces live in a process local cache, the
+# bumps of other processes are seen after at most that; gunicorn starts a
+# single worker with such a cache
+CACHE_VERSION_TIMEOUT = int(os.getenv('CACHE_VERSION_TIMEOUT', '10'))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -94,6 +118,23 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 AUTH_USER_MODEL = 'users.CustomUser'
+# With a shared cache the user of a session is resolved from the cache, see
+# users.backends; a process local one would keep logged out sessions and
+# changed passwords valid in the other workers
+AUTHENTICATION_BACKENDS = [
+    'task_manager.users.backends.CachedModelBackend'
+    if CACHE_SHARED else 'django.contrib.auth.backends.ModelBackend',
+]
+USER_CACHE_TIMEOUT = int(os.getenv('USER_CACHE_TIMEOUT', '3600'))
+# With a shared cache sessions are read from it and written through to the
+# database, messages travel in a cookie so they do not write the session
+SESSION_ENGINE = os.getenv(
+    'SESSION_ENGINE',
+    'django.contrib.sessions.backends.{engine}'.format(
+        engine='cached_db' if CACHE_SHARED else 'db',
+    ),
+)
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
 
 LANGUAGE_CODE = 'ru'
 
@@ -126,9 +167,66 @@ LOGOUT_REDIRECT_URL = reverse_lazy('home')
 
 FIXTURES_DIR = 'fixtures'
 
+# 'offset' - numbered pages, 'keyset' - cursor pages without COUNT
+TASKS_PAGINATION_MODE = os.getenv('TASKS_PAGINATION_MODE', 'offset')
+# 'exact' - COUNT(*), 'estimated' - planner estimate or count capped at CAP
+PAGINATION_COUNT_MODE = os.getenv('PAGINATION_COUNT_MODE', 'exact')
+PAGINATION_COUNT_CAP = int(os.getenv('PAGINATION_COUNT_CAP', '1000'))
+PAGINATION_COUNT_CACHE_TIMEOUT = int(
+    os.getenv('PAGINATION_COUNT_CACHE_TIMEOUT', '30'),
+)
+# Rendered task list rows, keys change with every edit of the task
+TASK_ROW_CACHE_TIMEOUT = int(os.getenv('TASK_ROW_CACHE_TIMEOUT', '3600'))
+# Home page dashboards, keys change with every task write of the user
+DASHBOARD_CACHE_TIMEOUT = int(os.getenv('DASHBOARD_CACHE_TIMEOUT', '3600'))
+# Rows fetched per round trip and written per chunk by the tasks export
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', '2000'))
+# Queries of requests slower than this are logged as JSON lines, a sampled
+# share of them; an empty value disables the slow query log
+_slow_query_threshold = os.getenv('SLOW_QUERY_THRESHOLD_MS', '200')
+SLOW_QUERY_THRESHOLD_MS = (
+    float(_slow_query_threshold) if _slow_query_threshold else None
+)
+SLOW_QUERY_SAMPLE_RATE = float(os.getenv('SLOW_QUERY_SAMPLE_RATE', '1'))
+SLOW_QUERY_LOG_FILE = os.getenv('SLOW_QUERY_LOG_FILE')
+# Share of responses with the Server-Timing header, all of them with DEBUG
+SERVER_TIMING_SAMPLE_RATE = float(
+    os.getenv('SERVER_TIMING_SAMPLE_RATE', '1' if DEBUG else '0'),
+)
+# Errors are sent to Rollbar by a thread of the process: the bounded queue
+# drops new occurrences when full, repeated ones of a flush interval are
+# sent once with their count
+ERROR_REPORT_QUEUE_SIZE = int(os.getenv('ERROR_REPORT_QUEUE_SIZE', '1000'))
+ERROR_REPORT_BATCH_SIZE = int(os.getenv('ERROR_REPORT_BATCH_SIZE', '100'))
+ERROR_REPORT_FLUSH_INTERVAL = float(
+    os.getenv('ERROR_REPORT_FLUSH_INTERVAL', '1'),
+)
+ERROR_REPORT_SHUTDOWN_TIMEOUT = float(
+    os.getenv('ERROR_REPORT_SHUTDOWN_TIMEOUT', '5'),
+)
+# Threads of a process running independent reads of a page at once, see
+# async_views; each of them keeps a database connection
+CONCURRENT_READ_THREADS = int(os.getenv('CONCURRENT_READ_THREADS', '8'))
+# Live task list events: streams end after STREAM_TIMEOUT seconds and the
+# clients reconnect, idle ones get a comment every HEARTBEAT seconds; every
+# stream holds a thread, a process serves at most MAX_STREAMS of them; with
+# SOCKET_DIR set processes of the host relay events through its sockets
+TASK_EVENTS_MAX_STREAMS = int(os.getenv('TASK_EVENTS_MAX_STREAMS', '4'))
+TASK_EVENTS_STREAM_TIMEOUT = float(
+    os.getenv('TASK_EVENTS_STREAM_TIMEOUT', '300'),
+)
+TASK_EVENTS_HEARTBEAT = float(os.getenv('TASK_EVENTS_HEARTBEAT', '15'))
+TASK_EVENTS_QUEUE_SIZE = int(os.getenv('TASK_EVENTS_QUEUE_SIZE', '100'))
+TASK_EVENTS_HISTORY_SIZE = int(os.getenv('TASK_EVENTS_HISTORY_SIZE', '1000'))
+TASK_EVENTS_SOCKET_DIR = os.getenv('TASK_EVENTS_SOCKET_DIR')
+
 LOGGING = DEFAULT_LOGGING.copy()
 LOGGING.update(
     {
+        'formatters': {
+            **DEFAULT_LOGGING['formatters'],
+            'json_lines': {'format': '{message}', 'style': '{'},
+        },
         'handlers': {
             'console': {
                 'level': 'DEBUG',
@@ -139,6 +237,14 @@ LOGGING.update(
                 'class': 'logging.StreamHandler',
                 'formatter': 'django.server',
             },
+            'slow_queries': {
+                'class': 'logging.StreamHandler',
+                'formatter': 'json_lines',
+            } if not SLOW_QUERY_LOG_FILE else {
+                'class': 'logging.handlers.WatchedFileHandler',
+                'filename': SLOW_QUERY_LOG_FILE,
+                'formatter': 'json_lines',
+            },
             'mail_admins': {
                 'level': 'ERROR',
                 'filters': ['require_debug_false'],
@@ -150,11 +256,22 @@ LOGGING.update(
                 'handlers': ['console', 'mail_admins'],
                 'level': 'INFO',
             },
+            # Every query is logged at DEBUG when DEBUG is on, the slow
+            # query log is cheaper to leave on
             'django.db.backends': {
-                'level': 'DEBUG',
+                'level': os.getenv('DB_LOG_LEVEL', 'INFO'),
                 'propagate': False,
                 'handlers': ['console'],
             },
+            'task_manager.slow_queries': {
+                'level': 'WARNING',
+                'propagate': False,
+                'handlers': ['slow_queries'],
+            },
+            'task_manager.error_reporting': {
+                'level': 'WARNING',
+                'handlers': ['console'],
+            },
         },
     }
 )
@@ -165,4 +282,7 @@ ROLLBAR = {
     'branch': 'master',
     'root': BASE_DIR,
     'enabled': not DEBUG,
+    # Items are posted by the error reporting thread, waiting for them
+    'handler': 'blocking',
+    'timeout': int(os.getenv('ROLLBAR_TIMEOUT', '3')),
 }
@@ -0,0 +1,190 @@
+"""Sampled log of slow SQL queries.
+
+SlowQueryLogMiddleware wraps the execution of every query of a request.
+A query faster than SLOW_QUERY_THRESHOLD_MS costs two clock reads and a
+comparison, a slower one is logged with the chance SLOW_QUERY_SAMPLE_RATE
+as a JSON line to the 'task_manager.slow_queries' logger. Entries carry
+the SQL, parameters, duration, view and URL name of the request and the
+innermost project frame the query was run from.
+"""
+import json
+import logging
+import os
+import random
+import time
+import traceback
+from contextlib import ExitStack, contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+logger = logging.getLogger('task_manager.slow_queries')
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Frames of the project outside of it, e.g. of installed packages.
+SKIPPED_DIRS = ('site-packages', 'dist-packages')
+
+
+def _get_origin() -> Optional[str]:
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if filename == __file__ or not filename.startswith(PROJECT_DIR):
+            continue
+        if any(skipped in filename for skipped in SKIPPED_DIRS):
+            continue
+        return '{file}:{line} in {name}'.format(
+            file=os.path.relpath(filename, os.path.dirname(PROJECT_DIR)),
+            line=frame.lineno,
+            name=frame.name,
+        )
+    return None
+
+
+def _get_view(request) -> Dict[str, Optional[str]]:
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return {'view': None, 'url_name': None}
+    view = getattr(match.func, 'view_class', match.func)
+    return {
+        'view': '{module}.{name}'.format(
+            module=view.__module__, name=view.__name__,
+        ),
+        'url_name': match.view_name,
+    }
+
+
+class SlowQueryLogger(object):
+    """Execute wrapper logging sampled slow queries."""
+
+    def __init__(
+        self,
+        threshold: float,
+        sample_rate: float,
+        request: Any = None,
+    ):
+        """
+        Init wrapper.
+
+        Args:
+            threshold: duration in seconds from which queries are logged
+            sample_rate: chance of a slow query to be logged
+            request: http request the queries are run for
+        """
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self.request = request
+
+    def __call__(  # noqa: WPS211
+        self,
+        execute,
+        sql: str,
+        params: Any,
+        many: bool,
+        context: Dict[str, Any],
+    ) -> Any:
+        """
+        Execute the query, log it when slow.
+
+        Args:
+            execute: next wrapper or the cursor method
+            sql: SQL
+            params: parameters
+            many: executemany() call
+            context: connection and cursor
+
+        Returns:
+            Any:
+        """
+        started = time.perf_counter()
+        try:  # noqa: WPS501
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            if duration >= self.threshold:
+                self.log(sql, params, many, duration, context)
+
+    def log(  # noqa: WPS211
+        self,
+        sql: str,
+        params: Any,
+        many: bool,
+        duration: float,
+        context: Dict[str, Any],
+    ) -> None:
+        """
+        Write the entry of a slow query if it is sampled.
+
+        Args:
+            sql: SQL
+            params: parameters
+            many: executemany() call
+            duration: seconds
+            context: connection and cursor
+        """
+        if random.random() >= self.sample_rate:  # noqa: S311
+            return
+        entry = {
+            'time': timezone.now().isoformat(),
+            'duration_ms': round(duration * 1000, 3),
+            'database': context['connection'].alias,
+            'sql': sql,
+            'params': params,
+            'many': many,
+            'method': getattr(self.request, 'method', None),
+            'path': getattr(self.request, 'path', None),
+            'origin': _get_origin(),
+        }
+        entry.update(_get_view(self.request))
+        logger.warning(json.dumps(entry, default=str))
+
+
+@contextmanager
+def log_slow_queries(request: Any = None) -> Iterator[None]:
+    """
+    Log slow queries of all databases run within the block.
+
+    Args:
+        request: http request the queries are run for
+
+    Yields:
+        None:
+    """
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold is None or not logger.isEnabledFor(logging.WARNING):
+        yield
+        return
+    wrapper = SlowQueryLogger(
+        threshold / 1000, settings.SLOW_QUERY_SAMPLE_RATE, request,
+    )
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(wrapper))
+        yield
+
+
+class SlowQueryLogMiddleware(object):
+    """Log slow queries of every request."""
+
+    def __init__(self, get_response):
+        """
+        Init middleware.
+
+        Args:
+            get_response: next handler
+        """
+        self.get_response = get_response
+
+    def __call__(self, request) -> Any:
+        """
+        Handle the request logging its slow queries.
+
+        Args:
+            request: http request
+
+        Returns:
+            Any:
+        """
+        with log_slow_queries(request):
+            return self.get_response(request)
@@ -7,3 +7,7 @@ class StatusesConfig(AppConfig):
 
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'task_manager.statuses'
+
+    def ready(self) -> None:
+        """Connect signals."""
+        from task_manager.statuses import signals  # noqa: F401, WPS433
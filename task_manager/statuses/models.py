@@ -19,6 +19,9 @@ class Status(models.Model):
         },
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Tasks in the status, kept by the tasks signals
+    task_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self) -> str:
         """
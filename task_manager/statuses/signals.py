@@ -0,0 +1,33 @@
+"""Statuses signals."""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from task_manager.cache import bump_version
+from task_manager.paginators import get_count_namespace
+from task_manager.reference import invalidate_reference
+from task_manager.statuses.models import Status
+
+
+@receiver(post_save, sender=Status)
+@receiver(post_delete, sender=Status)
+def invalidate_statuses_count(sender, **kwargs) -> None:
+    """
+    Invalidate cached counts of statuses lists.
+
+    Args:
+        sender: model class
+        kwargs: signal arguments
+    """
+    bump_version(get_count_namespace(Status))
+
+
+@receiver(post_save, sender=Status)
+@receiver(post_delete, sender=Status)
+def invalidate_statuses_reference(sender, **kwargs) -> None:
+    """
+    Drop cached statuses rows.
+
+    Args:
+        sender: model class
+        kwargs: signal arguments
+    """
+    invalidate_reference(Status)
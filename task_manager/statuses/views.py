@@ -1,30 +1,35 @@
 """Statuses views."""
-from typing import Union
-
-from django.contrib import messages
 from django.contrib.messages.views import SuccessMessageMixin
-from django.db.models.deletion import ProtectedError
-from django.http.response import (
-    HttpResponsePermanentRedirect,
-    HttpResponseRedirect,
-)
-from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views.generic.edit import CreateView, DeleteView, UpdateView
 from django.views.generic.list import ListView
-from task_manager.mixins import CustomLoginRequiredMixin
+from task_manager.mixins import (
+    CachedCountPaginationMixin,
+    ConditionalGetMixin,
+    CustomLoginRequiredMixin,
+    InUseListMixin,
+    ProtectedDeleteMixin,
+)
 from task_manager.statuses.forms import StatusForm
 from task_manager.statuses.models import Status
+from task_manager.tasks.models import Tasks
 
 
-class StatusListView(CustomLoginRequiredMixin, ListView):
+class StatusListView(  # noqa: WPS215
+    CustomLoginRequiredMixin,
+    InUseListMixin,
+    ConditionalGetMixin,
+    CachedCountPaginationMixin,
+    ListView,
+):
     """Status listing."""
 
     model = Status
     paginate_by = 10
     context_object_name = 'statuses_list'
     template_name = 'statuses/index.html'
+    in_use_relations = ((Tasks, 'status'),)
 
 
 class StatusCreateView(
@@ -54,8 +59,9 @@ class StatusUpdateView(
     success_message = _('SuccessUpdateStatus')
 
 
-class StatusDeleteView(
+class StatusDeleteView(  # noqa: WPS215
     CustomLoginRequiredMixin,
+    ProtectedDeleteMixin,
     SuccessMessageMixin,
     DeleteView,
 ):
@@ -66,24 +72,6 @@ class StatusDeleteView(
     template_name = 'statuses/delete.html'
     success_url = reverse_lazy('statuses')
     success_message = _('SuccessDeleteStatus')
-
-    def post(self, request, *args, **kwargs) -> Union[
-        HttpResponsePermanentRedirect,
-        HttpResponseRedirect,
-    ]:
-        """
-        Override 'post' in DeletionMixin.
-
-        Args:
-            request: request
-
-        Returns:
-            Union:
-        """
-        try:
-            response = self.delete(request, *args, **kwargs)
-            messages.success(self.request, self.success_message)
-            return response
-        except ProtectedError:
-            messages.error(self.request, _('CannotDeleteStatus'))
-            return redirect('statuses')
+    in_use_relations = StatusListView.in_use_relations
+    protected_message = _('CannotDeleteStatus')
+    protected_url = reverse_lazy('statuses')
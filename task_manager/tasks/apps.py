@@ -7,3 +7,7 @@ class TasksConfig(AppConfig):
 
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'task_manager.tasks'
+
+    def ready(self) -> None:
+        """Connect signals."""
+        from task_manager.tasks import signals  # noqa: F401, WPS433
@@ -0,0 +1,659 @@
+"""HTTP benchmark of the tasks pages.
+
+Concurrent clients, each logged in as another user, send a weighted mix
+of requests (task list with random filters, detail, create, update and
+delete) to a WSGI server for a while. Latencies are measured around the
+whole HTTP exchange and reported per URL name with the throughput, so
+the JSON report of two runs can be compared.
+
+The server is either external (e.g. gunicorn on the same database) or
+started in the process: a threaded wsgiref server, or uvicorn serving the
+ASGI application to compare both paths. In the latter case the clients
+and the server share the GIL, so only compare runs made the same way.
+"""
+import json
+import random
+import socket
+import string
+import threading
+import time
+import uuid
+from http.client import HTTPConnection
+from importlib import import_module
+from socketserver import ThreadingMixIn
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY
+from django.contrib.auth import SESSION_KEY as USER_SESSION_KEY
+from django.core.exceptions import ImproperlyConfigured
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.urls import reverse
+from django.utils.crypto import get_random_string
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.filters import LABEL_MODE_ALL
+from task_manager.tasks.models import Tasks
+from task_manager.tasks.seeding import WORDS
+
+DEFAULT_MIX = MappingProxyType({
+    'tasks': 60,
+    'detail_task': 20,
+    'create_task': 8,
+    'update_task': 8,
+    'delete_task': 4,
+})
+PERCENTILES = MappingProxyType({'p50': 0.5, 'p95': 0.95, 'p99': 0.99})
+# Chance of every filter of a task list request.
+FILTER_CHANCES = MappingProxyType({
+    'status': 0.3,
+    'executor': 0.3,
+    'label': 0.3,
+    'self_tasks': 0.2,
+    'q': 0.1,
+})
+LABELS_PER_REQUEST = 2
+# Tasks picked at random for detail pages and list filters.
+SAMPLE_SIZE = 1000
+NAME_PREFIX = 'bench-'
+OK_STATUSES = frozenset((200, 302))
+TIMEOUT = 60
+CSRF_HEADER = 'X-CSRFToken'
+CSRF_TOKEN_LENGTH = 64
+INTERFACE_WSGI = 'wsgi'
+INTERFACE_ASGI = 'asgi'
+INTERFACES = (INTERFACE_WSGI, INTERFACE_ASGI)
+# Seconds between checks that the ASGI server started.
+ASGI_START_POLL = 0.05
+
+
+class Sample(NamedTuple):
+    """Outcome of one request."""
+
+    name: str
+    latency: float
+    ok: bool
+
+
+class Request(NamedTuple):
+    """Request of the mix."""
+
+    name: str
+    method: str
+    path: str
+    form: Optional[Dict[str, Any]] = None
+
+
+class BenchmarkData(NamedTuple):
+    """Rows the requests refer to."""
+
+    status_ids: List[int]
+    label_ids: List[int]
+    user_ids: List[int]
+    task_ids: List[int]
+
+
+def load_data() -> BenchmarkData:
+    """
+    Load ids of a random sample of rows.
+
+    Returns:
+        BenchmarkData:
+    """
+    task_ids = Tasks.objects.order_by('?').values_list('pk', flat=True)
+    user_ids = Tasks.objects.exclude(executor=None).order_by('?').values_list(
+        'executor', flat=True,
+    )
+    return BenchmarkData(
+        status_ids=list(Status.objects.values_list('pk', flat=True)),
+        label_ids=list(Label.objects.values_list('pk', flat=True)),
+        user_ids=list(user_ids[:SAMPLE_SIZE]),
+        task_ids=list(task_ids[:SAMPLE_SIZE]),
+    )
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    """
+    Parse weights of URL names like 'tasks=60,detail_task=20'.
+
+    Args:
+        mix: comma separated name=weight pairs
+
+    Raises:
+        ValueError: unknown name or invalid weight
+
+    Returns:
+        Dict: weight by URL name
+    """
+    weights = {}
+    for pair in filter(None, mix.split(',')):
+        name, _, weight = pair.partition('=')
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError('Unknown URL name: {name}'.format(name=name))
+        weights[name] = int(weight)
+    if not any(weights.values()):
+        raise ValueError('The mix has no requests')
+    return weights
+
+
+def create_session(user: Any) -> str:
+    """
+    Log the user in without a password.
+
+    Args:
+        user: user instance
+
+    Returns:
+        str: session key
+    """
+    engine = import_module(settings.SESSION_ENGINE)
+    session = engine.SessionStore()
+    session[USER_SESSION_KEY] = user._meta.pk.value_to_string(user)
+    session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.save()
+    return session.session_key
+
+
+def percentile(latencies: List[float], share: float) -> float:
+    """
+    Get the nearest rank percentile.
+
+    Args:
+        latencies: sorted latencies
+        share: percentile as a share, 0.95 for p95
+
+    Returns:
+        float:
+    """
+    rank = max(1, round(share * len(latencies)))
+    return latencies[min(rank, len(latencies)) - 1]
+
+
+def summarize(samples: List[Sample], elapsed: float) -> Dict[str, Any]:
+    """
+    Compute throughput and latency percentiles per URL name.
+
+    Args:
+        samples: outcomes of all requests
+        elapsed: duration of the run in seconds
+
+    Returns:
+        Dict: JSON serializable report, latencies in milliseconds
+    """
+    by_name: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        by_name.setdefault(sample.name, []).append(sample)
+    urls = {}
+    for name, name_samples in sorted(by_name.items()):
+        latencies = sorted(timed.latency for timed in name_samples)
+        stats = {
+            'requests': len(name_samples),
+            'errors': sum(not timed.ok for timed in name_samples),
+            'rps': len(name_samples) / elapsed,
+        }
+        for key, share in PERCENTILES.items():
+            stats[key] = percentile(latencies, share) * 1000
+        urls[name] = stats
+    return {
+        'duration': elapsed,
+        'requests': len(samples),
+        'errors': sum(not timed.ok for timed in samples),
+        'rps': len(samples) / elapsed,
+        'urls': urls,
+    }
+
+
+def find_regressions(
+    baseline: Mapping[str, Any],
+    report: Mapping[str, Any],
+    threshold: float,
+) -> List[str]:
+    """
+    Compare a report with the baseline.
+
+    Args:
+        baseline: report of the previous run
+        report: report of this run
+        threshold: tolerated share of change, 0.1 for 10%
+
+    Returns:
+        List: descriptions of throughput drops and latency growths
+    """
+    regressions = []
+    if report['rps'] < baseline['rps'] * (1 - threshold):
+        regressions.append('throughput {old:.1f} -> {new:.1f} rps'.format(
+            old=baseline['rps'], new=report['rps'],
+        ))
+    for name, stats in report['urls'].items():
+        old_stats = baseline['urls'].get(name)
+        if old_stats is None:
+            continue
+        for key in PERCENTILES:
+            if stats[key] > old_stats[key] * (1 + threshold):
+                regressions.append(
+                    '{name} {key} {old:.1f} -> {new:.1f} ms'.format(
+                        name=name,
+                        key=key,
+                        old=old_stats[key],
+                        new=stats[key],
+                    ),
+                )
+    return regressions
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    """WSGI server handling every request in a thread."""
+
+    daemon_threads = True
+
+
+class QuietHandler(WSGIRequestHandler):
+    """Request handler without access log."""
+
+    def log_message(self, *args) -> None:
+        """
+        Skip logging of requests.
+
+        Args:
+            args: format and values of the message
+        """
+
+
+class LocalServer(object):
+    """The project application served in a background thread."""
+
+    def __init__(self, interface: str = INTERFACE_WSGI):
+        """
+        Init server.
+
+        Args:
+            interface: INTERFACE_WSGI or INTERFACE_ASGI
+        """
+        self.interface = interface
+
+    def __enter__(self) -> str:
+        """
+        Start the server on a free port.
+
+        Returns:
+            str: base URL
+        """
+        if self.interface == INTERFACE_ASGI:
+            port = self._start_asgi()
+        else:
+            port = self._start_wsgi()
+        return 'http://127.0.0.1:{port}'.format(port=port)
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Stop the server.
+
+        Args:
+            exc_info: exception raised in the block
+        """
+        if self.interface == INTERFACE_ASGI:
+            self.server.should_exit = True
+            self.thread.join()
+            self.socket.close()
+            return
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def _start_wsgi(self) -> int:
+        self.server = make_server(
+            '127.0.0.1',
+            0,
+            get_wsgi_application(),
+            server_class=ThreadingWSGIServer,
+            handler_class=QuietHandler,
+        )
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, daemon=True,
+        )
+        self.thread.start()
+        return self.server.server_port
+
+    def _start_asgi(self) -> int:
+        try:
+            import uvicorn  # noqa: WPS433
+        except ImportError:
+            raise ImproperlyConfigured(
+                'The ASGI server needs uvicorn: pip install uvicorn',
+            )
+        from task_manager.asgi import application  # noqa: WPS433
+
+        self.socket = socket.socket()
+        self.socket.bind(('127.0.0.1', 0))
+        self.server = uvicorn.Server(uvicorn.Config(
+            application, lifespan='off', log_level='warning', access_log=False,
+        ))
+        # Signal handlers can be installed by the main thread only.
+        self.server.install_signal_handlers = lambda: None
+        self.thread = threading.Thread(
+            target=self.server.run,
+            kwargs={'sockets': [self.socket]},
+            daemon=True,
+        )
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(ASGI_START_POLL)
+        return self.socket.getsockname()[1]
+
+
+class BenchmarkClient(object):
+    """Client sending requests of the mix as one user."""
+
+    def __init__(  # noqa: WPS211
+        self,
+        base_url: str,
+        session_key: str,
+        data: BenchmarkData,
+        mix: Mapping[str, int],
+        seed: int,
+    ):
+        """
+        Init client.
+
+        Args:
+            base_url: server URL
+            session_key: session of the logged in user
+            data: rows the requests refer to
+            mix: weight by URL name
+            seed: random seed of the client
+        """
+        url = urlsplit(base_url)
+        self.host = url.hostname
+        self.port = url.port
+        self.data = data
+        self.names = list(mix)
+        self.weights = list(mix.values())
+        self.builders = {
+            'tasks': self.tasks,
+            'detail_task': self.detail,
+            'create_task': self.create,
+            'update_task': self.update,
+            'delete_task': self.delete,
+        }
+        self.random = random.Random(seed)
+        self.created: List[Tuple[int, str]] = []
+        csrf_token = get_random_string(
+            CSRF_TOKEN_LENGTH, string.ascii_letters + string.digits,
+        )
+        self.headers = {
+            'Cookie': '{session}={key}; {csrf}={token}'.format(
+                session=settings.SESSION_COOKIE_NAME,
+                key=session_key,
+                csrf=settings.CSRF_COOKIE_NAME,
+                token=csrf_token,
+            ),
+            CSRF_HEADER: csrf_token,
+            'Accept-Language': settings.LANGUAGE_CODE,
+        }
+        self.samples: List[Sample] = []
+
+    def run(self, deadline: float) -> None:
+        """
+        Send requests until the deadline.
+
+        Args:
+            deadline: time.monotonic() to stop at
+        """
+        try:  # noqa: WPS501
+            while time.monotonic() < deadline:
+                name = self.random.choices(self.names, self.weights)[0]
+                self.send(self.builders[name]())
+        finally:
+            connection.close()
+
+    def send(self, request: Request) -> int:
+        """
+        Send a request and record its latency.
+
+        Args:
+            request: request of the mix
+
+        Returns:
+            int: response status
+        """
+        headers = dict(self.headers)
+        body = None
+        if request.form is not None:
+            body = urlencode(request.form, doseq=True)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        http = HTTPConnection(self.host, self.port, timeout=TIMEOUT)
+        started = time.perf_counter()
+        try:  # noqa: WPS229, WPS501
+            http.request(
+                request.method, request.path, body=body, headers=headers,
+            )
+            response = http.getresponse()
+            response.read()
+        finally:
+            http.close()
+        self.samples.append(
+            Sample(
+                request.name,
+                time.perf_counter() - started,
+                response.status in OK_STATUSES,
+            ),
+        )
+        return response.status
+
+    def tasks(self) -> Request:
+        """
+        Build a request of the task list with random filters.
+
+        Returns:
+            Request:
+        """
+        data = self.data
+        query: Dict[str, Any] = {}
+        if data.status_ids and self.chance('status'):
+            query['status'] = self.random.choice(data.status_ids)
+        if data.user_ids and self.chance('executor'):
+            query['executor'] = self.random.choice(data.user_ids)
+        if data.label_ids and self.chance('label'):
+            query['label'] = self.pick_labels()
+            query['label_mode'] = LABEL_MODE_ALL
+        if self.chance('self_tasks'):
+            query['self_tasks'] = 'on'
+        if self.chance('q'):
+            query['q'] = self.random.choice(WORDS)
+        return Request('tasks', 'GET', '{path}?{query}'.format(
+            path=reverse('tasks'), query=urlencode(query, doseq=True),
+        ))
+
+    def detail(self) -> Request:
+        """
+        Build a request of a random task detail.
+
+        Returns:
+            Request:
+        """
+        if not self.data.task_ids:
+            return self.create()
+        pk = self.random.choice(self.data.task_ids)
+        return Request(
+            'detail_task', 'GET', reverse('detail_task', kwargs={'pk': pk}),
+        )
+
+    def create(self) -> Request:
+        """
+        Build a request creating a task, remembered for update and delete.
+
+        Returns:
+            Request:
+        """
+        name = '{prefix}{id}'.format(prefix=NAME_PREFIX, id=uuid.uuid4().hex)
+        self.created.append((0, name))
+        return Request(
+            'create_task', 'POST', reverse('create_task'), self.task_form(name),
+        )
+
+    def update(self) -> Request:
+        """
+        Build a request updating a task created by the client.
+
+        Returns:
+            Request:
+        """
+        pk = self.pick_created(pop=False)
+        if pk is None:
+            return self.create()
+        name = '{prefix}{id}'.format(prefix=NAME_PREFIX, id=uuid.uuid4().hex)
+        self.created[-1] = (pk, name)
+        return Request(
+            'update_task',
+            'POST',
+            reverse('update_task', kwargs={'pk': pk}),
+            self.task_form(name),
+        )
+
+    def delete(self) -> Request:
+        """
+        Build a request deleting a task created by the client.
+
+        Returns:
+            Request:
+        """
+        pk = self.pick_created(pop=True)
+        if pk is None:
+            return self.create()
+        path = reverse('delete_task', kwargs={'pk': pk})
+        return Request('delete_task', 'POST', path, {})
+
+    def pick_created(self, pop: bool) -> Optional[int]:
+        """
+        Get id of the last task created by the client.
+
+        The id is looked up outside of the measured request.
+
+        Args:
+            pop: forget the task
+
+        Returns:
+            Optional: None when the client has no tasks
+        """
+        while self.created:
+            pk, name = self.created[-1]
+            if not pk:
+                pk = Tasks.objects.filter(name=name).values_list(
+                    'pk', flat=True,
+                ).first()
+            if pk is None:
+                self.created.pop()
+                continue
+            if pop:
+                self.created.pop()
+            else:
+                self.created[-1] = (pk, name)
+            return pk
+        return None
+
+    def task_form(self, name: str) -> Dict[str, Any]:
+        """
+        Build fields of the task form.
+
+        Args:
+            name: task name
+
+        Returns:
+            Dict:
+        """
+        data = self.data
+        form = {
+            'name': name,
+            'description': ' '.join(self.random.choices(WORDS, k=10)),
+            'status': self.random.choice(data.status_ids),
+            'executor': '',
+            'labels': [],
+        }
+        if data.user_ids:
+            form['executor'] = self.random.choice(data.user_ids)
+        if data.label_ids:
+            form['labels'] = self.pick_labels()
+        return form
+
+    def pick_labels(self) -> List[int]:
+        """
+        Pick random labels.
+
+        Returns:
+            List:
+        """
+        label_ids = self.data.label_ids
+        return self.random.sample(
+            label_ids, min(LABELS_PER_REQUEST, len(label_ids)),
+        )
+
+    def chance(self, filter_name: str) -> bool:
+        """
+        Decide whether the list request uses the filter.
+
+        Args:
+            filter_name: key of FILTER_CHANCES
+
+        Returns:
+            bool:
+        """
+        return self.random.random() < FILTER_CHANCES[filter_name]
+
+
+def run_benchmark(  # noqa: WPS211
+    base_url: str,
+    users: List[Any],
+    duration: float,
+    mix: Mapping[str, int],
+    seed: int = 1,
+) -> Dict[str, Any]:
+    """
+    Run one client per user for the duration.
+
+    Args:
+        base_url: server URL
+        users: users the clients log in as
+        duration: seconds
+        mix: weight by URL name
+        seed: random seed
+
+    Returns:
+        Dict: report, see summarize()
+    """
+    data = load_data()
+    clients = [
+        BenchmarkClient(base_url, create_session(user), data, mix, seed + index)
+        for index, user in enumerate(users)
+    ]
+    started = time.monotonic()
+    threads = [
+        threading.Thread(target=client.run, args=(started + duration,))
+        for client in clients
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:  # noqa: WPS440
+        thread.join()
+    elapsed = time.monotonic() - started
+    return summarize(
+        [sample for client in clients for sample in client.samples],
+        elapsed,
+    )
+
+
+def write_report(report: Mapping[str, Any], path: str) -> None:
+    """
+    Write the report as JSON.
+
+    Args:
+        report: report of a run
+        path: output file
+    """
+    with open(path, 'w', encoding='utf-8') as report_file:
+        json.dump(report, report_file, indent=2, sort_keys=True)
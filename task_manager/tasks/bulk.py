@@ -0,0 +1,141 @@
+"""Bulk actions on tasks.
+
+An action runs a constant number of set-based statements in one
+transaction whatever the count of selected tasks. The statements bypass
+model signals, so the caches the signals keep are invalidated here.
+"""
+from typing import Any, Dict, Iterable, List, NamedTuple
+
+from django.db import connections, router, transaction
+from django.utils import timezone
+from task_manager.cache import bump_version
+from task_manager.paginators import get_count_namespace
+from task_manager.tasks.counters import (
+    update_label_counters,
+    update_task_counters,
+)
+from task_manager.tasks.dashboard import invalidate_dashboards
+from task_manager.tasks.events import (
+    ACTION_DELETED,
+    ACTION_UPDATED,
+    publish_task_events,
+)
+from task_manager.tasks.fragments import invalidate_task_rows
+from task_manager.tasks.models import TaskLabelRelated, Tasks
+from task_manager.tasks.search import unindex_tasks
+
+ACTION_STATUS = 'status'
+ACTION_EXECUTOR = 'executor'
+ACTION_DELETE = 'delete'
+USER_FIELDS = ('creator', 'executor')
+
+
+class BulkResult(NamedTuple):
+    """Outcome of a bulk action."""
+
+    applied: List[int]
+    not_found: List[int]
+    forbidden: List[int]
+
+
+def _invalidate(
+    task_ids: List[int], user_ids: Iterable[Any], action: str,
+) -> None:
+    bump_version(get_count_namespace(Tasks))
+    invalidate_task_rows(task_ids)
+    invalidate_dashboards(user_ids)
+    if action == ACTION_DELETE:
+        publish_task_events(task_ids, ACTION_DELETED)
+    else:
+        # Names of the other actions are the names of the changed fields.
+        publish_task_events(task_ids, ACTION_UPDATED, [action])
+
+
+def apply_bulk_action(
+    user: Any,
+    action: str,
+    task_ids: Iterable[int],
+    target: Any = None,
+) -> BulkResult:
+    """
+    Change status or executor of the tasks, or delete them.
+
+    Only the creator of a task may delete it, the other selected tasks are
+    reported as forbidden and left untouched.
+
+    Args:
+        user: user applying the action
+        action: ACTION_STATUS, ACTION_EXECUTOR or ACTION_DELETE
+        task_ids: ids of selected tasks
+        target: new status or executor, None unassigns the executor
+
+    Returns:
+        BulkResult:
+    """
+    task_ids = set(task_ids)
+    with transaction.atomic():
+        tasks = Tasks.objects.filter(pk__in=task_ids).select_for_update()
+        refs: Dict[int, Dict[str, Any]] = {
+            task_refs.pop('pk'): task_refs
+            for task_refs in tasks.values('pk', 'status', 'creator', 'executor')
+        }
+        applied = sorted(refs)
+        forbidden = []
+        if action == ACTION_DELETE:
+            forbidden = [pk for pk in applied if refs[pk]['creator'] != user.pk]
+            applied = [pk for pk in applied if refs[pk]['creator'] == user.pk]
+            _delete_tasks(applied)
+            update_task_counters([refs[pk] for pk in applied], [])
+        elif applied:
+            Tasks.objects.filter(pk__in=applied).update(
+                updated_at=timezone.now(), **{action: target},
+            )
+            update_task_counters(
+                [refs[pk] for pk in applied],
+                [
+                    dict(refs[pk], **{action: getattr(target, 'pk', None)})
+                    for pk in applied
+                ],
+            )
+        user_ids = {
+            refs[pk][field] for pk in applied for field in USER_FIELDS
+        }
+        if action == ACTION_EXECUTOR and target is not None:
+            user_ids.add(target.pk)
+        _invalidate(applied, user_ids, action)
+    return BulkResult(
+        applied=applied,
+        not_found=sorted(task_ids - refs.keys()),
+        forbidden=forbidden,
+    )
+
+
+def _delete_rows(model, column: str, ids: List[int], using: str) -> None:
+    connection = connections[using]
+    quote_name = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'DELETE FROM {table} WHERE {column} IN ({ids})'.format(
+                table=quote_name(model._meta.db_table),
+                column=quote_name(column),
+                ids=', '.join(['%s'] * len(ids)),
+            ),
+            ids,
+        )
+
+
+def _delete_tasks(task_ids: List[int]) -> None:
+    if not task_ids:
+        return
+    # Plain deletes skip the collector, which would load every task and its
+    # label links and send their signals one by one; the side effects of
+    # the signals are applied here and by _invalidate().
+    using = router.db_for_write(Tasks)
+    relations = TaskLabelRelated.objects.using(using).filter(
+        task_id__in=task_ids,
+    )
+    update_label_counters(relations.values_list('label', flat=True), -1)
+    task_column = TaskLabelRelated._meta.get_field('task').column
+    _delete_rows(TaskLabelRelated, task_column, task_ids, using)
+    _delete_rows(Tasks, Tasks._meta.pk.column, task_ids, using)
+    unindex_tasks(task_ids, using=using)
@@ -0,0 +1,152 @@
+"""Counters of tasks kept on statuses, labels and users.
+
+The tasks signals move the counters with F() updates, bulk operations
+move them for all their rows at once. The 'recount' command repairs
+counters which drifted, e.g. after writes made around the ORM.
+"""
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional
+
+from django.contrib.auth import get_user_model
+from django.db import models
+from django.db.models.functions import Coalesce, Greatest
+from task_manager.cache import bump_version
+from task_manager.labels.models import Label
+from task_manager.paginators import get_count_namespace
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import TaskLabelRelated, Tasks
+
+
+class TaskCounter(NamedTuple):
+    """Counter column and the rows it counts."""
+
+    model: Any
+    counter: str
+    source: Any
+    source_field: str
+
+
+STATUS_COUNTER = TaskCounter(Status, 'task_count', Tasks, 'status')
+CREATED_COUNTER = TaskCounter(
+    get_user_model(), 'created_count', Tasks, 'creator',
+)
+ASSIGNED_COUNTER = TaskCounter(
+    get_user_model(), 'assigned_count', Tasks, 'executor',
+)
+LABEL_COUNTER = TaskCounter(Label, 'task_count', TaskLabelRelated, 'label')
+TASK_COUNTERS = (STATUS_COUNTER, CREATED_COUNTER, ASSIGNED_COUNTER)
+COUNTERS = (*TASK_COUNTERS, LABEL_COUNTER)
+
+
+def adjust_counter(
+    task_counter: TaskCounter,
+    deltas: Mapping[Any, int],
+) -> None:
+    """
+    Add the deltas to the counters of the rows.
+
+    Rows with the same delta are updated by one statement.
+
+    Args:
+        task_counter: counter column
+        deltas: delta by primary key, None keys are skipped
+    """
+    pks_by_delta: Dict[int, List[Any]] = defaultdict(list)
+    for pk, pk_delta in deltas.items():
+        if pk is not None and pk_delta:
+            pks_by_delta[pk_delta].append(pk)
+    counter = task_counter.counter
+    for delta, pks in pks_by_delta.items():
+        counter_value = models.F(counter) + delta
+        if delta < 0:
+            # A drifted counter stays valid until it is recounted.
+            counter_value = Greatest(counter_value, 0)
+        task_counter.model.objects.filter(pk__in=pks).update(
+            **{counter: counter_value},
+        )
+    if pks_by_delta:
+        # Counters are shown in lists answered by conditional GET.
+        bump_version(get_count_namespace(task_counter.model))
+
+
+def update_task_counters(
+    removed: Iterable[Mapping[str, Any]],
+    added: Iterable[Mapping[str, Any]],
+) -> None:
+    """
+    Move counters of statuses and users referenced by tasks.
+
+    Args:
+        removed: references of tasks deleted or changed, by field name
+        added: references of tasks created or changed, by field name
+    """
+    deltas = {
+        task_counter.source_field: Counter()
+        for task_counter in TASK_COUNTERS
+    }
+    for removed_refs in removed:
+        for field, field_deltas in deltas.items():
+            field_deltas[removed_refs.get(field)] -= 1
+    for added_refs in added:
+        for field, field_deltas in deltas.items():  # noqa: WPS440
+            field_deltas[added_refs.get(field)] += 1
+    for task_counter in TASK_COUNTERS:
+        adjust_counter(task_counter, deltas[task_counter.source_field])
+
+
+def update_label_counters(label_ids: Iterable[Any], delta: int) -> None:
+    """
+    Move counters of labels, once per occurrence of a label.
+
+    Args:
+        label_ids: labels of added or removed task links
+        delta: 1 for added links, -1 for removed ones
+    """
+    adjust_counter(
+        LABEL_COUNTER,
+        {
+            label_id: links_count * delta
+            for label_id, links_count in Counter(label_ids).items()
+        },
+    )
+
+
+def recount(
+    task_counter: TaskCounter,
+    pks: Optional[Iterable[Any]] = None,
+) -> int:
+    """
+    Set the counters which drifted to the count of rows.
+
+    Args:
+        task_counter: counter column
+        pks: rows to check, all by default
+
+    Returns:
+        int: count of fixed rows
+    """
+    field = task_counter.source_field
+    actual = Coalesce(
+        models.Subquery(
+            task_counter.source.objects.filter(
+                **{field: models.OuterRef('pk')},
+            ).order_by().values(field).annotate(
+                rows_count=models.Count('pk'),
+            ).values('rows_count'),
+        ),
+        0,
+    )
+    rows = task_counter.model.objects.all()
+    if pks is not None:
+        rows = rows.filter(pk__in=pks)
+    drifted = list(
+        rows.annotate(actual_count=actual).exclude(
+            **{task_counter.counter: models.F('actual_count')},
+        ).values_list('pk', flat=True),
+    )
+    if drifted:
+        task_counter.model.objects.filter(pk__in=drifted).update(
+            **{task_counter.counter: actual},
+        )
+        bump_version(get_count_namespace(task_counter.model))
+    return len(drifted)
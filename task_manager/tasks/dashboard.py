@@ -0,0 +1,106 @@
+"""Dashboard of the home page.
+
+Counts of tasks by status, where the user is the creator and where the
+user is the executor, and recently changed tasks are computed with one
+grouped query per section and cached under the version of the user.
+Signals bump the version of every user a task write concerns. Status
+names are resolved from the reference cache when read, so renames do not
+invalidate dashboards.
+"""
+from typing import Any, Dict, Iterable, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+from task_manager.cache import bump_version, make_key
+from task_manager.reference import get_reference_map
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Tasks
+
+RECENT_TASKS = 5
+
+
+def get_dashboard_namespace(user_id: int) -> str:
+    """
+    Get cache namespace of the dashboard of the user.
+
+    Args:
+        user_id: user primary key
+
+    Returns:
+        str:
+    """
+    return 'dashboard:{id}'.format(id=user_id)
+
+
+def invalidate_dashboards(user_ids: Iterable[Any]) -> None:
+    """
+    Recompute dashboards of the users.
+
+    Args:
+        user_ids: user primary keys, None is skipped
+    """
+    for user_id in set(user_ids) - {None}:
+        bump_version(get_dashboard_namespace(user_id))
+
+
+def _count_by_status(tasks: models.QuerySet) -> List[List[int]]:
+    return [
+        [row['status'], row['tasks_count']]
+        for row in tasks.values('status').annotate(
+            tasks_count=models.Count('id'),
+        ).order_by('status')
+    ]
+
+
+def build_dashboard(user_id: int) -> Dict[str, Any]:
+    """
+    Compute the dashboard of the user.
+
+    Args:
+        user_id: user primary key
+
+    Returns:
+        Dict: status ids with counts and recent tasks, cacheable as is
+    """
+    recent = Tasks.objects.filter(
+        models.Q(creator=user_id) | models.Q(executor=user_id),
+    ).order_by('-updated_at').values('id', 'name', 'status', 'updated_at')
+    return {
+        'created': _count_by_status(Tasks.objects.filter(creator=user_id)),
+        'executed': _count_by_status(Tasks.objects.filter(executor=user_id)),
+        'recent': list(recent[:RECENT_TASKS]),
+    }
+
+
+def _with_status(rows: Iterable[Any], statuses: Dict[int, Any]) -> List:
+    return [
+        {'status': statuses.get(status_id), 'count': tasks_count}
+        for status_id, tasks_count in rows
+    ]
+
+
+def get_dashboard(user_id: int) -> Dict[str, Any]:
+    """
+    Get the dashboard of the user from the cache.
+
+    Args:
+        user_id: user primary key
+
+    Returns:
+        Dict: counts by status and recent tasks
+    """
+    dashboard = cache.get_or_set(
+        make_key(get_dashboard_namespace(user_id)),
+        lambda: build_dashboard(user_id),
+        timeout=settings.DASHBOARD_CACHE_TIMEOUT,
+    )
+    statuses = get_reference_map(Status)
+    return {
+        'created': _with_status(dashboard['created'], statuses),
+        'executed': _with_status(dashboard['executed'], statuses),
+        'recent': [
+            dict(task, status=statuses.get(task['status']))
+            for task in dashboard['recent']
+        ],
+    }
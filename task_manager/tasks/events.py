@@ -0,0 +1,512 @@
+"""Live change notifications of the task list.
+
+Writes of tasks and of their labels publish a compact event once the
+transaction commits: the task id, the action, the changed row fields and
+the row version of the task. TaskEventsView streams the events as
+server-sent events along with whether the task matches the filters of the
+viewer, so an open list re-fetches or drops only the affected rows.
+
+The broker of a process fans events out to the bounded queues of its
+streams and keeps the latest ones, a reconnecting stream replays the
+events after its Last-Event-ID. A stream which missed events, its queue
+overflowed or its id is no longer kept, gets a reset event instead. When
+TASK_EVENTS_SOCKET_DIR is set the processes of the host, e.g. gunicorn
+workers, relay events to each other through Unix datagram sockets of the
+directory, otherwise streams see the writes of their own process only. A
+relayed event which is lost leaves a gap in the sequence of its sender,
+the receiving process resets its streams then.
+
+Every stream holds a thread of the process, at most
+TASK_EVENTS_MAX_STREAMS of them are served at once, other clients are
+told to reconnect later.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from functools import partial
+from pathlib import Path
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from django.conf import settings
+from django.db import transaction
+from task_manager.cache import get_versions
+from task_manager.tasks.fragments import get_task_namespace
+
+logger = logging.getLogger('task_manager.tasks.events')
+
+ACTION_CREATED = 'created'
+ACTION_UPDATED = 'updated'
+ACTION_DELETED = 'deleted'
+FIELD_LABELS = 'labels'
+# Query parameter of the latest event of the page, EventSource sends the
+# Last-Event-ID header on reconnection only.
+LAST_EVENT_ID_KWARG = 'last_event_id'
+# Milliseconds clients wait before reconnecting a closed stream, and a
+# stream refused because the process serves too many.
+RETRY_MS = 3000
+BUSY_RETRY_MS = 60000
+# Events whose matches are read with one query.
+MATCH_BATCH_SIZE = 100
+# Comment keeping an idle stream open through proxies.
+KEEP_ALIVE = ': keep-alive\n\n'
+DATAGRAM_SIZE = 4096
+SOCKET_SUFFIX = '.sock'
+# Seconds a relayed event waits for room in the buffer of a receiver.
+RELAY_TIMEOUT = 0.5
+
+
+class TaskEvent(NamedTuple):
+    """Change of a task."""
+
+    task_id: int
+    action: str
+    fields: Tuple[str, ...]
+    version: int
+
+
+def encode_event(event_id: str, event: TaskEvent) -> bytes:
+    """
+    Encode an event to relay it to other processes.
+
+    Args:
+        event_id: id of the event
+        event: event
+
+    Returns:
+        bytes:
+    """
+    return json.dumps([event_id, list(event)]).encode()
+
+
+def split_event_id(event_id: str) -> Tuple[str, int]:
+    """
+    Split an event id into the token of its broker and its sequence.
+
+    Args:
+        event_id: id of the event
+
+    Returns:
+        Tuple:
+    """
+    token, sequence = event_id.rsplit('-', 1)
+    return token, int(sequence)
+
+
+def decode_event(data: bytes) -> Tuple[str, TaskEvent]:
+    """
+    Decode a relayed event.
+
+    Args:
+        data: encoded event
+
+    Returns:
+        Tuple: id of the event and the event
+    """
+    event_id, (task_id, action, fields, version) = json.loads(data)
+    return event_id, TaskEvent(task_id, action, tuple(fields), version)
+
+
+class Subscription(object):
+    """Events waiting to be sent by a stream."""
+
+    def __init__(self, max_size: int):
+        """
+        Init subscription.
+
+        Args:
+            max_size: events waiting in the queue
+        """
+        # Events were missed, the client has to reload the list.
+        self.reset = False
+        self._queue: queue.Queue = queue.Queue(max_size)
+
+    def put(self, event_id: str, event: TaskEvent) -> None:
+        """
+        Queue an event without waiting, mark the reset when full.
+
+        Args:
+            event_id: id of the event
+            event: event
+        """
+        try:
+            self._queue.put_nowait((event_id, event))
+        except queue.Full:
+            self.reset = True
+
+    def get_batch(
+        self, timeout: float, max_size: int,
+    ) -> List[Tuple[str, TaskEvent]]:
+        """
+        Wait for an event, get it with the events queued after it.
+
+        Args:
+            timeout: seconds to wait
+            max_size: events to get
+
+        Returns:
+            List: ids of the events and the events, empty on timeout
+        """
+        try:
+            batch = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while len(batch) < max_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+
+class TaskEventBroker(object):
+    """Fan-out of task events to the streams of the process."""
+
+    def __init__(
+        self,
+        queue_size: int,
+        history_size: int,
+        socket_dir: Optional[str] = None,
+    ):
+        """
+        Init broker, its relay socket is bound on first use.
+
+        Args:
+            queue_size: events waiting in the queue of a stream
+            history_size: latest events kept for reconnecting streams
+            socket_dir: directory of relay sockets, None not to relay
+        """
+        self.queue_size = queue_size
+        self.socket_dir = Path(socket_dir) if socket_dir else None
+        self._token = uuid.uuid4().hex[:12]  # noqa: WPS432
+        self._sequence = 0
+        self._history: Deque[Tuple[str, TaskEvent]] = deque(
+            maxlen=history_size,
+        )
+        self._subscriptions: Set[Subscription] = set()
+        self._lock = threading.Lock()
+        # Events of the broker are relayed in the order of their sequence.
+        self._relay_lock = threading.Lock()
+        self._socket: Optional[socket.socket] = None
+        self._socket_path: Optional[Path] = None
+        self._pid: Optional[int] = None
+
+    def get_last_event_id(self) -> str:
+        """
+        Get id of the latest event, empty if there is none.
+
+        Returns:
+            str:
+        """
+        self._start()
+        with self._lock:
+            return self._history[-1][0] if self._history else ''
+
+    def publish(self, event: TaskEvent) -> None:
+        """
+        Send an event to the streams of the process, or of all processes.
+
+        Args:
+            event: event
+        """
+        if self.socket_dir is None:
+            self.dispatch(self._next_event_id(), event)
+            return
+        with self._relay_lock:
+            self._relay(encode_event(self._next_event_id(), event))
+
+    def dispatch(self, event_id: str, event: TaskEvent) -> None:
+        """
+        Send an event to the streams of the process.
+
+        Args:
+            event_id: id of the event
+            event: event
+        """
+        with self._lock:
+            self._history.append((event_id, event))
+            for subscription in self._subscriptions:
+                subscription.put(event_id, event)
+
+    def subscribe(
+        self, last_event_id: str = '', max_streams: Optional[int] = None,
+    ) -> Optional[Subscription]:
+        """
+        Subscribe a stream, replaying the events after the given one.
+
+        Args:
+            last_event_id: id of the latest event the client has
+            max_streams: subscribed streams of the process, None not to cap
+
+        Returns:
+            Optional: None if the process has max_streams streams already
+        """
+        self._start()
+        subscription = Subscription(self.queue_size)
+        with self._lock:
+            streams = len(self._subscriptions)
+            if max_streams is not None and streams >= max_streams:
+                return None
+            if last_event_id:
+                self._replay(subscription, last_event_id)
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Stop queueing events of a stream.
+
+        Args:
+            subscription: subscription of the stream
+        """
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def reset_streams(self) -> None:
+        """Reset the streams of the process, which missed events."""
+        with self._lock:
+            self._history.clear()
+            for subscription in self._subscriptions:
+                subscription.reset = True
+
+    def close(self) -> None:
+        """Close the relay socket of the process."""
+        with self._lock:
+            relay_socket, socket_path = self._socket, self._socket_path
+            self._socket = None
+            self._pid = None
+        if relay_socket is not None:
+            # Wakes the receiving thread up, recv() returns no data.
+            relay_socket.shutdown(socket.SHUT_RDWR)
+            relay_socket.close()
+            socket_path.unlink(missing_ok=True)
+
+    def _next_event_id(self) -> str:
+        with self._lock:
+            self._sequence += 1
+            return '{token}-{sequence}'.format(
+                token=self._token, sequence=self._sequence,
+            )
+
+    def _replay(self, subscription: Subscription, last_event_id: str) -> None:
+        event_ids = [event_id for event_id, _event in self._history]
+        if last_event_id not in event_ids:
+            subscription.reset = True
+            return
+        position = event_ids.index(last_event_id) + 1
+        for event_id, event in list(self._history)[position:]:
+            subscription.put(event_id, event)
+
+    def _start(self) -> None:
+        pid = os.getpid()
+        if self.socket_dir is None or self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            # The thread of a parent process does not exist after a fork.
+            name = '{pid}-{token}{suffix}'.format(
+                pid=pid, token=self._token, suffix=SOCKET_SUFFIX,
+            )
+            self._socket_path = self.socket_dir / name
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self._socket.bind(str(self._socket_path))
+            threading.Thread(
+                target=self._receive,
+                args=(self._socket,),
+                name='task-events',
+                daemon=True,
+            ).start()
+            self._pid = pid
+
+    def _receive(self, relay_socket: socket.socket) -> None:
+        sequences: Dict[str, int] = {}
+        while True:
+            try:
+                data = relay_socket.recv(DATAGRAM_SIZE)
+            except OSError:
+                return
+            if not data:
+                return
+            event_id, event = decode_event(data)
+            self._check_sequence(sequences, event_id)
+            self.dispatch(event_id, event)
+
+    def _check_sequence(self, sequences: Dict[str, int], event_id: str):
+        token, sequence = split_event_id(event_id)
+        if sequences.get(token, sequence - 1) != sequence - 1:
+            logger.warning('Relayed task events are lost, streams reset')
+            self.reset_streams()
+        sequences[token] = sequence
+
+    def _relay(self, data: bytes) -> None:
+        self._start()
+        sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sender.settimeout(RELAY_TIMEOUT)
+        pattern = '*{suffix}'.format(suffix=SOCKET_SUFFIX)
+        with sender:
+            for path in self.socket_dir.glob(pattern):
+                try:
+                    sender.sendto(data, str(path))
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # Socket of a process which is gone.
+                    path.unlink(missing_ok=True)
+                except OSError:
+                    # The receiver resets its streams on the next event.
+                    logger.warning('Task event is not relayed to %s', path)
+
+
+_brokers: List[TaskEventBroker] = []
+
+
+def get_broker() -> TaskEventBroker:
+    """
+    Get the broker of the process, created from settings.
+
+    Returns:
+        TaskEventBroker:
+    """
+    if not _brokers:
+        _brokers.append(TaskEventBroker(
+            queue_size=settings.TASK_EVENTS_QUEUE_SIZE,
+            history_size=settings.TASK_EVENTS_HISTORY_SIZE,
+            socket_dir=settings.TASK_EVENTS_SOCKET_DIR,
+        ))
+    return _brokers[0]
+
+
+@atexit.register
+def close() -> None:
+    """Remove the relay socket of the process broker."""
+    for broker in _brokers:
+        broker.close()
+
+
+def _publish(task_ids: List[int], action: str, fields: Tuple[str, ...]):
+    versions = get_versions(get_task_namespace(task_id) for task_id in task_ids)
+    broker = get_broker()
+    for task_id in task_ids:
+        broker.publish(TaskEvent(
+            task_id=task_id,
+            action=action,
+            fields=fields,
+            version=versions[get_task_namespace(task_id)],
+        ))
+
+
+def publish_task_events(
+    task_ids: Iterable[int], action: str, fields: Iterable[str] = (),
+) -> None:
+    """
+    Publish events of the tasks once the transaction commits.
+
+    Args:
+        task_ids: task primary keys
+        action: ACTION_CREATED, ACTION_UPDATED or ACTION_DELETED
+        fields: changed row fields
+    """
+    task_ids = sorted(set(task_ids))
+    if task_ids:
+        transaction.on_commit(
+            partial(_publish, task_ids, action, tuple(sorted(fields))),
+        )
+
+
+def format_events(
+    batch: List[Tuple[str, TaskEvent]], queryset: Any,
+) -> str:
+    """
+    Format events as server-sent events.
+
+    Args:
+        batch: ids of the events and the events
+        queryset: tasks the client lists
+
+    Returns:
+        str:
+    """
+    task_ids = {
+        event.task_id
+        for _event_id, event in batch
+        if event.action != ACTION_DELETED
+    }
+    matching = set(
+        queryset.filter(pk__in=task_ids).values_list('pk', flat=True),
+    ) if task_ids else set()
+    return ''.join(
+        'id: {id}\nevent: task\ndata: {data}\n\n'.format(
+            id=event_id,
+            data=json.dumps({
+                'id': event.task_id,
+                'action': event.action,
+                'fields': list(event.fields),
+                'version': event.version,
+                'matches': event.task_id in matching,
+            }),
+        )
+        for event_id, event in batch
+    )
+
+
+def iter_event_stream(
+    broker: TaskEventBroker, queryset: Any, last_event_id: str = '',
+) -> Iterator[str]:
+    """
+    Stream the events until TASK_EVENTS_STREAM_TIMEOUT.
+
+    The client reconnects once the stream ends, so a worker is not held
+    forever. Idle streams are kept open by comments. Past
+    TASK_EVENTS_MAX_STREAMS streams of the process the stream ends right
+    away, the client reconnects after BUSY_RETRY_MS.
+
+    Args:
+        broker: broker of the process
+        queryset: tasks the client lists
+        last_event_id: id of the latest event the client has
+
+    Yields:
+        str: chunks of the stream
+    """
+    subscription = broker.subscribe(
+        last_event_id, settings.TASK_EVENTS_MAX_STREAMS,
+    )
+    if subscription is None:
+        yield 'retry: {ms}\n\n'.format(ms=BUSY_RETRY_MS)
+        return
+    try:  # noqa: WPS501
+        yield from _iter_subscription(subscription, queryset)
+    finally:
+        broker.unsubscribe(subscription)
+
+
+def _iter_subscription(
+    subscription: Subscription, queryset: Any,
+) -> Iterator[str]:
+    yield 'retry: {ms}\n\n'.format(ms=RETRY_MS)
+    deadline = time.monotonic() + settings.TASK_EVENTS_STREAM_TIMEOUT
+    while not subscription.reset:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        batch = subscription.get_batch(
+            min(settings.TASK_EVENTS_HEARTBEAT, remaining), MATCH_BATCH_SIZE,
+        )
+        yield format_events(batch, queryset) if batch else KEEP_ALIVE
+    yield 'event: reset\ndata: {}\n\n'
@@ -0,0 +1,128 @@
+"""Streaming export of tasks."""
+import csv
+import json
+import zlib
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+FORMAT_CSV = 'csv'
+FORMAT_NDJSON = 'ndjson'
+CONTENT_TYPES = MappingProxyType({
+    FORMAT_CSV: 'text/csv; charset=utf-8',
+    FORMAT_NDJSON: 'application/x-ndjson; charset=utf-8',
+})
+GZIP_CONTENT_TYPE = 'application/gzip'
+
+EXPORT_FIELDS = (
+    'id',
+    'name',
+    'description',
+    'status__name',
+    'creator__username',
+    'executor__username',
+    'created_at',
+)
+
+# gzip container instead of the raw zlib stream
+GZIP_WBITS = zlib.MAX_WBITS | 16  # noqa: WPS432
+
+
+class _Echo(object):
+    """File-like object returning what is written, for csv.writer."""
+
+    def write(self, line: str) -> str:
+        """
+        Return the line instead of storing it.
+
+        Args:
+            line: line built by the writer
+
+        Returns:
+            str:
+        """
+        return line
+
+
+def iter_csv(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """
+    Iterate over CSV lines, the header goes first.
+
+    Args:
+        rows: exported rows
+
+    Yields:
+        str: CSV line
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    yield from (
+        writer.writerow([row[field] for field in EXPORT_FIELDS])
+        for row in rows
+    )
+
+
+def iter_ndjson(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """
+    Iterate over JSON lines.
+
+    Args:
+        rows: exported rows
+
+    Yields:
+        str: JSON document and a newline
+    """
+    yield from (
+        '{json}\n'.format(
+            json=json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False),
+        )
+        for row in rows
+    )
+
+
+def iter_batches(lines: Iterable[str], batch_size: int) -> Iterator[bytes]:
+    """
+    Join lines into encoded batches, the first line is sent on its own.
+
+    Args:
+        lines: text lines
+        batch_size: count of lines in a batch
+
+    Yields:
+        bytes: encoded batch
+    """
+    lines = iter(lines)
+    first_line = next(lines, None)
+    if first_line is None:
+        return
+    yield first_line.encode('utf-8')
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= batch_size:
+            yield ''.join(batch).encode('utf-8')
+            batch = []
+    if batch:
+        yield ''.join(batch).encode('utf-8')
+
+
+def iter_gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Compress chunks into a gzip stream on the fly.
+
+    Every chunk is flushed, so the client receives data as soon as it is
+    produced.
+
+    Args:
+        chunks: uncompressed chunks
+
+    Yields:
+        bytes: compressed data
+    """
+    compressor = zlib.compressobj(wbits=GZIP_WBITS)
+    yield from (
+        compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        for chunk in chunks
+    )
+    yield compressor.flush()
@@ -3,18 +3,64 @@ from typing import Any
 
 import django_filters
 from django import forms
+from django.db import models
 from django.utils.translation import gettext_lazy as _
+from django_filters.filterset import remote_queryset
 from task_manager.labels.models import Label
-from task_manager.tasks.models import Tasks
+from task_manager.reference import (
+    CachedModelChoiceFilter,
+    CachedModelMultipleChoiceFilter,
+)
+from task_manager.tasks.models import TaskLabelRelated, Tasks
+from task_manager.tasks.search import search_tasks
+
+LABEL_MODE_ANY = 'any'
+LABEL_MODE_ALL = 'all'
+
+
+class SelectMultipleSkipEmpty(forms.SelectMultiple):
+    """Multiple select which ignores empty values, like '?label='."""
+
+    def value_from_datadict(self, data, files, name) -> Any:
+        """
+        Get selected values without empty ones.
+
+        Args:
+            data: form data
+            files: form files
+            name: field name
+
+        Returns:
+            Any:
+        """
+        selected = super().value_from_datadict(data, files, name)
+        if isinstance(selected, (list, tuple)):
+            return [choice for choice in selected if choice not in {'', None}]
+        return selected
 
 
 class TasksFilter(django_filters.FilterSet):
     """Tasks filter."""
 
-    label = django_filters.ModelChoiceFilter(
+    q = django_filters.CharFilter(
+        label=_('FilterSearch'),
+        method='search_filter',
+    )
+    label = CachedModelMultipleChoiceFilter(
         field_name='labels',
         label=_('FilterLabels'),
         queryset=Label.objects.all(),
+        method='labels_filter',
+        widget=SelectMultipleSkipEmpty,
+    )
+    label_mode = django_filters.ChoiceFilter(
+        label=_('FilterLabelMode'),
+        choices=(
+            (LABEL_MODE_ANY, _('LabelModeAny')),
+            (LABEL_MODE_ALL, _('LabelModeAll')),
+        ),
+        empty_label=None,
+        method='label_mode_filter',
     )
     self_tasks = django_filters.BooleanFilter(
         field_name='creator',
@@ -40,8 +86,73 @@ class TasksFilter(django_filters.FilterSet):
             return queryset.filter(creator=self.request.user)
         return queryset
 
+    def labels_filter(self, queryset, name, value) -> Any:
+        """
+        Custom filter. Get tasks with any or all of the labels.
+
+        Subqueries over TaskLabelRelated are used instead of joining it,
+        so a task matching several labels is not repeated.
+
+        Args:
+            queryset:
+            name:
+            value:
+
+        Returns:
+            Any:
+        """
+        if not value:
+            return queryset
+        label_ids = {label.pk for label in value}
+        relations = TaskLabelRelated.objects.filter(label__in=label_ids)
+        if self.form.cleaned_data.get('label_mode') == LABEL_MODE_ALL:
+            return queryset.filter(
+                pk__in=relations.values('task').annotate(
+                    labels_count=models.Count('label'),
+                ).filter(
+                    labels_count=len(label_ids),
+                ).values('task'),
+            )
+        return queryset.filter(
+            models.Exists(relations.filter(task=models.OuterRef('pk'))),
+        )
+
+    def label_mode_filter(self, queryset, name, value) -> Any:
+        """
+        Custom filter. The mode is applied by the labels filter.
+
+        Args:
+            queryset:
+            name:
+            value:
+
+        Returns:
+            Any:
+        """
+        return queryset
+
+    def search_filter(self, queryset, name, value) -> Any:
+        """
+        Custom filter. Full-text search by name and description.
+
+        Args:
+            queryset:
+            name:
+            value:
+
+        Returns:
+            Any:
+        """
+        return search_tasks(queryset, value)
+
     class Meta(object):
         """Meta information."""
 
         model = Tasks
         fields = ['status', 'executor']
+        filter_overrides = {
+            models.ForeignKey: {
+                'filter_class': CachedModelChoiceFilter,
+                'extra': lambda field: {'queryset': remote_queryset(field)},
+            },
+        }
@@ -1,5 +1,20 @@
 """Task forms."""
+from typing import Any, Dict, List
+
 from django import forms
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+from task_manager.reference import (
+    CachedModelChoiceField,
+    CachedModelMultipleChoiceField,
+)
+from task_manager.statuses.models import Status
+from task_manager.tasks.bulk import (
+    ACTION_DELETE,
+    ACTION_EXECUTOR,
+    ACTION_STATUS,
+)
 from task_manager.tasks.models import Tasks
 
 
@@ -11,3 +26,85 @@ class TasksForm(forms.ModelForm):
 
         model = Tasks
         fields = ['name', 'description', 'status', 'executor', 'labels']
+        field_classes = {
+            'status': CachedModelChoiceField,
+            'executor': CachedModelChoiceField,
+            'labels': CachedModelMultipleChoiceField,
+        }
+
+
+class TaskIdsField(forms.Field):
+    """Ids of tasks checked in the list."""
+
+    widget = forms.MultipleHiddenInput
+    default_error_messages = {
+        'invalid_list': _('ErrorBulkTasksInvalid'),
+    }
+
+    def to_python(self, value) -> List[int]:  # noqa: WPS110
+        """
+        Get distinct ids.
+
+        Args:
+            value: submitted ids
+
+        Raises:
+            ValidationError: an id is not a number
+
+        Returns:
+            List:
+        """
+        if not value:
+            return []
+        try:
+            return sorted({int(task_id) for task_id in value})
+        except (TypeError, ValueError):
+            raise ValidationError(
+                self.error_messages['invalid_list'], code='invalid_list',
+            )
+
+
+class TasksBulkForm(forms.Form):
+    """Action applied to the tasks checked in the list."""
+
+    tasks = TaskIdsField(label=_('Tasks'))
+    action = forms.ChoiceField(
+        label=_('BulkAction'),
+        choices=(
+            (ACTION_STATUS, _('BulkActionStatus')),
+            (ACTION_EXECUTOR, _('BulkActionExecutor')),
+            (ACTION_DELETE, _('BulkActionDelete')),
+        ),
+    )
+    status = CachedModelChoiceField(
+        label=_('Status'),
+        queryset=Status.objects.all(),
+        required=False,
+    )
+    executor = CachedModelChoiceField(
+        label=_('TaskExecutor'),
+        queryset=get_user_model().objects.all(),
+        required=False,
+    )
+
+    def clean(self) -> Dict[str, Any]:
+        """
+        Check the new status is chosen.
+
+        Returns:
+            Dict:
+        """
+        cleaned_data = super().clean()
+        status_missing = not cleaned_data.get(ACTION_STATUS)
+        if cleaned_data.get('action') == ACTION_STATUS and status_missing:
+            self.add_error(ACTION_STATUS, _('ErrorBulkStatusRequired'))
+        return cleaned_data
+
+    def get_target(self) -> Any:
+        """
+        Get new value of the changed field.
+
+        Returns:
+            Any:
+        """
+        return self.cleaned_data.get(self.cleaned_data['action'])
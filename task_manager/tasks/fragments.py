@@ -0,0 +1,63 @@
+"""Versions of cached task list rows.
+
+A row fragment is keyed by the task id, the version of the task, its
+updated_at and the generation of reference rows it shows (status and user
+names), so an edit re-renders only the rows it changes. updated_at changes
+with edits of other processes too, whose version bumps a process local
+cache does not see.
+"""
+from typing import Any, Iterable, List
+
+from django.contrib.auth import get_user_model
+from task_manager.cache import bump_version, get_versions
+from task_manager.labels.models import Label
+from task_manager.reference import get_reference_generation
+from task_manager.statuses.models import Status
+
+ROW_FRAGMENT = 'task_row'
+
+
+def get_task_namespace(task_id: int) -> str:
+    """
+    Get cache namespace of the task row.
+
+    Args:
+        task_id: task primary key
+
+    Returns:
+        str:
+    """
+    return 'task:{id}'.format(id=task_id)
+
+
+def invalidate_task_rows(task_ids: Iterable[int]) -> None:
+    """
+    Re-render rows of the tasks.
+
+    Args:
+        task_ids: task primary keys
+    """
+    for task_id in set(task_ids):
+        bump_version(get_task_namespace(task_id))
+
+
+def get_rows_generation() -> str:
+    """
+    Get generation of the reference rows shown in task rows.
+
+    Returns:
+        str:
+    """
+    return get_reference_generation((Status, Label, get_user_model()))
+
+
+def attach_row_versions(tasks: List[Any]) -> None:
+    """
+    Set 'row_version' of the tasks, used in the row fragment key.
+
+    Args:
+        tasks: tasks of the page
+    """
+    versions = get_versions(get_task_namespace(task.pk) for task in tasks)
+    for task in tasks:
+        task.row_version = versions[get_task_namespace(task.pk)]
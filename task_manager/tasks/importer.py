@@ -0,0 +1,323 @@
+"""Bulk import of tasks.
+
+Records are read from CSV or JSON one by one and written in batches: the
+names of statuses, users and labels of a batch are resolved with one
+query per model, tasks and their labels are inserted with bulk_create
+inside one transaction per batch.
+"""
+import csv
+import json
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from django.contrib.auth import get_user_model
+from django.db import models, transaction
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.counters import (
+    LABEL_COUNTER,
+    recount,
+    update_task_counters,
+)
+from task_manager.tasks.dashboard import invalidate_dashboards
+from task_manager.tasks.models import TaskLabelRelated, Tasks
+from task_manager.tasks.search import index_tasks
+
+TASK_MODEL = 'tasks.tasks'
+RELATION_MODEL = 'tasks.tasklabelrelated'
+READ_SIZE = 65536
+LABELS_SEPARATOR = ','
+
+
+class TaskImportError(ValueError):
+    """A record can not be imported."""
+
+
+def _open_array(stream: TextIO, read_size: int) -> Tuple[str, bool]:
+    buffer = ''
+    while not buffer.strip():
+        chunk = stream.read(read_size)
+        if not chunk:
+            return '', False
+        buffer = ''.join((buffer, chunk))
+    buffer = buffer.lstrip()
+    if buffer.startswith('['):
+        return buffer[1:], True
+    return buffer, False
+
+
+def _skip_separator(buffer: str, in_array: bool) -> str:
+    buffer = buffer.lstrip()
+    if in_array and buffer.startswith(','):
+        return buffer[1:].lstrip()
+    return buffer
+
+
+def _read_more(
+    stream: TextIO,
+    buffer: str,
+    read_size: int,
+    error: json.JSONDecodeError,
+) -> Optional[str]:
+    chunk = stream.read(read_size)
+    if chunk:
+        return ''.join((buffer, chunk))
+    if buffer:
+        raise TaskImportError(str(error))
+    return None
+
+
+def iter_json_documents(
+    stream: TextIO,
+    read_size: int = READ_SIZE,
+) -> Iterator[Any]:
+    """
+    Iterate over items of a top level JSON array, or over JSON lines.
+
+    The file is read by chunks, so it is never loaded as a whole.
+
+    Args:
+        stream: text file
+        read_size: count of characters read at once
+
+    Yields:
+        Any: decoded document
+
+    Raises:
+        TaskImportError: the file is not valid JSON
+    """
+    decoder = json.JSONDecoder()
+    buffer, in_array = _open_array(stream, read_size)
+    while True:
+        buffer = _skip_separator(buffer, in_array)
+        if in_array and buffer.startswith(']'):
+            return
+        try:
+            document, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError as error:
+            buffer = _read_more(stream, buffer, read_size, error)
+            if buffer is None:
+                return
+            continue
+        yield document
+        buffer = buffer[end:]
+
+
+def iter_json_records(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over records of a JSON file.
+
+    Documents are either fixture entries of tasks and task labels, like
+    'fixtures/tasks/db_tasks.json', or plain task objects.
+
+    Args:
+        stream: text file
+
+    Yields:
+        Dict: task or task label record
+
+    Raises:
+        TaskImportError: unsupported document
+    """
+    for document in iter_json_documents(stream):
+        if not isinstance(document, dict):
+            raise TaskImportError('Expected an object, got {doc!r}'.format(
+                doc=document,
+            ))
+        model = document.get('model', TASK_MODEL)
+        if model not in {TASK_MODEL, RELATION_MODEL}:
+            raise TaskImportError('Unsupported model: {model}'.format(
+                model=model,
+            ))
+        record = dict(document.get('fields', document))
+        record['model'] = model
+        record['pk'] = document.get('pk')
+        yield record
+
+
+def iter_csv_records(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over task records of a CSV file with a header.
+
+    Columns are name, description, status, executor, creator and labels,
+    the labels are separated by commas. References are names.
+
+    Args:
+        stream: text file
+
+    Yields:
+        Dict: task record
+    """
+    for row in csv.DictReader(stream):
+        labels = row.get('labels') or ''
+        yield {
+            'model': TASK_MODEL,
+            'name': row.get('name'),
+            'description': row.get('description') or '',
+            'status': row.get('status'),
+            'executor': row.get('executor') or None,
+            'creator': row.get('creator') or None,
+            'labels': [
+                label.strip()
+                for label in labels.split(LABELS_SEPARATOR)
+                if label.strip()
+            ],
+        }
+
+
+def _resolve(model, name_field: str, references: Iterable[Any]) -> Dict:
+    references = {ref for ref in references if ref not in {None, ''}}
+    if not references:
+        return {}
+    pks = {ref for ref in references if isinstance(ref, int)}
+    names = references - pks
+    found = model.objects.filter(
+        models.Q(pk__in=pks)
+        | models.Q(**{'{field}__in'.format(field=name_field): names}),
+    ).values_list('pk', name_field)
+    resolved = {}
+    for pk, name in found:
+        resolved[pk] = pk
+        resolved[name] = pk
+    missing = references - resolved.keys()
+    if missing:
+        raise TaskImportError('Unknown {model}: {refs}'.format(
+            model=model._meta.verbose_name,
+            refs=', '.join(sorted(str(ref) for ref in missing)),
+        ))
+    return resolved
+
+
+class TaskImporter(object):
+    """Write batches of task records."""
+
+    def __init__(
+        self,
+        default_creator: Optional[str] = None,
+        resume: bool = False,
+        task_ids: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Init importer.
+
+        Args:
+            default_creator: username of the creator of tasks without one
+            resume: tasks which already exist were imported by a failed run
+            task_ids: ids of imported tasks by their pk in the file
+        """
+        self.default_creator = default_creator
+        self.resume = resume
+        self.task_ids = {} if task_ids is None else task_ids
+
+    def import_batch(self, records: List[Dict[str, Any]]) -> int:
+        """
+        Write tasks and task labels of the batch in one transaction.
+
+        Args:
+            records: task and task label records
+
+        Raises:
+            TaskImportError: a record can not be imported
+
+        Returns:
+            int: count of created tasks
+        """
+        tasks = [rec for rec in records if rec['model'] == TASK_MODEL]
+        relations = [rec for rec in records if rec['model'] == RELATION_MODEL]
+        for record in tasks:
+            record['creator'] = record.get('creator') or self.default_creator
+            required = (
+                record.get('name'), record.get('status'), record['creator'],
+            )
+            if not all(required):
+                raise TaskImportError(
+                    'Task needs a name, a status and a creator: {rec!r}'.format(
+                        rec=record,
+                    ),
+                )
+        with transaction.atomic():
+            created = self._create_tasks(tasks)
+            task_ids = self._map_task_ids(tasks)
+            self._create_relations(tasks, relations, task_ids)
+            index_tasks(task_ids.values())
+        return created
+
+    def _map_task_ids(self, tasks: List[Dict[str, Any]]) -> Dict[str, int]:
+        task_ids = dict(
+            Tasks.objects.filter(
+                name__in=[task['name'] for task in tasks],
+            ).values_list('name', 'id'),
+        )
+        for task in tasks:
+            if task.get('pk') is not None:
+                self.task_ids[str(task['pk'])] = task_ids[task['name']]
+        return task_ids
+
+    def _create_tasks(self, tasks: List[Dict[str, Any]]) -> int:
+        statuses = _resolve(Status, 'name', [rec['status'] for rec in tasks])
+        users = _resolve(
+            get_user_model(),
+            'username',
+            [rec['creator'] for rec in tasks]
+            + [rec.get('executor') for rec in tasks],
+        )
+        existing = set(
+            Tasks.objects.filter(
+                name__in=[record['name'] for record in tasks],
+            ).values_list('name', flat=True),
+        )
+        if existing and not self.resume:
+            raise TaskImportError('Tasks already exist: {names}'.format(
+                names=', '.join(sorted(existing)),
+            ))
+        new_tasks = [
+            Tasks(
+                name=record['name'],
+                description=record.get('description') or '',
+                status_id=statuses[record['status']],
+                executor_id=users.get(record.get('executor')),
+                creator_id=users[record['creator']],
+            )
+            for record in tasks
+            if record['name'] not in existing
+        ]
+        Tasks.objects.bulk_create(new_tasks)
+        update_task_counters([], [task.get_refs() for task in new_tasks])
+        invalidate_dashboards(
+            chain.from_iterable(
+                (task.creator_id, task.executor_id) for task in new_tasks
+            ),
+        )
+        return len(new_tasks)
+
+    def _create_relations(
+        self,
+        tasks: List[Dict[str, Any]],
+        relations: List[Dict[str, Any]],
+        task_ids: Dict[str, int],
+    ) -> None:
+        links = [
+            (task_ids[record['name']], label)
+            for record in tasks
+            for label in record.get('labels') or []
+        ]
+        for relation in relations:
+            task_id = self.task_ids.get(str(relation.get('task')))
+            if task_id is None:
+                raise TaskImportError(
+                    'Task label of an unknown task: {rec!r}'.format(
+                        rec=relation,
+                    ),
+                )
+            links.append((task_id, relation.get('label')))
+        labels = _resolve(Label, 'name', [label for _task, label in links])
+        # Links of tasks imported by a failed run may exist already.
+        TaskLabelRelated.objects.bulk_create(
+            [
+                TaskLabelRelated(task_id=task_id, label_id=labels[label])
+                for task_id, label in links
+            ],
+            ignore_conflicts=True,
+        )
+        # Conflicting links were not inserted, so labels are recounted.
+        recount(LABEL_COUNTER, set(labels.values()))
@@ -0,0 +1 @@
+"""Management of tasks."""
@@ -0,0 +1 @@
+"""Commands of tasks."""
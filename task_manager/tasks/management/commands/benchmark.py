@@ -0,0 +1,175 @@
+"""Benchmark the tasks pages over HTTP."""
+import json
+from contextlib import nullcontext
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from task_manager.tasks.benchmark import (
+    DEFAULT_MIX,
+    INTERFACE_WSGI,
+    INTERFACES,
+    LocalServer,
+    find_regressions,
+    parse_mix,
+    run_benchmark,
+    write_report,
+)
+from task_manager.tasks.seeding import get_seed_prefix
+
+URL_MESSAGE = (
+    '{name:<12} {requests:>7} req {errors:>5} err {rps:>8.1f} rps '
+    'p50 {p50:>8.1f} ms  p95 {p95:>8.1f} ms  p99 {p99:>8.1f} ms'
+)
+
+
+class Command(BaseCommand):
+    """Send a mix of requests from concurrent clients, report latencies."""
+
+    help = (
+        'Benchmark task pages with concurrent clients logged in as users '
+        'generated by seed_scale.'
+    )
+
+    def add_arguments(self, parser) -> None:
+        """
+        Add arguments.
+
+        Args:
+            parser: argument parser
+        """
+        parser.add_argument(
+            '--url',
+            help='Server to benchmark, a local server by default.',
+        )
+        parser.add_argument(
+            '--interface',
+            choices=INTERFACES,
+            default=INTERFACE_WSGI,
+            help='Interface of the local server, ASGI needs uvicorn.',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=1,
+            help='Seed of the users the clients log in as.',
+        )
+        parser.add_argument('--clients', type=int, default=4)
+        parser.add_argument(
+            '--duration', type=float, default=10, help='Seconds.',
+        )
+        parser.add_argument(
+            '--mix',
+            default=','.join(
+                '{name}={weight}'.format(name=name, weight=weight)
+                for name, weight in DEFAULT_MIX.items()
+            ),
+            help='Weights of URL names, like "tasks=60,detail_task=20".',
+        )
+        parser.add_argument('--output', help='JSON report file.')
+        parser.add_argument(
+            '--compare', help='JSON report of a previous run to compare to.',
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.1,
+            help='Tolerated share of change before a regression.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Handle command.
+
+        Args:
+            args: positional arguments
+            options: command options
+
+        Raises:
+            CommandError: invalid options or regressions found
+        """
+        try:
+            mix = parse_mix(options['mix'])
+        except ValueError as error:
+            raise CommandError(str(error))
+        report = self.run(options, mix)
+        for name, stats in report['urls'].items():
+            self.stdout.write(URL_MESSAGE.format(name=name, **stats))
+        self.stdout.write('Total {rps:.1f} rps, {errors} errors'.format(
+            **report,
+        ))
+        if options['output']:
+            write_report(report, options['output'])
+        if options['compare']:
+            self.compare(report, options['compare'], options['threshold'])
+
+    def run(self, options: dict, mix: dict) -> dict:
+        """
+        Run the benchmark against the server of the options.
+
+        Args:
+            options: command options
+            mix: weight by URL name
+
+        Raises:
+            CommandError: the local server cannot be started
+
+        Returns:
+            dict: report
+        """
+        users = self.get_users(options['seed'], options['clients'])
+        server = nullcontext(options['url']) if options['url'] else (
+            LocalServer(options['interface'])
+        )
+        try:
+            with server as base_url:
+                return run_benchmark(
+                    base_url, users, options['duration'], mix, options['seed'],
+                )
+        except ImproperlyConfigured as error:
+            raise CommandError(str(error))
+
+    def get_users(self, seed: int, count: int) -> list:
+        """
+        Get users the clients log in as.
+
+        Args:
+            seed: seed of the users
+            count: count of clients
+
+        Raises:
+            CommandError: the seed was not generated
+
+        Returns:
+            list:
+        """
+        users = list(
+            get_user_model().objects.filter(
+                username__startswith=get_seed_prefix(seed),
+            ).order_by('username')[:count],
+        )
+        if not users:
+            raise CommandError(
+                'No users of seed {seed}, run seed_scale.'.format(seed=seed),
+            )
+        return users
+
+    def compare(self, report: dict, path: str, threshold: float) -> None:
+        """
+        Fail on regressions against a previous report.
+
+        Args:
+            report: report of this run
+            path: JSON report of the previous run
+            threshold: tolerated share of change
+
+        Raises:
+            CommandError: regressions found
+        """
+        with open(path, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = find_regressions(baseline, report, threshold)
+        if regressions:
+            raise CommandError('Regressions: {found}'.format(
+                found='; '.join(regressions),
+            ))
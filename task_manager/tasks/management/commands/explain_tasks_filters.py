@@ -0,0 +1,110 @@
+"""Print query plans of the task list."""
+from itertools import combinations
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from task_manager.tasks.filters import TasksFilter
+from task_manager.tasks.models import TaskLabelRelated, Tasks
+from task_manager.tasks.views import TaskListView
+
+FILTER_FIELDS = ('status', 'executor', 'self_tasks', 'label')
+
+# Plan lines showing the rows are sorted instead of read in index order.
+SORT_MARKERS = ('USE TEMP B-TREE FOR ORDER BY', 'Sort Key')
+
+
+class Command(BaseCommand):
+    """Explain the task list query for every TasksFilter combination."""
+
+    help = 'Print EXPLAIN of the task list query for every filter combination.'
+
+    def add_arguments(self, parser) -> None:
+        """
+        Add arguments.
+
+        Args:
+            parser: argument parser
+        """
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='Run EXPLAIN ANALYZE (PostgreSQL only).',
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Handle command.
+
+        Args:
+            args: positional arguments
+            options: command options
+
+        Raises:
+            CommandError: there are no tasks to take filter values from
+        """
+        sample = Tasks.objects.filter(executor__isnull=False).values(
+            'status', 'executor', 'creator',
+        ).first()
+        if sample is None:
+            raise CommandError('There are no tasks with an executor.')
+        filter_values = {
+            'status': sample['status'],
+            'executor': sample['executor'],
+            'self_tasks': 'on',
+            'label': list(
+                TaskLabelRelated.objects.values_list(
+                    'label', flat=True,
+                ).distinct()[:1],
+            ),
+        }
+        request = SimpleNamespace(
+            user=get_user_model().objects.get(pk=sample['creator']),
+        )
+        explain_options = {}
+        if options['analyze'] and connection.vendor == 'postgresql':
+            explain_options['analyze'] = True
+
+        sorted_plans = sum(
+            self.explain(
+                {name: filter_values[name] for name in fields},
+                request,
+                explain_options,
+            )
+            for size in range(len(FILTER_FIELDS) + 1)
+            for fields in combinations(FILTER_FIELDS, size)
+        )
+        self.stdout.write(
+            'Plans sorting rows: {count}'.format(count=sorted_plans),
+        )
+
+    def explain(self, query: dict, request, explain_options: dict) -> int:
+        """
+        Print plan of the list page query filtered by the query.
+
+        Args:
+            query: filter query string
+            request: request with the user of 'self_tasks'
+            explain_options: options of QuerySet.explain
+
+        Returns:
+            int: 1 if the planner sorts rows, otherwise 0
+        """
+        filterset = TasksFilter(
+            data=query,
+            queryset=TaskListView.queryset.all(),
+            request=request,
+        )
+        page = filterset.qs[:TaskListView.paginate_by]
+        plan = page.explain(**explain_options)
+        uses_sort = any(marker in plan for marker in SORT_MARKERS)
+
+        title = ' & '.join(query) or 'no filters'
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        self.stdout.write(plan)
+        if uses_sort:
+            self.stdout.write(self.style.WARNING('-> rows are sorted'))
+        else:
+            self.stdout.write(self.style.SUCCESS('-> index order'))
+        return int(uses_sort)
@@ -0,0 +1,186 @@
+"""Import tasks from CSV or JSON."""
+import json
+import os
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+from task_manager.cache import bump_version
+from task_manager.paginators import get_count_namespace
+from task_manager.tasks.importer import (
+    TaskImporter,
+    TaskImportError,
+    iter_csv_records,
+    iter_json_records,
+)
+from task_manager.tasks.models import Tasks
+
+FORMAT_CSV = 'csv'
+FORMAT_JSON = 'json'
+
+RESUME_MESSAGE = (
+    'Import stopped after {count} records: {error}. '
+    'Fix the file and run again with --resume.'
+)
+SUMMARY_MESSAGE = 'Created {created} tasks from {count} records in {sec:.1f} s'
+# Guards the rate of a batch written within the clock resolution.
+MIN_ELAPSED = 1e-6
+
+
+class Command(BaseCommand):
+    """Import tasks in batches, resuming after a failed run."""
+
+    help = 'Import tasks and their labels from a CSV or JSON file.'
+
+    def add_arguments(self, parser) -> None:
+        """
+        Add arguments.
+
+        Args:
+            parser: argument parser
+        """
+        parser.add_argument('path', help='CSV or JSON file.')
+        parser.add_argument(
+            '--format',
+            choices=(FORMAT_CSV, FORMAT_JSON),
+            help='Format of the file, guessed by its extension by default.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Records written in one transaction.',
+        )
+        parser.add_argument(
+            '--creator',
+            help='Username of the creator of tasks without one.',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='Progress file, "<path>.checkpoint" by default.',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continue a failed run from its checkpoint.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Handle command.
+
+        Args:
+            args: positional arguments
+            options: command options
+
+        Raises:
+            CommandError: the file can not be imported
+        """
+        path = options['path']
+        checkpoint_path = options['checkpoint'] or '{path}.checkpoint'.format(
+            path=path,
+        )
+        checkpoint = {'records': 0, 'task_ids': {}}
+        if options['resume'] and os.path.exists(checkpoint_path):
+            with open(checkpoint_path, encoding='utf-8') as checkpoint_file:
+                checkpoint = json.load(checkpoint_file)
+        importer = TaskImporter(
+            default_creator=options['creator'],
+            resume=options['resume'],
+            task_ids=checkpoint['task_ids'],
+        )
+        file_format = options['format'] or FORMAT_JSON
+        if not options['format'] and path.lower().endswith('.csv'):
+            file_format = FORMAT_CSV
+        try:
+            with open(path, encoding='utf-8', newline='') as stream:
+                self.import_records(
+                    importer,
+                    self.read_records(stream, file_format, checkpoint),
+                    checkpoint,
+                    checkpoint_path,
+                    options['batch_size'],
+                )
+        except (TaskImportError, IntegrityError) as error:
+            raise CommandError(RESUME_MESSAGE.format(
+                count=checkpoint['records'], error=error,
+            ))
+        finally:
+            bump_version(get_count_namespace(Tasks))
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+    def read_records(self, stream, file_format: str, checkpoint: dict):
+        """
+        Iterate over records not imported yet.
+
+        Args:
+            stream: input file
+            file_format: FORMAT_CSV or FORMAT_JSON
+            checkpoint: progress of the previous run
+
+        Returns:
+            Iterator:
+        """
+        if file_format == FORMAT_CSV:
+            records = iter_csv_records(stream)
+        else:
+            records = iter_json_records(stream)
+        return islice(records, checkpoint['records'], None)
+
+    def import_records(  # noqa: WPS211
+        self,
+        importer: TaskImporter,
+        records,
+        checkpoint: dict,
+        checkpoint_path: str,
+        batch_size: int,
+    ) -> None:
+        """
+        Write records by batches, saving progress after every batch.
+
+        Args:
+            importer: batch writer
+            records: records to import
+            checkpoint: progress, updated in place
+            checkpoint_path: progress file
+            batch_size: count of records in a batch
+        """
+        started = time.monotonic()
+        imported = 0
+        created = 0
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+            created += importer.import_batch(batch)
+            imported += len(batch)
+            checkpoint['records'] += len(batch)
+            self.save_checkpoint(checkpoint, checkpoint_path)
+            elapsed = max(time.monotonic() - started, MIN_ELAPSED)
+            self.stdout.write(
+                'Imported {count} records ({rate:.0f} records/s)'.format(
+                    count=imported, rate=imported / elapsed,
+                ),
+            )
+        self.stdout.write(
+            SUMMARY_MESSAGE.format(
+                created=created,
+                count=imported,
+                sec=time.monotonic() - started,
+            ),
+        )
+
+    def save_checkpoint(self, checkpoint: dict, checkpoint_path: str) -> None:
+        """
+        Write progress file atomically.
+
+        Args:
+            checkpoint: progress
+            checkpoint_path: progress file
+        """
+        temp_path = '{path}.tmp'.format(path=checkpoint_path)
+        with open(temp_path, 'w', encoding='utf-8') as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+        os.replace(temp_path, checkpoint_path)
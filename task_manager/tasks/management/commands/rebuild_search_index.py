@@ -0,0 +1,35 @@
+"""Rebuild full-text search index of tasks."""
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+from task_manager.tasks.search import rebuild_index
+
+
+class Command(BaseCommand):
+    """Rebuild the search index from the tasks table."""
+
+    help = 'Rebuild full-text search index of task names and descriptions.'
+
+    def add_arguments(self, parser) -> None:
+        """
+        Add arguments.
+
+        Args:
+            parser: argument parser
+        """
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Database to rebuild the index in.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Handle command.
+
+        Args:
+            args: positional arguments
+            options: command options
+        """
+        with transaction.atomic(using=options['database']):
+            indexed = rebuild_index(using=options['database'])
+        self.stdout.write('Indexed tasks: {count}'.format(count=indexed))
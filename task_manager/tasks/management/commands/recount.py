@@ -0,0 +1,29 @@
+"""Repair counters of tasks on statuses, labels and users."""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from task_manager.tasks.counters import COUNTERS, recount
+
+
+class Command(BaseCommand):
+    """Recount counters which drifted from the tasks."""
+
+    help = 'Recount tasks counters of statuses, labels and users.'
+
+    def handle(self, *args, **options) -> None:
+        """
+        Handle command.
+
+        Args:
+            args: positional arguments
+            options: command options
+        """
+        with transaction.atomic():
+            for task_counter in COUNTERS:
+                fixed = recount(task_counter)
+                self.stdout.write(
+                    '{model}.{counter}: fixed {count} rows'.format(
+                        model=task_counter.model._meta.label,
+                        counter=task_counter.counter,
+                        count=fixed,
+                    ),
+                )
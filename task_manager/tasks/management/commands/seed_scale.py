@@ -0,0 +1,94 @@
+"""Generate synthetic data for scale testing."""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from task_manager.tasks.seeding import ScaleSeeder
+
+SIZES_MESSAGE = (
+    'Seeding {sizes.users} users, {sizes.statuses} statuses, '
+    '{sizes.labels} labels and {sizes.tasks} tasks'
+)
+# Guards the rate of a batch written within the clock resolution.
+MIN_ELAPSED = 1e-6
+
+
+class Command(BaseCommand):
+    """Write users, statuses, labels and tasks generated from a seed."""
+
+    help = 'Generate deterministic synthetic data for scale testing.'
+
+    def add_arguments(self, parser) -> None:
+        """
+        Add arguments.
+
+        Args:
+            parser: argument parser
+        """
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=1,
+            help='Random seed, also the prefix of generated names.',
+        )
+        parser.add_argument(
+            '--scale',
+            type=float,
+            default=1,
+            help='Scale factor, 1 is 100 users and 10000 tasks.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows written in one transaction.',
+        )
+        parser.add_argument(
+            '--password',
+            help='Password of every generated user, unusable by default.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Handle command.
+
+        Args:
+            args: positional arguments
+            options: command options
+
+        Raises:
+            CommandError: the seed was generated already
+        """
+        seeder = ScaleSeeder(
+            seed=options['seed'],
+            scale=options['scale'],
+            batch_size=options['batch_size'],
+            password=options['password'],
+        )
+        if seeder.exists():
+            raise CommandError(
+                'Seed {seed} exists already, use another --seed.'.format(
+                    seed=options['seed'],
+                ),
+            )
+        self.stdout.write(SIZES_MESSAGE.format(sizes=seeder.sizes))
+        self.started = time.monotonic()
+        seeder.seed(progress=self.report)
+        self.stdout.write(
+            'Seeded in {sec:.1f} s'.format(
+                sec=time.monotonic() - self.started,
+            ),
+        )
+
+    def report(self, written: int) -> None:
+        """
+        Print progress after a batch of tasks.
+
+        Args:
+            written: count of written tasks
+        """
+        elapsed = max(time.monotonic() - self.started, MIN_ELAPSED)
+        self.stdout.write(
+            'Written {count} tasks ({rate:.0f} tasks/s)'.format(
+                count=written, rate=written / elapsed,
+            ),
+        )
@@ -0,0 +1,71 @@
+# Generated by Django 3.2.25 on 2026-10-18 19:18
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Min
+
+
+def delete_duplicate_task_labels(apps, schema_editor):
+    TaskLabelRelated = apps.get_model('tasks', 'TaskLabelRelated')
+    keep_ids = TaskLabelRelated.objects.values(
+        'label', 'task',
+    ).annotate(keep_id=Min('id')).values('keep_id')
+    TaskLabelRelated.objects.exclude(id__in=keep_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('statuses', '0003_alter_status_name'),
+        ('tasks', '0008_alter_tasks_executor'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            delete_duplicate_task_labels,
+            migrations.RunPython.noop,
+        ),
+        migrations.AddIndex(
+            model_name='tasks',
+            index=models.Index(fields=['-created_at', 'id'], name='tasks_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasks',
+            index=models.Index(fields=['status', '-created_at', 'id'], name='tasks_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasks',
+            index=models.Index(fields=['executor', '-created_at', 'id'], name='tasks_executor_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasks',
+            index=models.Index(fields=['creator', '-created_at', 'id'], name='tasks_creator_created_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='tasklabelrelated',
+            constraint=models.UniqueConstraint(fields=('label', 'task'), name='tasks_label_task_uniq'),
+        ),
+        migrations.AlterField(
+            model_name='tasklabelrelated',
+            name='label',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='label', to='labels.label'),
+        ),
+        migrations.AlterField(
+            model_name='tasks',
+            name='creator',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='creators', to=settings.AUTH_USER_MODEL, verbose_name='TaskCreator'),
+        ),
+        migrations.AlterField(
+            model_name='tasks',
+            name='executor',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='executors', to=settings.AUTH_USER_MODEL, verbose_name='TaskExecutor'),
+        ),
+        migrations.AlterField(
+            model_name='tasks',
+            name='status',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='statuses', to='statuses.status', verbose_name='Status'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 3.2.25 on 2026-10-18 19:40
+
+from django.db import migrations
+
+FTS_TABLE = 'tasks_tasks_fts'
+SEARCH_VECTOR = (
+    "to_tsvector('simple', coalesce(name, '') || ' ' || "
+    "coalesce(description, ''))"
+)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            'CREATE VIRTUAL TABLE {fts} USING fts5(name, description, '
+            "tokenize='unicode61 remove_diacritics 2')".format(fts=FTS_TABLE),
+        )
+        schema_editor.execute(
+            'INSERT INTO {fts} (rowid, name, description) '
+            'SELECT id, name, description FROM tasks_tasks'.format(
+                fts=FTS_TABLE,
+            ),
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            'ALTER TABLE tasks_tasks ADD COLUMN search_vector tsvector',
+        )
+        schema_editor.execute(
+            'UPDATE tasks_tasks SET search_vector = {vector}'.format(
+                vector=SEARCH_VECTOR,
+            ),
+        )
+        schema_editor.execute(
+            'CREATE INDEX tasks_search_vector_idx ON tasks_tasks '
+            'USING GIN (search_vector)',
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE {fts}'.format(fts=FTS_TABLE))
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            'ALTER TABLE tasks_tasks DROP COLUMN search_vector',
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_tasks_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
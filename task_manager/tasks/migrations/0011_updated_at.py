@@ -0,0 +1,22 @@
+# Generated by Django 3.2.25 on 2026-10-18 19:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0010_tasks_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tasks',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='tasks',
+            index=models.Index(fields=['updated_at'], name='tasks_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 3.2.25 on 2026-10-18 20:05
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+COUNTERS = (
+    ('statuses', 'Status', 'task_count', 'Tasks', 'status'),
+    ('users', 'CustomUser', 'created_count', 'Tasks', 'creator'),
+    ('users', 'CustomUser', 'assigned_count', 'Tasks', 'executor'),
+    ('labels', 'Label', 'task_count', 'TaskLabelRelated', 'label'),
+)
+
+
+def count_tasks(apps, schema_editor):
+    for app_label, model_name, counter, source_name, field in COUNTERS:
+        source = apps.get_model('tasks', source_name)
+        apps.get_model(app_label, model_name).objects.update(**{
+            counter: Coalesce(
+                models.Subquery(
+                    source.objects.filter(
+                        **{field: models.OuterRef('pk')},
+                    ).order_by().values(field).annotate(
+                        rows_count=models.Count('pk'),
+                    ).values('rows_count'),
+                ),
+                0,
+            ),
+        })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0011_updated_at'),
+        ('labels', '0003_task_count'),
+        ('statuses', '0005_task_count'),
+        ('users', '0004_task_counts'),
+    ]
+
+    operations = [
+        migrations.RunPython(count_tasks, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,6 @@
 """Tasks model."""
+from typing import Any, Dict, Iterable, List, Optional
+
 from django.contrib.auth import get_user_model
 from django.db import models
 from django.urls import reverse_lazy
@@ -6,6 +8,11 @@ from django.utils.translation import gettext_lazy as _
 from task_manager.labels.models import Label
 from task_manager.statuses.models import Status
 
+REF_ATTNAMES = frozenset(('status_id', 'creator_id', 'executor_id'))
+# Fields shown in the task list row.
+ROW_FIELDS = ('name', 'description', 'status', 'executor', 'creator')
+ROW_ATTNAMES = REF_ATTNAMES | {'name', 'description'}
+
 
 class Tasks(models.Model):
     """Tasks model."""
@@ -26,11 +33,13 @@ class Tasks(models.Model):
         verbose_name=_('TaskDescription'),
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     status = models.ForeignKey(
         Status,
         related_name='statuses',
         on_delete=models.PROTECT,
         verbose_name=_('Status'),
+        db_index=False,
     )
     executor = models.ForeignKey(
         user_model,
@@ -39,12 +48,14 @@ class Tasks(models.Model):
         verbose_name=_('TaskExecutor'),
         blank=True,
         null=True,
+        db_index=False,
     )
     creator = models.ForeignKey(
         user_model,
         related_name='creators',
         on_delete=models.PROTECT,
         verbose_name=_('TaskCreator'),
+        db_index=False,
     )
     labels = models.ManyToManyField(
         Label,
@@ -55,6 +66,11 @@ class Tasks(models.Model):
         blank=True,
     )
 
+    # References the task had in the database when loaded or last saved.
+    loaded_refs: Optional[Dict[str, Any]] = None
+    # Row fields the task had when loaded or last saved.
+    loaded_values: Optional[Dict[str, Any]] = None
+
     def __str__(self) -> str:
         """
         String representation.
@@ -64,6 +80,78 @@ class Tasks(models.Model):
         """
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, field_values) -> 'Tasks':
+        """
+        Load the task, remembering its references and row fields.
+
+        Args:
+            db: database alias
+            field_names: loaded attribute names
+            field_values: loaded values
+
+        Returns:
+            Tasks:
+        """
+        instance = super().from_db(db, field_names, field_values)
+        if REF_ATTNAMES <= set(field_names):
+            instance.loaded_refs = instance.get_refs()
+        if ROW_ATTNAMES <= set(field_names):
+            instance.loaded_values = instance.get_row_values()
+        return instance
+
+    def get_refs(self) -> Dict[str, Any]:
+        """
+        Get ids of the status, creator and executor.
+
+        Returns:
+            Dict: id by field name
+        """
+        return {
+            'status': self.status_id,
+            'creator': self.creator_id,
+            'executor': self.executor_id,
+        }
+
+    def get_row_values(self) -> Dict[str, Any]:
+        """
+        Get values of the row fields, ids of the references.
+
+        Returns:
+            Dict: value by field name
+        """
+        return {
+            field: getattr(self, self._meta.get_field(field).attname)
+            for field in ROW_FIELDS
+        }
+
+    def get_changed_fields(
+        self, update_fields: Optional[Iterable[str]] = None,
+    ) -> List[str]:
+        """
+        Get row fields changed since the task was loaded or last saved.
+
+        Args:
+            update_fields: fields passed to save(), None for all
+
+        Returns:
+            List: all saved row fields if the task was not loaded
+        """
+        fields = list(ROW_FIELDS)
+        if update_fields is not None:
+            saved = {
+                self._meta.get_field(field).name for field in update_fields
+            }
+            fields = [field for field in fields if field in saved]
+        if self.loaded_values is None:
+            return fields
+        current = self.get_row_values()
+        return [
+            field
+            for field in fields
+            if current[field] != self.loaded_values[field]
+        ]
+
     def get_absolute_url(self):  # noqa: D102
         return reverse_lazy('tasks')
 
@@ -73,6 +161,28 @@ class Tasks(models.Model):
         verbose_name = _('Task')
         verbose_name_plural = _('Tasks')
         ordering = ['-created_at']
+        # Access paths of TasksFilter sorted like the task list, they also
+        # replace the single column indexes of the foreign keys.
+        indexes = [
+            models.Index(
+                fields=['-created_at', 'id'],
+                name='tasks_created_idx',
+            ),
+            models.Index(
+                fields=['status', '-created_at', 'id'],
+                name='tasks_status_created_idx',
+            ),
+            models.Index(
+                fields=['executor', '-created_at', 'id'],
+                name='tasks_executor_created_idx',
+            ),
+            models.Index(
+                fields=['creator', '-created_at', 'id'],
+                name='tasks_creator_created_idx',
+            ),
+            # MAX(updated_at) of conditional GET of the whole list.
+            models.Index(fields=['updated_at'], name='tasks_updated_idx'),
+        ]
 
 
 class TaskLabelRelated(models.Model):
@@ -87,6 +197,17 @@ class TaskLabelRelated(models.Model):
         Label,
         related_name='label',
         on_delete=models.PROTECT,
+        db_index=False,
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta(object):
+        """Meta information."""
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=['label', 'task'],
+                name='tasks_label_task_uniq',
+            ),
+        ]
@@ -0,0 +1,203 @@
+"""Full-text search of tasks.
+
+SQLite keeps the index in the FTS5 table 'tasks_tasks_fts' with the task
+id as rowid, PostgreSQL in the 'search_vector' tsvector column of the
+tasks table covered by a GIN index. Both are created by the migration and
+kept in sync by the tasks signals.
+"""
+import re
+from typing import Iterable, List
+
+from django.db import connections, models
+from django.db.models.expressions import RawSQL
+from task_manager.tasks.models import Tasks
+
+FTS_TABLE = 'tasks_tasks_fts'
+SEARCH_CONFIG = 'simple'
+SEARCH_VECTOR = (
+    "to_tsvector('{config}', coalesce(name, '') || ' ' || "
+    "coalesce(description, ''))"
+).format(config=SEARCH_CONFIG)
+
+SQLITE = 'sqlite'
+POSTGRESQL = 'postgresql'
+
+
+def get_terms(text: str) -> List[str]:
+    """
+    Split search text into terms.
+
+    Args:
+        text: search text
+
+    Returns:
+        List:
+    """
+    return re.findall(r'\w+', text.lower())
+
+
+def index_tasks(task_ids: Iterable[int], using: str = 'default') -> None:
+    """
+    Update index entries of the tasks.
+
+    Args:
+        task_ids: ids of created or changed tasks
+        using: database alias
+    """
+    task_ids = list(task_ids)
+    connection = connections[using]
+    if not task_ids or connection.vendor not in {SQLITE, POSTGRESQL}:
+        return
+    placeholders = ', '.join(['%s'] * len(task_ids))
+    with connection.cursor() as cursor:
+        if connection.vendor == POSTGRESQL:
+            cursor.execute(
+                'UPDATE {table} SET search_vector = {vector} '
+                'WHERE id IN ({ids})'.format(
+                    table=Tasks._meta.db_table,
+                    vector=SEARCH_VECTOR,
+                    ids=placeholders,
+                ),
+                task_ids,
+            )
+            return
+        cursor.execute(
+            'DELETE FROM {fts} WHERE rowid IN ({ids})'.format(
+                fts=FTS_TABLE, ids=placeholders,
+            ),
+            task_ids,
+        )
+        cursor.execute(
+            'INSERT INTO {fts} (rowid, name, description) '
+            'SELECT id, name, description FROM {table} '
+            'WHERE id IN ({ids})'.format(
+                fts=FTS_TABLE,
+                table=Tasks._meta.db_table,
+                ids=placeholders,
+            ),
+            task_ids,
+        )
+
+
+def unindex_tasks(task_ids: Iterable[int], using: str = 'default') -> None:
+    """
+    Remove index entries of deleted tasks.
+
+    Args:
+        task_ids: ids of deleted tasks
+        using: database alias
+    """
+    task_ids = list(task_ids)
+    connection = connections[using]
+    # PostgreSQL index lives in the deleted rows themselves.
+    if not task_ids or connection.vendor != SQLITE:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'DELETE FROM {fts} WHERE rowid IN ({ids})'.format(
+                fts=FTS_TABLE, ids=', '.join(['%s'] * len(task_ids)),
+            ),
+            task_ids,
+        )
+
+
+def rebuild_index(using: str = 'default') -> int:
+    """
+    Rebuild the whole index from the tasks table.
+
+    Args:
+        using: database alias
+
+    Returns:
+        int: count of indexed tasks
+    """
+    connection = connections[using]
+    table = Tasks._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == POSTGRESQL:
+            cursor.execute(
+                'UPDATE {table} SET search_vector = {vector}'.format(
+                    table=table, vector=SEARCH_VECTOR,
+                ),
+            )
+        elif connection.vendor == SQLITE:
+            cursor.execute('DELETE FROM {fts}'.format(fts=FTS_TABLE))
+            cursor.execute(
+                'INSERT INTO {fts} (rowid, name, description) '
+                'SELECT id, name, description FROM {table}'.format(
+                    fts=FTS_TABLE, table=table,
+                ),
+            )
+    return Tasks.objects.using(using).count()
+
+
+def search_tasks(queryset: models.QuerySet, text: str) -> models.QuerySet:
+    """
+    Filter tasks matching all terms of the text, best matches first.
+
+    Every term matches as a prefix. The queryset is annotated with
+    'search_rank'.
+
+    Args:
+        queryset: tasks queryset
+        text: search text
+
+    Returns:
+        QuerySet:
+    """
+    terms = get_terms(text)
+    if not terms:
+        return queryset
+    vendor = connections[queryset.db].vendor
+    if vendor == POSTGRESQL:
+        return _search_postgresql(queryset, terms)
+    if vendor == SQLITE:
+        return _search_sqlite(queryset, terms)
+    for term in terms:
+        queryset = queryset.filter(
+            models.Q(name__icontains=term)
+            | models.Q(description__icontains=term),
+        )
+    return queryset
+
+
+def _search_sqlite(queryset: models.QuerySet, terms: List[str]):
+    match = ' '.join('"{term}"*'.format(term=term) for term in terms)
+    matched_ids = RawSQL(
+        'SELECT rowid FROM {fts} WHERE {fts} MATCH %s'.format(fts=FTS_TABLE),
+        (match,),
+    )
+    rank = RawSQL(
+        'SELECT bm25({fts}) FROM {fts} WHERE {fts} MATCH %s '
+        'AND rowid = {table}.id'.format(
+            fts=FTS_TABLE, table=Tasks._meta.db_table,
+        ),
+        (match,),
+        output_field=models.FloatField(),
+    )
+    # bm25() is negative, the lower the better.
+    return queryset.filter(id__in=matched_ids).annotate(
+        search_rank=rank,
+    ).order_by('search_rank', '-created_at')
+
+
+def _search_postgresql(queryset: models.QuerySet, terms: List[str]):
+    tsquery = "to_tsquery('{config}', %s)".format(config=SEARCH_CONFIG)
+    match = ' & '.join('{term}:*'.format(term=term) for term in terms)
+    table = Tasks._meta.db_table
+    return queryset.annotate(
+        search_match=RawSQL(
+            '{table}.search_vector @@ {tsquery}'.format(
+                table=table, tsquery=tsquery,
+            ),
+            (match,),
+            output_field=models.BooleanField(),
+        ),
+        search_rank=RawSQL(
+            'ts_rank({table}.search_vector, {tsquery})'.format(
+                table=table, tsquery=tsquery,
+            ),
+            (match,),
+            output_field=models.FloatField(),
+        ),
+    ).filter(search_match=True).order_by('-search_rank', '-created_at')
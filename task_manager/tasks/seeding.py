@@ -0,0 +1,294 @@
+"""Deterministic synthetic data for scale testing.
+
+The same seed and scale always produce the same users, statuses, labels
+and tasks. Users and tasks grow linearly with the scale, statuses and
+labels with its square root. Executors are skewed: a few users get most
+of the tasks and some tasks have none. Labels per task and their
+popularity are skewed the same way.
+
+Rows are written with bulk_create in batches, one transaction per batch,
+bypassing signals: counters, the search index and caches are brought up
+to date once per batch or at the end. Synthetic users share one password
+hash computed once, unusable unless a password is given.
+"""
+import math
+import random
+from itertools import accumulate, islice
+from typing import Any, Callable, Iterator, List, NamedTuple, Optional
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from task_manager.cache import bump_version
+from task_manager.labels.models import Label
+from task_manager.paginators import get_count_namespace
+from task_manager.reference import invalidate_reference
+from task_manager.statuses.models import Status
+from task_manager.tasks.counters import COUNTERS, recount
+from task_manager.tasks.models import TaskLabelRelated, Tasks
+from task_manager.tasks.search import index_tasks
+
+# Rows per unit of scale.
+USERS_PER_SCALE = 100
+STATUSES_PER_SCALE = 10
+LABELS_PER_SCALE = 50
+TASKS_PER_SCALE = 10000
+# Chances of a task to have 0, 1, 2... labels.
+LABELS_PER_TASK_WEIGHTS = (30, 35, 20, 10, 5)
+UNASSIGNED_SHARE = 0.2
+WORDS = (
+    'report',
+    'release',
+    'review',
+    'invoice',
+    'deploy',
+    'backup',
+    'meeting',
+    'design',
+    'budget',
+    'client',
+    'server',
+    'update',
+    'migration',
+    'audit',
+    'draft',
+    'contract',
+    'support',
+    'database',
+    'payment',
+    'schedule',
+)
+DESCRIPTION_WORDS = (5, 30)
+
+
+class SeedSizes(NamedTuple):
+    """Counts of generated rows."""
+
+    users: int
+    statuses: int
+    labels: int
+    tasks: int
+
+
+def get_seed_sizes(scale: float) -> SeedSizes:
+    """
+    Get counts of rows generated for the scale, at least one of each.
+
+    Args:
+        scale: scale factor, 1 is ten thousand tasks
+
+    Returns:
+        SeedSizes:
+    """
+    root = math.sqrt(scale)
+    return SeedSizes(
+        users=max(1, round(USERS_PER_SCALE * scale)),
+        statuses=max(1, round(STATUSES_PER_SCALE * root)),
+        labels=max(1, round(LABELS_PER_SCALE * root)),
+        tasks=max(1, round(TASKS_PER_SCALE * scale)),
+    )
+
+
+def get_seed_prefix(seed: int) -> str:
+    """
+    Get prefix of names of the rows generated from the seed.
+
+    Args:
+        seed: random seed
+
+    Returns:
+        str:
+    """
+    return 'seed{seed}-'.format(seed=seed)
+
+
+def _skewed_weights(count: int) -> List[float]:
+    # Zipf-like: the n-th row is picked 1/n as often as the first one.
+    ranks = range(1, count + 1)
+    return list(accumulate(1 / rank for rank in ranks))
+
+
+def _names(prefix: str, kind: str, count: int) -> List[str]:
+    # Zero padded, so names of a batch sort in the order they are created.
+    width = len(str(count))
+    return [
+        '{prefix}{kind}{number:0{width}d}'.format(
+            prefix=prefix, kind=kind, number=number, width=width,
+        )
+        for number in range(1, count + 1)
+    ]
+
+
+def _batches(rows: Iterator[Any], batch_size: int) -> Iterator[List]:
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+class ScaleSeeder(object):
+    """Generate rows of one seed in batches."""
+
+    def __init__(
+        self,
+        seed: int,
+        scale: float,
+        batch_size: int = 1000,
+        password: Optional[str] = None,
+    ):
+        """
+        Init seeder.
+
+        Args:
+            seed: random seed
+            scale: scale factor, see get_seed_sizes()
+            batch_size: rows written in one transaction
+            password: password of every user, unusable by default
+        """
+        self.random = random.Random(seed)
+        self.prefix = get_seed_prefix(seed)
+        self.sizes = get_seed_sizes(scale)
+        self.batch_size = batch_size
+        self.password = password
+
+    def exists(self) -> bool:
+        """
+        Check rows of the seed were generated already.
+
+        Returns:
+            bool:
+        """
+        return Status.objects.filter(name__startswith=self.prefix).exists()
+
+    def seed(self, progress: Optional[Callable[[int], None]] = None) -> None:
+        """
+        Write all rows of the seed.
+
+        Args:
+            progress: called with the count of tasks written after a batch
+        """
+        user_ids = self.create_users()
+        status_ids = self._create_named(Status, 'status', self.sizes.statuses)
+        label_ids = self._create_named(Label, 'label', self.sizes.labels)
+        for model in (get_user_model(), Status, Label):
+            invalidate_reference(model)
+            bump_version(get_count_namespace(model))
+        written = 0
+        names = iter(_names(self.prefix, 'task', self.sizes.tasks))
+        for batch in _batches(names, self.batch_size):
+            self.create_tasks(batch, user_ids, status_ids, label_ids)
+            written += len(batch)
+            if progress is not None:
+                progress(written)
+        bump_version(get_count_namespace(Tasks))
+        seeded = {
+            get_user_model(): user_ids, Status: status_ids, Label: label_ids,
+        }
+        for task_counter in COUNTERS:
+            pks = iter(seeded[task_counter.model])
+            for batch_pks in _batches(pks, self.batch_size):
+                recount(task_counter, batch_pks)
+
+    def create_users(self) -> List[int]:
+        """
+        Write users sharing one password hash.
+
+        Returns:
+            List: ids of the users
+        """
+        user_model = get_user_model()
+        password = make_password(self.password)
+        usernames = iter(_names(self.prefix, 'user', self.sizes.users))
+        for batch in _batches(usernames, self.batch_size):
+            user_model.objects.bulk_create([
+                user_model(
+                    username=username,
+                    first_name=username,
+                    last_name=self.random.choice(WORDS).title(),
+                    password=password,
+                )
+                for username in batch
+            ])
+        return list(
+            user_model.objects.filter(
+                username__startswith=self.prefix,
+            ).order_by('username').values_list('pk', flat=True),
+        )
+
+    def create_tasks(
+        self,
+        names: List[str],
+        user_ids: List[int],
+        status_ids: List[int],
+        label_ids: List[int],
+    ) -> None:
+        """
+        Write a batch of tasks with their labels in one transaction.
+
+        Args:
+            names: names of the tasks
+            user_ids: users to pick creators and executors from
+            status_ids: statuses to pick from
+            label_ids: labels to pick from
+        """
+        executor_weights = _skewed_weights(len(user_ids))
+        label_weights = _skewed_weights(len(label_ids))
+        tasks = [
+            Tasks(
+                name=name,
+                description=self._description(),
+                status_id=self.random.choice(status_ids),
+                creator_id=self.random.choice(user_ids),
+                executor_id=self._executor(user_ids, executor_weights),
+            )
+            for name in names
+        ]
+        with transaction.atomic():
+            Tasks.objects.bulk_create(tasks)
+            # bulk_create() sets no ids on SQLite, the names are a range.
+            task_ids = list(
+                Tasks.objects.filter(
+                    name__gte=names[0], name__lte=names[-1],
+                ).order_by('name').values_list('pk', flat=True),
+            )
+            TaskLabelRelated.objects.bulk_create([
+                TaskLabelRelated(task_id=task_id, label_id=label_id)
+                for task_id in task_ids
+                for label_id in self._labels(label_ids, label_weights)
+            ])
+            index_tasks(task_ids)
+
+    def _create_named(self, model, kind: str, count: int) -> List[int]:
+        model.objects.bulk_create(
+            [model(name=name) for name in _names(self.prefix, kind, count)],
+            batch_size=self.batch_size,
+        )
+        return list(
+            model.objects.filter(
+                name__startswith=self.prefix,
+            ).order_by('name').values_list('pk', flat=True),
+        )
+
+    def _description(self) -> str:
+        return ' '.join(
+            self.random.choices(
+                WORDS, k=self.random.randint(*DESCRIPTION_WORDS),
+            ),
+        ).capitalize()
+
+    def _executor(self, user_ids: List[int], weights: List[float]) -> Any:
+        if self.random.random() < UNASSIGNED_SHARE:
+            return None
+        return self.random.choices(user_ids, cum_weights=weights)[0]
+
+    def _labels(self, label_ids: List[int], weights: List[float]) -> set:
+        count = self.random.choices(
+            range(len(LABELS_PER_TASK_WEIGHTS)),
+            weights=LABELS_PER_TASK_WEIGHTS,
+        )[0]
+        return set(
+            self.random.choices(
+                label_ids, cum_weights=weights, k=min(count, len(label_ids)),
+            ),
+        )
@@ -0,0 +1,323 @@
+"""Tasks signals."""
+from typing import Any, Mapping, Tuple
+
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save,
+)
+from django.dispatch import receiver
+from task_manager.cache import bump_version
+from task_manager.paginators import get_count_namespace
+from task_manager.tasks.counters import (
+    LABEL_COUNTER,
+    adjust_counter,
+    update_label_counters,
+    update_task_counters,
+)
+from task_manager.tasks.dashboard import invalidate_dashboards
+from task_manager.tasks.events import (
+    ACTION_CREATED,
+    ACTION_DELETED,
+    ACTION_UPDATED,
+    FIELD_LABELS,
+    publish_task_events,
+)
+from task_manager.tasks.fragments import invalidate_task_rows
+from task_manager.tasks.models import TaskLabelRelated, Tasks
+from task_manager.tasks.search import index_tasks, unindex_tasks
+
+SEARCH_FIELDS = frozenset(('name', 'description'))
+
+
+@receiver(post_save, sender=Tasks)
+@receiver(post_delete, sender=Tasks)
+@receiver(post_save, sender=TaskLabelRelated)
+@receiver(post_delete, sender=TaskLabelRelated)
+def invalidate_tasks_count(sender, **kwargs) -> None:
+    """
+    Invalidate cached counts of task lists.
+
+    Args:
+        sender: model class
+        kwargs: signal arguments
+    """
+    bump_version(get_count_namespace(Tasks))
+
+
+@receiver(m2m_changed, sender=TaskLabelRelated)
+def invalidate_tasks_count_on_labels(sender, action, **kwargs) -> None:
+    """
+    Invalidate cached counts of task lists filtered by labels.
+
+    Args:
+        sender: through model class
+        action: m2m action
+        kwargs: signal arguments
+    """
+    if action.startswith('post_'):
+        bump_version(get_count_namespace(Tasks))
+
+
+@receiver(post_save, sender=Tasks)
+@receiver(post_delete, sender=Tasks)
+def invalidate_task_row(sender, instance, **kwargs) -> None:
+    """
+    Re-render the list row of the changed task.
+
+    Args:
+        sender: model class
+        instance: saved or deleted task
+        kwargs: signal arguments
+    """
+    invalidate_task_rows([instance.pk])
+
+
+@receiver(post_save, sender=TaskLabelRelated)
+@receiver(post_delete, sender=TaskLabelRelated)
+def invalidate_task_row_on_label(sender, instance, **kwargs) -> None:
+    """
+    Re-render the list row of the task whose labels changed.
+
+    Args:
+        sender: through model class
+        instance: saved or deleted relation
+        kwargs: signal arguments
+    """
+    invalidate_task_rows([instance.task_id])
+
+
+@receiver(m2m_changed, sender=TaskLabelRelated)
+def invalidate_task_rows_on_labels(  # noqa: WPS211
+    sender, instance, action, reverse, pk_set, **kwargs,
+) -> None:
+    """
+    Re-render list rows of tasks whose labels were set through the m2m.
+
+    Args:
+        sender: through model class
+        instance: task, or label for the reverse side
+        action: m2m action
+        reverse: instance is a label
+        pk_set: primary keys of the other side
+        kwargs: signal arguments
+    """
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        invalidate_task_rows([instance.pk])
+    elif pk_set:
+        invalidate_task_rows(pk_set)
+
+
+@receiver(post_save, sender=Tasks)
+def publish_task_saved(
+    sender, instance, created, update_fields, **kwargs,
+) -> None:
+    """
+    Notify live task lists of the changed row fields.
+
+    Args:
+        sender: model class
+        instance: saved task
+        created: the task is new
+        update_fields: fields passed to save()
+        kwargs: signal arguments
+    """
+    task_ids = [instance.pk]
+    if created:
+        publish_task_events(task_ids, ACTION_CREATED)
+    else:
+        fields = instance.get_changed_fields(update_fields)
+        if fields:
+            publish_task_events(task_ids, ACTION_UPDATED, fields)
+    instance.loaded_values = instance.get_row_values()
+
+
+@receiver(post_delete, sender=Tasks)
+def publish_task_deleted(sender, instance, **kwargs) -> None:
+    """
+    Notify live task lists of the deleted task.
+
+    Args:
+        sender: model class
+        instance: deleted task
+        kwargs: signal arguments
+    """
+    publish_task_events([instance.pk], ACTION_DELETED)
+
+
+@receiver(post_save, sender=TaskLabelRelated)
+@receiver(post_delete, sender=TaskLabelRelated)
+def publish_task_label(sender, instance, **kwargs) -> None:
+    """
+    Notify live task lists of the changed labels of the task.
+
+    Args:
+        sender: through model class
+        instance: saved or deleted relation
+        kwargs: signal arguments
+    """
+    publish_task_events([instance.task_id], ACTION_UPDATED, [FIELD_LABELS])
+
+
+@receiver(m2m_changed, sender=TaskLabelRelated)
+def publish_task_labels(  # noqa: WPS211
+    sender, instance, action, reverse, pk_set, **kwargs,
+) -> None:
+    """
+    Notify live task lists of labels set through the m2m.
+
+    Args:
+        sender: through model class
+        instance: task, or label for the reverse side
+        action: m2m action
+        reverse: instance is a label
+        pk_set: primary keys of the other side
+        kwargs: signal arguments
+    """
+    if not action.startswith('post_'):
+        return
+    task_ids = (pk_set or ()) if reverse else [instance.pk]
+    publish_task_events(task_ids, ACTION_UPDATED, [FIELD_LABELS])
+
+
+@receiver(post_save, sender=Tasks)
+def update_search_index(sender, instance, using, update_fields, **kwargs):
+    """
+    Update search index entry of the saved task.
+
+    Args:
+        sender: model class
+        instance: saved task
+        using: database alias
+        update_fields: fields passed to save()
+        kwargs: signal arguments
+    """
+    if update_fields is None or SEARCH_FIELDS & set(update_fields):
+        index_tasks([instance.pk], using=using)
+
+
+@receiver(post_delete, sender=Tasks)
+def delete_search_index(sender, instance, using, **kwargs) -> None:
+    """
+    Remove search index entry of the deleted task.
+
+    Args:
+        sender: model class
+        instance: deleted task
+        using: database alias
+        kwargs: signal arguments
+    """
+    unindex_tasks([instance.pk], using=using)
+
+
+def _task_users(refs: Mapping[str, Any]) -> Tuple[Any, Any]:
+    return refs.get('creator'), refs.get('executor')
+
+
+@receiver(pre_save, sender=Tasks)
+def load_previous_refs(sender, instance, **kwargs) -> None:
+    """
+    Read references of a task saved without being loaded first.
+
+    Args:
+        sender: model class
+        instance: task to save
+        kwargs: signal arguments
+    """
+    if instance.loaded_refs is not None or instance.pk is None:
+        return
+    stored_refs = Tasks.objects.filter(pk=instance.pk).values(
+        'status', 'creator', 'executor',
+    )
+    instance.loaded_refs = stored_refs.first() or {}
+
+
+@receiver(post_save, sender=Tasks)
+def update_task_refs(sender, instance, update_fields, **kwargs) -> None:
+    """
+    Move counters and recompute dashboards the references concern.
+
+    Args:
+        sender: model class
+        instance: saved task
+        update_fields: fields passed to save()
+        kwargs: signal arguments
+    """
+    previous = instance.loaded_refs or {}
+    current = instance.get_refs()
+    if update_fields is not None:
+        # References left out of update_fields keep their stored values.
+        for field in current.keys() - set(update_fields):
+            current[field] = previous.get(field, current[field])
+    update_task_counters([previous] if previous else [], [current])
+    invalidate_dashboards(_task_users(previous) + _task_users(current))
+    instance.loaded_refs = current
+
+
+@receiver(post_delete, sender=Tasks)
+def release_task_refs(sender, instance, **kwargs) -> None:
+    """
+    Move counters and recompute dashboards of the deleted task.
+
+    Args:
+        sender: model class
+        instance: deleted task
+        kwargs: signal arguments
+    """
+    refs = instance.loaded_refs or instance.get_refs()
+    update_task_counters([refs], [])
+    invalidate_dashboards(_task_users(refs))
+
+
+@receiver(post_save, sender=TaskLabelRelated)
+def count_created_label(sender, instance, created, **kwargs) -> None:
+    """
+    Count the task in the label.
+
+    Args:
+        sender: through model class
+        instance: saved relation
+        created: the relation is new
+        kwargs: signal arguments
+    """
+    if created:
+        update_label_counters([instance.label_id], 1)
+
+
+@receiver(post_delete, sender=TaskLabelRelated)
+def count_deleted_label(sender, instance, **kwargs) -> None:
+    """
+    Uncount the task in the label, also for m2m remove and clear.
+
+    Args:
+        sender: through model class
+        instance: deleted relation
+        kwargs: signal arguments
+    """
+    update_label_counters([instance.label_id], -1)
+
+
+@receiver(m2m_changed, sender=TaskLabelRelated)
+def count_added_labels(  # noqa: WPS211
+    sender, instance, action, reverse, pk_set, **kwargs,
+) -> None:
+    """
+    Count tasks in labels added through the m2m, which skips post_save.
+
+    Args:
+        sender: through model class
+        instance: task, or label for the reverse side
+        action: m2m action
+        reverse: instance is a label
+        pk_set: primary keys of the added side
+        kwargs: signal arguments
+    """
+    if action != 'post_add' or not pk_set:
+        return
+    if reverse:
+        adjust_counter(LABEL_COUNTER, {instance.pk: len(pk_set)})
+    else:
+        update_label_counters(pk_set, 1)
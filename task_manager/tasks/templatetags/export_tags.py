@@ -0,0 +1,23 @@
+"""Tags build export urls."""
+from django import template
+
+register = template.Library()
+
+
+@register.simple_tag(name='export_query', takes_context=True)
+def get_export_query(context, export_format: str) -> str:
+    """
+    Get query string of the export keeping the list filters.
+
+    Args:
+        context: template context
+        export_format: 'csv' or 'ndjson'
+
+    Returns:
+        str:
+    """
+    query = context['request'].GET.copy()
+    query.pop('page', None)
+    query.pop('cursor', None)
+    query['format'] = export_format
+    return query.urlencode()
@@ -1,17 +1,25 @@
 """Urls tasks."""
 from django.urls import path
 from task_manager.tasks.views import (
+    TaskBulkView,
     TaskCreateView,
     TaskDeleteView,
     TaskDetailView,
+    TaskEventsView,
+    TaskExportView,
     TaskListView,
+    TaskRowView,
     TaskUpdateView,
 )
 
 urlpatterns = [
     path('', TaskListView.as_view(), name='tasks'),
     path('create/', TaskCreateView.as_view(), name='create_task'),
+    path('bulk/', TaskBulkView.as_view(), name='bulk_tasks'),
+    path('export/', TaskExportView.as_view(), name='export_tasks'),
+    path('events/', TaskEventsView.as_view(), name='task_events'),
     path('<int:pk>/update/', TaskUpdateView.as_view(), name='update_task'),
     path('<int:pk>/delete/', TaskDeleteView.as_view(), name='delete_task'),
+    path('<int:pk>/row/', TaskRowView.as_view(), name='task_row'),
     path('<int:pk>/', TaskDetailView.as_view(), name='detail_task'),
 ]
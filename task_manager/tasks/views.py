@@ -1,40 +1,422 @@
 """Tasks views."""
-from typing import Any, Union
+from functools import partial
+from http import HTTPStatus
+from typing import Any, Callable, Iterator, Sequence, Union
 
+from django.conf import settings
 from django.contrib import messages
+from django.contrib.auth import get_user_model
 from django.contrib.messages.views import SuccessMessageMixin
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404
 from django.http.response import (
+    HttpResponse,
     HttpResponsePermanentRedirect,
     HttpResponseRedirect,
+    StreamingHttpResponse,
 )
-from django.urls import reverse_lazy
+from django.shortcuts import redirect
+from django.urls import reverse, reverse_lazy
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.utils.translation import gettext_lazy as _
+from django.views.generic import View
 from django.views.generic.detail import DetailView
-from django.views.generic.edit import CreateView, DeleteView, UpdateView
-from django_filters.views import FilterView
-from task_manager.mixins import CustomLoginRequiredMixin
+from django.views.generic.edit import (
+    CreateView,
+    DeleteView,
+    FormView,
+    UpdateView,
+)
+from django_filters.views import FilterMixin, FilterView
+from task_manager.async_views import AsyncConditionalGetMixin
+from task_manager.labels.models import Label
+from task_manager.mixins import (
+    CachedCountPaginationMixin,
+    CustomLoginRequiredMixin,
+    KeysetPaginationMixin,
+)
+from task_manager.reference import attach_reference_rows, get_reference_rows
+from task_manager.statuses.models import Status
+from task_manager.tasks.bulk import apply_bulk_action
+from task_manager.tasks.events import (
+    LAST_EVENT_ID_KWARG,
+    get_broker,
+    iter_event_stream,
+)
+from task_manager.tasks.export import (
+    CONTENT_TYPES,
+    EXPORT_FIELDS,
+    FORMAT_CSV,
+    GZIP_CONTENT_TYPE,
+    iter_batches,
+    iter_csv,
+    iter_gzip,
+    iter_ndjson,
+)
 from task_manager.tasks.filters import TasksFilter
-from task_manager.tasks.forms import TasksForm
+from task_manager.tasks.forms import TasksBulkForm, TasksForm
+from task_manager.tasks.fragments import (
+    attach_row_versions,
+    get_rows_generation,
+)
 from task_manager.tasks.mixins import UserIsCreatorMixin
 from task_manager.tasks.models import Tasks
 
 
-class TaskListView(CustomLoginRequiredMixin, FilterView):
+class TaskListView(  # noqa: WPS215
+    AsyncConditionalGetMixin,
+    CustomLoginRequiredMixin,
+    KeysetPaginationMixin,
+    CachedCountPaginationMixin,
+    FilterView,
+):
     """Task listing."""
 
     model = Tasks
     paginate_by = 10
-    queryset = model.objects.select_related(
-        'status',
-        'executor',
-        'creator',
-    ).prefetch_related('labels')
+    # Statuses and users of the page are taken from the reference cache.
+    queryset = model.objects.prefetch_related('labels')
+    reference_fields = ('status', 'executor', 'creator')
     context_object_name = 'tasks_list'
     template_name = 'tasks/index.html'
     filterset_class = TasksFilter
 
+    def get_concurrent_loads(self) -> Sequence[Callable[[], Any]]:
+        """
+        Load rows of the filter choices and of the related fields.
+
+        Returns:
+            Sequence:
+        """
+        return [
+            partial(get_reference_rows, model)
+            for model in (Status, get_user_model(), Label)
+        ]
+
+    def get_conditional_queryset(self) -> Any:
+        """
+        Get tasks matching the filters.
+
+        Returns:
+            Any:
+        """
+        filterset = self.get_filterset(self.get_filterset_class())
+        if filterset.is_bound and not filterset.is_valid():
+            return filterset.queryset.none()
+        return filterset.qs
+
+    def paginate_queryset(self, queryset, page_size) -> Any:
+        """
+        Paginate the queryset and attach cached related rows to the page.
+
+        Args:
+            queryset:
+            page_size:
+
+        Returns:
+            Any:
+        """
+        paginator, page, object_list, is_paginated = super().paginate_queryset(
+            queryset, page_size,
+        )
+        page.object_list = list(object_list)
+        attach_reference_rows(page.object_list, self.reference_fields)
+        attach_row_versions(page.object_list)
+        return (paginator, page, page.object_list, is_paginated)
+
+    def get_context_data(self, **kwargs) -> Any:
+        """
+        Add keys of cached row fragments.
+
+        Args:
+            kwargs:
+
+        Returns:
+            Any:
+        """
+        context = super().get_context_data(**kwargs)
+        context['rows_generation'] = get_rows_generation()
+        context['row_cache_timeout'] = settings.TASK_ROW_CACHE_TIMEOUT
+        context['bulk_form'] = TasksBulkForm()
+        context['events_url'] = self.get_events_url()
+        return context
+
+    def get_events_url(self) -> str:
+        """
+        Get URL of the events of the listed tasks after the page.
+
+        Returns:
+            str:
+        """
+        query = self.request.GET.copy()
+        query[LAST_EVENT_ID_KWARG] = get_broker().get_last_event_id()
+        return '{url}?{query}'.format(
+            url=reverse('task_events'), query=query.urlencode(),
+        )
+
+    def get_count_cache_params(self) -> list:
+        """
+        Get normalized query string, 'self_tasks' depends on the user.
+
+        Returns:
+            list:
+        """
+        query_params = super().get_count_cache_params()
+        if self.request.GET.get('self_tasks'):
+            query_params.append(('creator', self.request.user.pk))
+        return query_params
+
+
+class TaskExportView(CustomLoginRequiredMixin, FilterMixin, View):
+    """Stream tasks matching the list filters as CSV or NDJSON."""
+
+    model = Tasks
+    queryset = model.objects.all()
+    filterset_class = TasksFilter
+    format_kwarg = 'format'
+    gzip_kwarg = 'gzip'
+
+    def get_queryset(self) -> Any:  # noqa: WPS615
+        """
+        Get tasks to filter.
+
+        Returns:
+            Any:
+        """
+        return self.queryset.all()
+
+    def get_lines(self, export_format: str) -> Iterator[str]:
+        """
+        Get lines of the export.
+
+        Rows are read with a values() projection through iterator(), so
+        memory does not grow with the result and the first bytes are sent
+        before the query is exhausted.
+
+        Args:
+            export_format: FORMAT_CSV or FORMAT_NDJSON
+
+        Returns:
+            Iterator:
+        """
+        filterset = self.get_filterset(self.get_filterset_class())
+        if filterset.is_bound and not filterset.is_valid():
+            queryset = filterset.queryset.none()
+        else:
+            queryset = filterset.qs
+        rows = queryset.values(*EXPORT_FIELDS).iterator(
+            chunk_size=settings.EXPORT_CHUNK_SIZE,
+        )
+        if export_format == FORMAT_CSV:
+            return iter_csv(rows)
+        return iter_ndjson(rows)
+
+    def get(self, request, *args, **kwargs) -> StreamingHttpResponse:
+        """
+        Stream the export.
+
+        Args:
+            request:
+            args:
+            kwargs:
+
+        Raises:
+            Http404: format is unknown
+
+        Returns:
+            StreamingHttpResponse:
+        """
+        export_format = request.GET.get(self.format_kwarg, FORMAT_CSV)
+        if export_format not in CONTENT_TYPES:
+            raise Http404('Unknown export format')
+        stream = iter_batches(
+            self.get_lines(export_format), settings.EXPORT_CHUNK_SIZE,
+        )
+        filename = 'tasks.{ext}'.format(ext=export_format)
+        content_type = CONTENT_TYPES[export_format]
+        if request.GET.get(self.gzip_kwarg):
+            stream = iter_gzip(stream)
+            filename = '{name}.gz'.format(name=filename)
+            content_type = GZIP_CONTENT_TYPE
+        response = StreamingHttpResponse(stream, content_type=content_type)
+        response['Content-Disposition'] = (
+            'attachment; filename="{name}"'.format(name=filename)
+        )
+        return response
+
+
+class TaskEventsView(CustomLoginRequiredMixin, FilterMixin, View):
+    """Stream changes of tasks as server-sent events."""
+
+    model = Tasks
+    queryset = model.objects.all()
+    filterset_class = TasksFilter
+
+    def get_queryset(self) -> Any:  # noqa: WPS615
+        """
+        Get tasks to filter.
+
+        Returns:
+            Any:
+        """
+        return self.queryset.all()
+
+    def get(self, request, *args, **kwargs) -> HttpResponse:
+        """
+        Stream the events of tasks, flagged whether they match the filters.
+
+        Django 3.2 iterates streams of ASGI responses in the event loop,
+        where a stream waiting for events would block other requests, so
+        ASGI clients are answered with 204, which stops EventSource.
+
+        Args:
+            request:
+            args:
+            kwargs:
+
+        Returns:
+            HttpResponse:
+        """
+        if isinstance(request, ASGIRequest):
+            return HttpResponse(status=HTTPStatus.NO_CONTENT)
+        filterset = self.get_filterset(self.get_filterset_class())
+        if filterset.is_bound and not filterset.is_valid():
+            queryset = filterset.queryset.none()
+        else:
+            queryset = filterset.qs
+        last_event_id = request.META.get(
+            'HTTP_LAST_EVENT_ID', request.GET.get(LAST_EVENT_ID_KWARG, ''),
+        )
+        response = StreamingHttpResponse(
+            iter_event_stream(get_broker(), queryset, last_event_id),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control'] = 'no-cache'
+        # Proxies like nginx would buffer the stream otherwise.
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
+class TaskRowView(CustomLoginRequiredMixin, DetailView):
+    """Task list row, re-fetched by live task lists."""
+
+    model = Tasks
+    context_object_name = 'task'
+    template_name = 'tasks/row.html'
+    reference_fields = TaskListView.reference_fields
+
+    def get_object(self, queryset=None) -> Tasks:
+        """
+        Get the task with the cached related rows and its row version.
+
+        Args:
+            queryset:
+
+        Returns:
+            Tasks:
+        """
+        task = super().get_object(queryset)
+        attach_reference_rows([task], self.reference_fields)
+        attach_row_versions([task])
+        return task
+
+    def get_context_data(self, **kwargs) -> Any:
+        """
+        Add keys of the cached row fragment.
+
+        Args:
+            kwargs:
+
+        Returns:
+            Any:
+        """
+        context = super().get_context_data(**kwargs)
+        context['rows_generation'] = get_rows_generation()
+        context['row_cache_timeout'] = settings.TASK_ROW_CACHE_TIMEOUT
+        return context
+
 
-class TaskDetailView(CustomLoginRequiredMixin, DetailView):
+class TaskBulkView(CustomLoginRequiredMixin, FormView):
+    """Apply an action to the tasks checked in the list."""
+
+    form_class = TasksBulkForm
+    http_method_names = ['post']
+    success_url = reverse_lazy('tasks')
+    next_kwarg = 'next'
+
+    def get_success_url(self) -> str:  # noqa: WPS615
+        """
+        Get the list page the form was sent from.
+
+        Returns:
+            str:
+        """
+        next_url = self.request.POST.get(self.next_kwarg)
+        is_safe = url_has_allowed_host_and_scheme(
+            next_url,
+            allowed_hosts={self.request.get_host()},
+            require_https=self.request.is_secure(),
+        )
+        return next_url if is_safe else str(self.success_url)
+
+    def form_valid(self, form) -> HttpResponseRedirect:
+        """
+        Apply the action and report tasks it was not applied to.
+
+        Args:
+            form:
+
+        Returns:
+            HttpResponseRedirect:
+        """
+        bulk_result = apply_bulk_action(
+            self.request.user,
+            form.cleaned_data['action'],
+            form.cleaned_data['tasks'],
+            form.get_target(),
+        )
+        if bulk_result.applied:
+            messages.success(
+                self.request,
+                _('SuccessBulkTasks') % {'count': len(bulk_result.applied)},
+            )
+        if bulk_result.not_found:
+            messages.error(
+                self.request,
+                _('ErrorBulkTasksNotFound') % {
+                    'ids': ', '.join(map(str, bulk_result.not_found)),
+                },
+            )
+        if bulk_result.forbidden:
+            messages.error(
+                self.request,
+                _('ErrorBulkTasksNotCreator') % {
+                    'ids': ', '.join(map(str, bulk_result.forbidden)),
+                },
+            )
+        return redirect(self.get_success_url())
+
+    def form_invalid(self, form) -> HttpResponseRedirect:
+        """
+        Report form errors on the list page.
+
+        Args:
+            form:
+
+        Returns:
+            HttpResponseRedirect:
+        """
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(self.request, error)
+        return redirect(self.get_success_url())
+
+
+class TaskDetailView(
+    AsyncConditionalGetMixin,
+    CustomLoginRequiredMixin,
+    DetailView,
+):
     """Task detail view."""
 
     model = Tasks
@@ -0,0 +1 @@
+"""Custom tags."""
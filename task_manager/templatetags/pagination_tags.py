@@ -0,0 +1,22 @@
+"""Tags build pagination urls."""
+from django import template
+
+register = template.Library()
+
+
+@register.simple_tag(name='cursor_url', takes_context=True)
+def get_cursor_url(context, cursor: str) -> str:
+    """
+    Get url of the page keeping filter query string.
+
+    Args:
+        context: template context
+        cursor: cursor of the page
+
+    Returns:
+        str:
+    """
+    query = context['request'].GET.copy()
+    query.pop('page', None)
+    query['cursor'] = cursor
+    return '?{query}'.format(query=query.urlencode())
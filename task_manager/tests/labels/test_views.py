@@ -2,10 +2,13 @@
 from http import HTTPStatus
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from task_manager.labels.models import Label
 from task_manager.labels.views import LabelListView
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Tasks
 
 
 class TestListViewCase(TestCase):
@@ -30,6 +33,7 @@ class TestListViewCase(TestCase):
 
     def setUp(self):
         """Setup always when test executed."""
+        cache.clear()
         self.client.login(**self.credentials)
 
     def test_view_url(self):
@@ -227,6 +231,23 @@ class TestDeleteCase(TestCase):
             self.model.objects.filter(name=self.data['name']).exists()  # noqa: C812
         )
 
+    def test_delete_in_use(self):
+        """Test a label of tasks is not deleted, its deletion is disabled."""
+        task = Tasks.objects.create(
+            name='test_task',
+            status=Status.objects.create(name='test_status'),
+            creator=self.user_model.objects.get(),
+        )
+        task.labels.add(self.label)
+        list_response = self.client.get(reverse('labels'))
+        self.assertContains(list_response, 'disabled')
+        response = self.client.post(
+            path=reverse('delete_label', args=[self.label.pk]),
+        )
+        self.assertRedirects(response, reverse('labels'))
+        label_exists = self.model.objects.filter(pk=self.label.pk).exists()
+        self.assertTrue(label_exists)
+
     def test_get_not_auth_users_cannot_delete(self):
         """Test GET not authenticated users cannot delete."""
         self.client.logout()
@@ -2,10 +2,13 @@
 from http import HTTPStatus
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
 from django.urls import reverse
 from task_manager.statuses.models import Status
 from task_manager.statuses.views import StatusListView
+from task_manager.tasks.models import Tasks
 
 
 class TestListViewCase(TestCase):
@@ -30,6 +33,7 @@ class TestListViewCase(TestCase):
 
     def setUp(self):
         """Setup always when test executed."""
+        cache.clear()
         self.client.login(**self.credentials)
 
     def test_view_url(self):
@@ -81,6 +85,16 @@ class TestListViewCase(TestCase):
         response = self.client.get(reverse('statuses'))
         self.assertRedirects(response, reverse('login'))
 
+    def test_not_modified(self):
+        """Test unchanged list is answered with 304 until a status changes."""
+        etag = self.client.get(reverse('statuses'))['ETag']
+        response = self.client.get(reverse('statuses'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+        self.model.objects.filter(name='task0').delete()
+        response = self.client.get(reverse('statuses'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
 
 class TestCreateViewCase(TestCase):
     """Test create view."""
@@ -229,6 +243,32 @@ class TestDeleteCase(TestCase):
             self.model.objects.filter(name=self.data['name']).exists(),
         )
 
+    def test_delete_in_use(self):
+        """Test a status of tasks is refused without loading the tasks."""
+        Tasks.objects.create(
+            name='test_task',
+            status=self.status,
+            creator=self.user_model.objects.get(),
+        )
+        url = reverse('delete_status', args=[self.status.pk])
+        task_queries = []
+
+        def wrapper(execute, sql, *args):  # noqa: WPS430
+            if 'tasks_tasks' in sql:
+                task_queries.append(sql)
+            return execute(sql, *args)
+
+        with connection.execute_wrapper(wrapper):
+            response = self.client.post(url)
+        self.assertRedirects(response, reverse('statuses'))
+        status_exists = self.model.objects.filter(pk=self.status.pk).exists()
+        self.assertTrue(status_exists)
+        self.assertEqual(len(task_queries), 1)
+        self.assertIn('EXISTS', task_queries[0])
+        self.assertContains(self.client.get(url), 'disabled')
+        list_response = self.client.get(reverse('statuses'))
+        self.assertContains(list_response, 'disabled')
+
     def test_get_not_auth_users_cannot_delete(self):
         """Test GET not authenticated users cannot delete."""
         self.client.logout()
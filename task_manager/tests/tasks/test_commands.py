@@ -0,0 +1,393 @@
+"""Tasks commands tests."""
+import json
+import os
+import tempfile
+from importlib.util import find_spec
+from io import StringIO
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, TransactionTestCase
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.benchmark import PERCENTILES, percentile, write_report
+from task_manager.tasks.importer import TaskImportError, iter_json_documents
+from task_manager.tasks.models import TaskLabelRelated, Tasks
+from task_manager.tasks.search import search_tasks
+from task_manager.tasks.seeding import (
+    ScaleSeeder,
+    get_seed_prefix,
+    get_seed_sizes,
+)
+
+
+class TestExplainTasksFiltersCase(TestCase):
+    """Test 'explain_tasks_filters' command."""
+
+    fixtures = [
+        'tasks/db_users.json',
+        'tasks/db_statuses.json',
+        'tasks/db_labels.json',
+        'tasks/db_tasks.json',
+    ]
+
+    def test_explain_every_combination(self):
+        """Test plan is printed for every filter combination."""
+        output = StringIO()
+        call_command('explain_tasks_filters', stdout=output)
+        output = output.getvalue()
+        self.assertIn('no filters', output)
+        self.assertIn('status & executor & self_tasks & label', output)
+        self.assertIn('tasks_status_created_idx', output)
+        self.assertIn('Plans sorting rows:', output)
+
+    def test_no_tasks(self):
+        """Test command fails without tasks."""
+        Tasks.objects.all().delete()
+        with self.assertRaises(CommandError):
+            call_command('explain_tasks_filters', stdout=StringIO())
+
+
+class TestRebuildSearchIndexCase(TestCase):
+    """Test 'rebuild_search_index' command."""
+
+    fixtures = [
+        'tasks/db_users.json',
+        'tasks/db_statuses.json',
+        'tasks/db_labels.json',
+        'tasks/db_tasks.json',
+    ]
+
+    def test_rebuild(self):
+        """Test tasks changed without signals are found after rebuild."""
+        task = Tasks.objects.first()
+        Tasks.objects.filter(pk=task.pk).update(name='Quarterly report')
+        self.assertFalse(search_tasks(Tasks.objects.all(), 'quarterly'))
+
+        output = StringIO()
+        call_command('rebuild_search_index', stdout=output)
+        self.assertIn(
+            'Indexed tasks: {count}'.format(count=Tasks.objects.count()),
+            output.getvalue(),
+        )
+        self.assertEqual(
+            list(search_tasks(Tasks.objects.all(), 'quarterly')),
+            [task],
+        )
+
+
+class TestRecountCase(TestCase):
+    """Test recount command."""
+
+    def test_repairs_drift(self):
+        """Test counters changed around the ORM are repaired."""
+        user = get_user_model().objects.create_user(username='test')
+        status = Status.objects.create(name='open')
+        Tasks.objects.bulk_create(
+            [
+                Tasks(name='first', status=status, creator=user),
+                Tasks(name='second', status=status, creator=user),
+            ],
+        )
+        output = StringIO()
+        call_command('recount', stdout=output)
+        self.assertIn(
+            'statuses.Status.task_count: fixed 1 rows', output.getvalue(),
+        )
+        status.refresh_from_db()
+        user.refresh_from_db()
+        self.assertEqual(status.task_count, 2)
+        self.assertEqual(user.created_count, 2)
+        self.assertEqual(user.assigned_count, 0)
+
+
+class TestSeedScaleCase(TestCase):
+    """Test 'seed_scale' command."""
+
+    scale = 0.03
+    password = 'secret'  # noqa: S105
+
+    def seed(self, seed: int) -> list:
+        """
+        Seed a small scale and get the generated tasks.
+
+        Args:
+            seed: random seed
+
+        Returns:
+            list: names, references and labels of the tasks
+        """
+        call_command(
+            'seed_scale',
+            seed=seed,
+            scale=self.scale,
+            batch_size=100,
+            password=self.password,
+            stdout=StringIO(),
+        )
+        return list(
+            Tasks.objects.filter(
+                name__startswith=get_seed_prefix(seed),
+            ).order_by('name', 'labels__name').values_list(
+                'name',
+                'description',
+                'status__name',
+                'creator__username',
+                'executor__username',
+                'labels__name',
+            ),
+        )
+
+    def test_deterministic(self):
+        """Test the same seed generates the same rows."""
+        generated = self.seed(1)
+        Tasks.objects.all().delete()
+        TaskLabelRelated.objects.all().delete()
+        Label.objects.all().delete()
+        Status.objects.all().delete()
+        get_user_model().objects.all().delete()
+        self.assertEqual(self.seed(1), generated)
+        self.assertNotEqual(
+            [row[1:] for row in self.seed(2)],
+            [row[1:] for row in generated],
+        )
+
+    def test_rows_are_consistent(self):
+        """Test counters, search index and logins of generated rows."""
+        self.seed(1)
+        sizes = get_seed_sizes(self.scale)
+        self.assertEqual(Tasks.objects.count(), sizes.tasks)
+        self.assertEqual(get_user_model().objects.count(), sizes.users)
+        output = StringIO()
+        call_command('recount', stdout=output)
+        self.assertNotIn('fixed 1', output.getvalue())
+        self.assertEqual(
+            search_tasks(Tasks.objects.all(), 'seed1').count(), sizes.tasks,
+        )
+        user = get_user_model().objects.first()
+        self.assertTrue(
+            self.client.login(
+                username=user.username, password=self.password,
+            ),
+        )
+
+    def test_existing_seed_rejected(self):
+        """Test a seed is generated once."""
+        self.seed(1)
+        with self.assertRaises(CommandError):
+            self.seed(1)
+
+
+class TestBenchmarkCase(TransactionTestCase):
+    """Test 'benchmark' command against a local server."""
+
+    def setUp(self):
+        """Setup always when test executed."""
+        ScaleSeeder(seed=1, scale=0.02).seed()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def benchmark(self, *args) -> str:
+        """
+        Run a short benchmark.
+
+        Args:
+            args: more command arguments
+
+        Returns:
+            str: printed report
+        """
+        output = StringIO()
+        call_command(
+            'benchmark',
+            '--clients=1',
+            '--duration=0.5',
+            '--mix=tasks=2,detail_task=2,create_task=1,update_task=1,'
+            'delete_task=1',
+            *args,
+            stdout=output,
+        )
+        return output.getvalue()
+
+    def test_report(self):
+        """Test every URL name of the mix is reported without errors."""
+        path = os.path.join(self.directory.name, 'report.json')
+        self.assertIn('Total', self.benchmark('--output={path}'.format(
+            path=path,
+        )))
+        with open(path, encoding='utf-8') as report_file:
+            report = json.load(report_file)
+        self.assertEqual(report['errors'], 0)
+        self.assertTrue(report['requests'])
+        for stats in report['urls'].values():
+            self.assertLessEqual(stats['p50'], stats['p95'])
+            self.assertLessEqual(stats['p95'], stats['p99'])
+
+    @skipUnless(find_spec('uvicorn'), 'uvicorn is not installed')
+    def test_asgi(self):
+        """Test the ASGI application is served without errors."""
+        self.assertIn(' rps, 0 errors', self.benchmark('--interface=asgi'))
+
+    def test_regressions(self):
+        """Test a slower run than the baseline fails."""
+        path = os.path.join(self.directory.name, 'baseline.json')
+        stats = {'requests': 1, 'errors': 0, 'rps': 1e6}
+        stats.update(dict.fromkeys(PERCENTILES, 1e-6))
+        write_report(
+            {'rps': 1e6, 'urls': {'tasks': stats}}, path,
+        )
+        with self.assertRaisesMessage(CommandError, 'tasks p95'):
+            self.benchmark('--compare={path}'.format(path=path))
+
+    def test_unknown_url_name(self):
+        """Test the mix is validated."""
+        with self.assertRaises(CommandError):
+            self.benchmark('--mix=admin=1')
+
+    def test_percentile(self):
+        """Test nearest rank percentiles."""
+        latencies = list(range(1, 101))
+        self.assertEqual(percentile(latencies, 0.5), 50)
+        self.assertEqual(percentile(latencies, 0.99), 99)
+        self.assertEqual(percentile([7], 0.95), 7)
+
+
+class TestImportTasksCase(TestCase):
+    """Test 'import_tasks' command."""
+
+    fixtures = [
+        'tasks/db_users.json',
+        'tasks/db_statuses.json',
+        'tasks/db_labels.json',
+    ]
+
+    def setUp(self):
+        """Setup always when test executed."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_file(self, filename: str, content: str) -> str:
+        """
+        Write file to import.
+
+        Args:
+            filename: file name
+            content: file content
+
+        Returns:
+            str: path of the file
+        """
+        path = os.path.join(self.directory.name, filename)
+        with open(path, 'w', encoding='utf-8') as import_file:
+            import_file.write(content)
+        return path
+
+    def resume_args(self, path: str) -> tuple:
+        """
+        Get arguments of the import in batches of two tasks.
+
+        Args:
+            path: imported file
+
+        Returns:
+            tuple:
+        """
+        return ('import_tasks', path, '--batch-size=2', '--creator=user_test1')
+
+    def test_import_fixture_json(self):
+        """Test JSON of fixture shape is imported with labels."""
+        documents = [
+            {
+                'model': 'tasks.tasks',
+                'pk': 100 + number,
+                'fields': {
+                    'name': 'imported {n}'.format(n=number),
+                    'description': 'quarterly report',
+                    'status': 2,
+                    'executor': 1,
+                    'creator': 2,
+                },
+            }
+            for number in range(3)
+        ]
+        documents.append({
+            'model': 'tasks.tasklabelrelated',
+            'fields': {'task': 101, 'label': 4},
+        })
+        path = self.write_file('tasks.json', json.dumps(documents))
+        output = StringIO()
+        call_command('import_tasks', path, '--batch-size=2', stdout=output)
+
+        self.assertIn('records/s', output.getvalue())
+        self.assertEqual(Tasks.objects.count(), 3)
+        task = Tasks.objects.get(name='imported 1')
+        label_ids = list(task.labels.values_list('pk', flat=True))
+        self.assertEqual(label_ids, [4])
+        self.assertEqual(task.creator_id, 2)
+        self.assertEqual(
+            len(search_tasks(Tasks.objects.all(), 'quarterly')), 3,
+        )
+        self.assertFalse(os.path.exists('{path}.checkpoint'.format(path=path)))
+
+    def test_import_csv_by_names(self):
+        """Test CSV references are resolved by names."""
+        path = self.write_file(
+            'tasks.csv',
+            ''.join((
+                'name,status,executor,labels\n',
+                'first,new,user_test2,"politic, news"\n',
+                'second,finish,,\n',
+            )),
+        )
+        call_command(
+            'import_tasks', path, '--creator=user_test1', stdout=StringIO(),
+        )
+        first = Tasks.objects.get(name='first')
+        self.assertEqual(first.status.name, 'new')
+        self.assertEqual(first.executor.username, 'user_test2')
+        self.assertEqual(
+            sorted(first.labels.values_list('name', flat=True)),
+            ['news', 'politic'],
+        )
+        self.assertIsNone(Tasks.objects.get(name='second').executor)
+
+    def test_resume_after_failure(self):
+        """Test a failed import continues from the last batch."""
+        rows = 'name,status\nfirst,new\nsecond,new\nthird,missing\n'
+        path = self.write_file('tasks.csv', rows)
+        with self.assertRaises(CommandError):
+            call_command(*self.resume_args(path), stdout=StringIO())
+        self.assertEqual(Tasks.objects.count(), 2)
+
+        self.write_file('tasks.csv', rows.replace('missing', 'new'))
+        call_command(*self.resume_args(path), '--resume', stdout=StringIO())
+        self.assertEqual(
+            sorted(Tasks.objects.values_list('name', flat=True)),
+            ['first', 'second', 'third'],
+        )
+
+    def test_existing_tasks_rejected(self):
+        """Test tasks are not imported twice without resume."""
+        path = self.write_file('tasks.csv', 'name,status\nfirst,new\n')
+        call_command(
+            'import_tasks', path, '--creator=user_test1', stdout=StringIO(),
+        )
+        with self.assertRaises(CommandError):
+            call_command(
+                'import_tasks', path, '--creator=user_test1', stdout=StringIO(),
+            )
+        self.assertEqual(Tasks.objects.count(), 1)
+
+    def test_json_read_by_chunks(self):
+        """Test documents split between reads are decoded."""
+        documents = [{'name': 'a , ] b'}, {'name': 'c'}]
+        json_lines = '{"name": "a , ] b"}\n{"name": "c"}\n'
+        for content in (json.dumps(documents), json_lines):
+            self.assertEqual(
+                list(iter_json_documents(StringIO(content), read_size=3)),
+                documents,
+            )
+        with self.assertRaises(TaskImportError):
+            list(iter_json_documents(StringIO('[{"name": '), read_size=3))
@@ -0,0 +1,218 @@
+"""Live task list events tests."""
+import json
+import tempfile
+from http import HTTPStatus
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import events
+from task_manager.tasks.bulk import ACTION_STATUS, apply_bulk_action
+from task_manager.tasks.models import Tasks
+
+
+def make_event(task_id: int) -> events.TaskEvent:
+    """
+    Make an event of an updated name.
+
+    Args:
+        task_id: task primary key
+
+    Returns:
+        TaskEvent:
+    """
+    return events.TaskEvent(task_id, events.ACTION_UPDATED, ('name',), 1)
+
+
+class TestBrokerCase(TestCase):
+    """Test events are fanned out and replayed."""
+
+    def test_replay(self):
+        """Test a reconnecting stream gets the events after its id."""
+        broker = events.TaskEventBroker(queue_size=10, history_size=10)
+        broker.publish(make_event(1))
+        last_event_id = broker.get_last_event_id()
+        broker.publish(make_event(2))
+        broker.publish(make_event(3))
+        subscription = broker.subscribe(last_event_id)
+        batch = subscription.get_batch(0, 10)
+        self.assertEqual([event.task_id for _id, event in batch], [2, 3])
+        self.assertFalse(subscription.reset)
+
+    def test_reset(self):
+        """Test a stream which missed events is reset."""
+        broker = events.TaskEventBroker(queue_size=1, history_size=1)
+        broker.publish(make_event(1))
+        last_event_id = broker.get_last_event_id()
+        broker.publish(make_event(2))
+        self.assertTrue(broker.subscribe(last_event_id).reset)
+        subscription = broker.subscribe()
+        broker.publish(make_event(3))
+        self.assertFalse(subscription.reset)
+        broker.publish(make_event(4))
+        self.assertTrue(subscription.reset)
+
+    def test_relay(self):
+        """Test events are relayed to the brokers of other processes."""
+        with tempfile.TemporaryDirectory() as directory:
+            publisher = events.TaskEventBroker(10, 10, socket_dir=directory)
+            receiver = events.TaskEventBroker(10, 10, socket_dir=directory)
+            subscription = receiver.subscribe()
+            publisher.publish(make_event(1))
+            batch = subscription.get_batch(5, 10)
+            publisher.close()
+            receiver.close()
+        self.assertEqual(batch[0][1], make_event(1))
+
+    def test_relay_gap(self):
+        """Test streams are reset when relayed events are lost."""
+        with tempfile.TemporaryDirectory() as directory:
+            publisher = events.TaskEventBroker(10, 10, socket_dir=directory)
+            receiver = events.TaskEventBroker(10, 10, socket_dir=directory)
+            subscription = receiver.subscribe()
+            publisher.publish(make_event(1))
+            subscription.get_batch(5, 10)
+            with mock.patch.object(publisher, '_relay'):
+                publisher.publish(make_event(2))
+            publisher.publish(make_event(3))
+            batch = subscription.get_batch(5, 10)
+            publisher.close()
+            receiver.close()
+        self.assertEqual(batch[0][1], make_event(3))
+        self.assertTrue(subscription.reset)
+
+    def test_max_streams(self):
+        """Test streams past the cap of the process are refused."""
+        broker = events.TaskEventBroker(queue_size=10, history_size=10)
+        self.assertIsNotNone(broker.subscribe(max_streams=1))
+        self.assertIsNone(broker.subscribe(max_streams=1))
+
+
+class TestPublishCase(TestCase):
+    """Test writes of tasks publish their events on commit."""
+
+    def setUp(self):
+        """Setup always when test executed."""
+        self.user = get_user_model().objects.create_user(username='test')
+        self.status = Status.objects.create(name='test_status')
+        self.label = Label.objects.create(name='test_label')
+        self.task = Tasks.objects.create(
+            name='test_task', status=self.status, creator=self.user,
+        )
+        self.subscription = events.get_broker().subscribe()
+        self.addCleanup(events.get_broker().unsubscribe, self.subscription)
+
+    def get_events(self):
+        """
+        Get the published events.
+
+        Returns:
+            List:
+        """
+        return [
+            (event.task_id, event.action, event.fields)
+            for _id, event in self.subscription.get_batch(0, 100)
+        ]
+
+    def test_changed_fields(self):
+        """Test events carry the changed fields of the row only."""
+        task = Tasks.objects.get(pk=self.task.pk)
+        task.name = 'renamed'
+        task.description = 'changed'
+        with self.captureOnCommitCallbacks(execute=True):
+            task.save()
+            task.save()
+            task.labels.add(self.label)
+        renamed = (task.pk, events.ACTION_UPDATED, ('description', 'name'))
+        labeled = (task.pk, events.ACTION_UPDATED, (events.FIELD_LABELS,))
+        self.assertEqual(self.get_events(), [renamed, labeled])
+
+    def test_not_committed(self):
+        """Test nothing is published before the commit."""
+        with self.captureOnCommitCallbacks(execute=False):
+            Tasks.objects.filter(pk=self.task.pk).get().delete()
+        self.assertEqual(self.get_events(), [])
+
+    def test_bulk(self):
+        """Test bulk actions publish events of the changed tasks."""
+        other = Status.objects.create(name='other_status')
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_bulk_action(self.user, ACTION_STATUS, [self.task.pk], other)
+        self.assertEqual(
+            self.get_events(),
+            [(self.task.pk, events.ACTION_UPDATED, ('status',))],
+        )
+
+
+@override_settings(TASK_EVENTS_STREAM_TIMEOUT=0.5, TASK_EVENTS_HEARTBEAT=1)
+class TestEventsViewCase(TestCase):
+    """Test the events stream and the row of live task lists."""
+
+    def setUp(self):
+        """Setup always when test executed."""
+        self.user = get_user_model().objects.create_user(username='test')
+        self.status = Status.objects.create(name='test_status')
+        self.other_status = Status.objects.create(name='other_status')
+        self.task = Tasks.objects.create(
+            name='test_task', status=self.status, creator=self.user,
+        )
+        self.client.force_login(self.user)
+
+    def stream_update(self, status: Status) -> dict:
+        """
+        Stream the event of a renamed task to a list filtered by status.
+
+        Args:
+            status: status of the listed tasks
+
+        Returns:
+            dict: data of the event
+        """
+        response = self.client.get(reverse('task_events'), {
+            'status': status.pk,
+        })
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = iter(response.streaming_content)
+        self.assertTrue(next(stream).startswith(b'retry:'))
+        self.task.name = 'renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.save()
+        chunk = next(stream).decode()
+        # The stream ends at the timeout, the client reconnects.
+        self.assertEqual(list(stream), [b': keep-alive\n\n'])
+        self.assertIn('event: task', chunk)
+        return json.loads(chunk.split('data: ')[1])
+
+    def test_matching(self):
+        """Test the event of a task matching the filters."""
+        data = self.stream_update(self.status)
+        self.assertEqual(data['id'], self.task.pk)
+        self.assertEqual(data['fields'], ['name'])
+        self.assertTrue(data['matches'])
+
+    def test_not_matching(self):
+        """Test the event of a task the list does not show."""
+        self.assertFalse(self.stream_update(self.other_status)['matches'])
+
+    @override_settings(TASK_EVENTS_MAX_STREAMS=0)
+    def test_busy(self):
+        """Test a stream past the cap tells the client to come back later."""
+        response = self.client.get(reverse('task_events'))
+        self.assertEqual(
+            list(response.streaming_content),
+            ['retry: {ms}\n\n'.format(ms=events.BUSY_RETRY_MS).encode()],
+        )
+
+    def test_row(self):
+        """Test the row re-fetched by the list."""
+        response = self.client.get(
+            reverse('task_row', kwargs={'pk': self.task.pk}),
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertContains(
+            response, 'data-task-id="{pk}"'.format(pk=self.task.pk),
+        )
+        self.assertContains(response, self.status.name)
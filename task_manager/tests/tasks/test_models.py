@@ -3,8 +3,15 @@ from django.contrib.auth import get_user_model
 from django.core.exceptions import ObjectDoesNotExist
 from django.db.models.deletion import ProtectedError
 from django.test import TestCase
+from task_manager.labels.models import Label
 from task_manager.statuses.models import Status
-from task_manager.tasks.models import Tasks
+from task_manager.tasks.bulk import (
+    ACTION_DELETE,
+    ACTION_EXECUTOR,
+    ACTION_STATUS,
+    apply_bulk_action,
+)
+from task_manager.tasks.models import TaskLabelRelated, Tasks
 from task_manager.utils import load_file_from_fixture
 
 
@@ -80,3 +87,104 @@ class TestModelCase(TestCase):
         task.delete()
         with self.assertRaises(ObjectDoesNotExist):
             Tasks.objects.get(pk=task.pk)
+
+
+class TestCountersCase(TestCase):
+    """Test counters of tasks on statuses, labels and users."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setup once test data."""
+        user_model = get_user_model()
+        cls.user = user_model.objects.create_user(username='creator')
+        cls.executor = user_model.objects.create_user(username='executor')
+        cls.status = Status.objects.create(name='open')
+        cls.new_status = Status.objects.create(name='closed')
+        cls.label = Label.objects.create(name='bug')
+        cls.new_label = Label.objects.create(name='feature')
+
+    def assert_counts(self, **expected_counts):
+        """
+        Check counters against the database.
+
+        Args:
+            expected_counts: counter value by '<attribute>__<counter>'
+        """
+        for name, expected in expected_counts.items():
+            attribute, counter = name.split('__')
+            instance = getattr(self, attribute)
+            instance.refresh_from_db()
+            self.assertEqual(getattr(instance, counter), expected, name)
+
+    def create_task(self, name: str) -> Tasks:
+        """
+        Create a task with the label.
+
+        Args:
+            name: task name
+
+        Returns:
+            Tasks:
+        """
+        task = Tasks.objects.create(
+            name=name,
+            status=self.status,
+            creator=self.user,
+            executor=self.executor,
+        )
+        task.labels.add(self.label)
+        return task
+
+    def test_counted_on_save_and_delete(self):
+        """Test counters follow created, changed and deleted tasks."""
+        task = self.create_task('first')
+        self.create_task('second')
+        self.assert_counts(
+            status__task_count=2,
+            user__created_count=2,
+            executor__assigned_count=2,
+            label__task_count=2,
+        )
+
+        task = Tasks.objects.get(pk=task.pk)
+        task.status = self.new_status
+        task.executor = None
+        task.save()
+        task.labels.set([self.new_label])
+        self.assert_counts(
+            status__task_count=1,
+            new_status__task_count=1,
+            executor__assigned_count=1,
+            label__task_count=1,
+            new_label__task_count=1,
+        )
+
+        TaskLabelRelated.objects.create(task=task, label=self.label)
+        task.delete()
+        self.assert_counts(
+            new_status__task_count=0,
+            user__created_count=1,
+            label__task_count=1,
+            new_label__task_count=0,
+        )
+
+    def test_counted_by_bulk_actions(self):
+        """Test bulk actions move counters of all their tasks."""
+        task_ids = [self.create_task(name).pk for name in ('first', 'second')]
+        apply_bulk_action(
+            self.user, ACTION_STATUS, task_ids, self.new_status,
+        )
+        apply_bulk_action(self.user, ACTION_EXECUTOR, task_ids[:1], None)
+        self.assert_counts(
+            status__task_count=0,
+            new_status__task_count=2,
+            executor__assigned_count=1,
+        )
+
+        apply_bulk_action(self.user, ACTION_DELETE, task_ids, None)
+        self.assert_counts(
+            new_status__task_count=0,
+            user__created_count=0,
+            executor__assigned_count=0,
+            label__task_count=0,
+        )
@@ -1,9 +1,21 @@
 """Tasks views tests."""
+import gzip
+import json
+import time
+from datetime import timedelta
 from http import HTTPStatus
+from unittest import mock
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from task_manager.labels.models import Label
+from task_manager.paginators import KeysetPaginator
 from task_manager.statuses.models import Status
 from task_manager.tasks.models import Tasks
 from task_manager.tasks.views import TaskListView
@@ -36,6 +48,7 @@ class TestListViewCase(TestCase):
 
     def setUp(self):
         """Setup always when test executed."""
+        cache.clear()
         self.client.login(**self.credentials)
 
     def test_view_url(self):
@@ -94,6 +107,380 @@ class TestListViewCase(TestCase):
         self.assertFalse(response.context['is_paginated'])
 
 
+@override_settings(TASKS_PAGINATION_MODE='keyset')
+class TestKeysetPaginationViewCase(TestCase):
+    """Test cursor pagination of listing view."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setup once test data."""
+        number_of_tasks = 25
+        cls.model = Tasks
+        cls.credentials = {'username': 'test', 'password': 'test'}
+        cls.user = get_user_model().objects.create_user(**cls.credentials)
+        cls.status = Status.objects.create(name='test_status')
+        cls.another_status = Status.objects.create(name='another_status')
+        cls.model.objects.bulk_create(
+            [
+                cls.model(
+                    name=f'task{postfix}',  # noqa: WPS305
+                    status=cls.status if postfix % 2 else cls.another_status,
+                    creator=cls.user,
+                ) for postfix in range(number_of_tasks)
+            ],
+        )
+
+    def setUp(self):
+        """Setup always when test executed."""
+        self.client.login(**self.credentials)
+
+    def walk_forward(self, **query) -> list:
+        """
+        Collect tasks following 'next' cursors from the first page.
+
+        Args:
+            query: filter query string
+
+        Returns:
+            list:
+        """
+        tasks = []
+        response = self.client.get(reverse('tasks'), query)
+        while True:
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            page = response.context['page_obj']
+            tasks.extend(page.object_list)
+            if not page.has_next():
+                return tasks
+            response = self.client.get(
+                reverse('tasks'), dict(query, cursor=page.next_cursor()),
+            )
+
+    def test_walk_all_pages(self):
+        """Test every task is listed once in '-created_at, id' order."""
+        tasks = self.walk_forward()
+        expected = list(self.model.objects.order_by('-created_at', 'id'))
+        self.assertEqual(expected, tasks)
+
+    def test_previous_cursor(self):
+        """Test 'previous' cursor returns to the first page."""
+        first = self.client.get(reverse('tasks')).context['page_obj']
+        self.assertFalse(first.has_previous())
+        second = self.client.get(
+            reverse('tasks'), {'cursor': first.next_cursor()},
+        ).context['page_obj']
+        self.assertTrue(second.has_previous())
+
+        response = self.client.get(
+            reverse('tasks'), {'cursor': second.previous_cursor()},
+        )
+        page = response.context['page_obj']
+        self.assertEqual(list(first), list(page))
+        self.assertFalse(page.has_previous())
+
+    def test_keeps_filter(self):
+        """Test cursor pages are restricted by the filter query string."""
+        tasks = self.walk_forward(status=self.status.pk)
+        self.assertEqual(
+            self.model.objects.filter(status=self.status).count(),
+            len(tasks),
+        )
+        self.assertTrue(all(task.status == self.status for task in tasks))
+
+    def test_no_count_query(self):
+        """Test pages are fetched without COUNT."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('tasks'))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertFalse(
+            any('COUNT(' in query['sql'] for query in queries.captured_queries),
+        )
+
+    def test_invalid_cursor(self):
+        """Test invalid cursor gives 404."""
+        response = self.client.get(reverse('tasks'), {'cursor': 'broken'})
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+
+class TestCachedCountViewCase(TestCase):
+    """Test cached count of listing view."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setup once test data."""
+        cls.number_of_tasks = 15
+        cls.model = Tasks
+        cls.credentials = {'username': 'test', 'password': 'test'}
+        cls.user = get_user_model().objects.create_user(**cls.credentials)
+        cls.status = Status.objects.create(name='test_status')
+        cls.model.objects.bulk_create(
+            [
+                cls.model(
+                    name=f'task{postfix}',  # noqa: WPS305
+                    status=cls.status,
+                    creator=cls.user,
+                ) for postfix in range(cls.number_of_tasks)
+            ],
+        )
+
+    def setUp(self):
+        """Setup always when test executed."""
+        cache.clear()
+        self.client.login(**self.credentials)
+
+    def count_queries(self, url: str) -> int:
+        """
+        Count COUNT queries run to render the page.
+
+        Args:
+            url: page url
+
+        Returns:
+            int:
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return len([
+            query for query in queries.captured_queries
+            if 'COUNT(' in query['sql']
+        ])
+
+    def test_count_served_from_cache(self):
+        """Test the second page view runs no COUNT."""
+        self.assertEqual(1, self.count_queries(reverse('tasks')))
+        self.assertEqual(0, self.count_queries(reverse('tasks')))
+        self.assertEqual(
+            0,
+            self.count_queries('{url}?page=2'.format(url=reverse('tasks'))),
+        )
+        self.assertEqual(
+            1,
+            self.count_queries('{url}?status={status}'.format(
+                url=reverse('tasks'), status=self.status.pk,
+            )),
+        )
+
+    def test_count_invalidated_on_write(self):
+        """Test saving a task invalidates cached counts."""
+        response = self.client.get(reverse('tasks'))
+        self.assertEqual(
+            self.number_of_tasks, response.context['paginator'].count,
+        )
+
+        self.model.objects.create(
+            name='new task', status=self.status, creator=self.user,
+        )
+        response = self.client.get(reverse('tasks'))
+        self.assertEqual(
+            self.number_of_tasks + 1, response.context['paginator'].count,
+        )
+
+    @override_settings(
+        PAGINATION_COUNT_MODE='estimated',
+        PAGINATION_COUNT_CAP=12,  # noqa: WPS432
+    )
+    def test_estimated_count_is_capped(self):
+        """Test estimated mode caps an expensive count."""
+        response = self.client.get(reverse('tasks'))
+        paginator = response.context['paginator']
+        count_cap = settings.PAGINATION_COUNT_CAP
+        self.assertEqual(count_cap, paginator.count)
+        self.assertEqual(f'{count_cap}+', paginator.display_count)  # noqa: WPS305
+        self.assertContains(response, paginator.display_count)
+
+    @override_settings(
+        PAGINATION_COUNT_MODE='estimated',
+        PAGINATION_COUNT_CAP=5,  # noqa: WPS432
+    )
+    def test_pages_past_capped_count(self):
+        """Test pages after a capped count are served until they are empty."""
+        response = self.client.get(reverse('tasks'))
+        self.assertEqual('5+', response.context['paginator'].display_count)
+        self.assertTrue(response.context['page_obj'].has_next())
+        response = self.client.get(reverse('tasks'), {'page': 2})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        page_obj = response.context['page_obj']
+        self.assertEqual(len(page_obj), self.number_of_tasks - 10)
+        self.assertFalse(page_obj.has_next())
+        response = self.client.get(reverse('tasks'), {'page': 3})
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+
+class TestRowFragmentCacheCase(TestCase):
+    """Test cached task list rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setup once test data."""
+        cls.credentials = {'username': 'test', 'password': 'test'}
+        cls.user = get_user_model().objects.create_user(**cls.credentials)
+        cls.status = Status.objects.create(name='open')
+        cls.task = Tasks.objects.create(
+            name='first', status=cls.status, creator=cls.user,
+        )
+
+    def setUp(self):
+        """Setup always when test executed."""
+        cache.clear()
+        self.client.login(**self.credentials)
+
+    def get_content(self, language: str = 'en') -> str:
+        """
+        Get content of the task list.
+
+        Args:
+            language: accepted language
+
+        Returns:
+            str:
+        """
+        response = self.client.get(
+            reverse('tasks'), HTTP_ACCEPT_LANGUAGE=language,
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return response.content.decode('utf-8')
+
+    def test_unchanged_row_served_from_cache(self):
+        """Test a row changed without hooks keeps its cached fragment."""
+        self.get_content()
+        Tasks.objects.filter(pk=self.task.pk).update(name='silent')
+        self.assertIn('first', self.get_content())
+
+    def test_row_rerendered_on_task_change(self):
+        """Test an edited task re-renders its row."""
+        self.get_content()
+        self.task.name = 'second'
+        self.task.save()
+        self.assertIn('second', self.get_content())
+
+    def test_row_rerendered_on_reference_change(self):
+        """Test renamed status and user re-render rows."""
+        self.get_content()
+        self.status.name = 'closed'
+        self.status.save()
+        self.user.first_name = 'Ivan'
+        self.user.save()
+        content = self.get_content()
+        self.assertIn('closed', content)
+        self.assertIn('Ivan', content)
+
+    def test_row_cached_per_language(self):
+        """Test rows are rendered in the active language."""
+        self.assertIn('Change</button>', self.get_content())
+        self.assertIn('Изменить</button>', self.get_content(language='ru'))
+
+
+class TestConditionalGetCase(TestCase):
+    """Test unchanged task pages are answered with 304."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setup once test data."""
+        cls.credentials = {'username': 'test', 'password': 'test'}
+        cls.user = get_user_model().objects.create_user(**cls.credentials)
+        cls.status = Status.objects.create(name='open')
+        cls.task = Tasks.objects.create(
+            name='first', status=cls.status, creator=cls.user,
+        )
+
+    def setUp(self):
+        """Setup always when test executed."""
+        cache.clear()
+        self.client.login(**self.credentials)
+
+    def get_etag(self, url: str) -> str:
+        """
+        Get ETag of the page.
+
+        Args:
+            url: page url
+
+        Returns:
+            str:
+        """
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertTrue(response.has_header('Last-Modified'))
+        return response['ETag']
+
+    def test_not_modified(self):
+        """Test list and detail pages are not rendered again."""
+        urls = (
+            reverse('tasks'),
+            '{url}?status={status}'.format(
+                url=reverse('tasks'), status=self.status.pk,
+            ),
+            reverse('detail_task', args=[self.task.pk]),
+        )
+        for url in urls:
+            etag = self.get_etag(url)
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+            self.assertFalse(response.content)
+
+    def test_modified_on_change(self):
+        """Test edits of tasks, labels and statuses give a new ETag."""
+        url = reverse('tasks')
+        etags = {self.get_etag(url)}
+        self.task.name = 'second'
+        self.task.save()
+        etags.add(self.get_etag(url))
+        self.task.labels.add(Label.objects.create(name='bug'))
+        etags.add(self.get_etag(url))
+        self.status.name = 'closed'
+        self.status.save()
+        etags.add(self.get_etag(url))
+        Tasks.objects.create(
+            name='third', status=self.status, creator=self.user,
+        )
+        etags.add(self.get_etag(url))
+        self.assertEqual(len(etags), 5)
+
+    def test_modified_by_login(self):
+        """Test a new session does not get the forms of the old one."""
+        url = reverse('tasks')
+        etag = self.get_etag(url)
+        self.client.logout()
+        self.client.login(**self.credentials)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    @override_settings(CACHE_SHARED=False)
+    def test_modified_by_other_process(self):
+        """Test writes whose version bumps this process does not see."""
+        deleted = Tasks.objects.create(
+            name='deleted', status=self.status, creator=self.user,
+        )
+        url = reverse('tasks')
+        etag = self.get_etag(url)
+        with mock.patch('task_manager.cache._incr_version'):
+            deleted.delete()
+        expired = time.time() + settings.CACHE_VERSION_TIMEOUT + 1
+        with mock.patch('time.time', return_value=expired):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertNotContains(response, 'deleted')
+
+        with mock.patch('task_manager.cache._incr_version'):
+            self.task.name = 'renamed'
+            self.task.save()
+        self.assertContains(self.client.get(url), 'renamed')
+
+    def test_rendered_with_messages(self):
+        """Test pages showing messages are not answered with 304."""
+        url = reverse('tasks')
+        etag = self.get_etag(url)
+        self.client.post(
+            reverse('update_task', args=[self.task.pk]),
+            {'name': 'first', 'status': self.status.pk},
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertFalse(response.has_header('ETag'))
+
+
 class TestFilterViewCase(TestCase):
     """Test filter view."""
 
@@ -174,6 +561,362 @@ class TestFilterViewCase(TestCase):
         self.assertEqual(response.status_code, HTTPStatus.OK)
         self.assertEqual(count_rec_switch_off, len(response.context['tasks_list']))
 
+    def get_filtered_pks(self, **query) -> list:
+        """
+        Get primary keys of tasks listed by the filter.
+
+        Args:
+            query: query parameters
+
+        Returns:
+            list:
+        """
+        response = self.client.get(self.url, query)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return sorted(task.pk for task in response.context['tasks_list'])
+
+    def test_filter_by_any_label(self):
+        """Test tasks with any of the labels are listed once."""
+        self.assertEqual(self.get_filtered_pks(label=[4, 5]), [3, 5])
+        self.assertEqual(
+            self.get_filtered_pks(label=[4, 6], label_mode='any'),
+            [3, 4, 5],
+        )
+
+    def test_filter_by_all_labels(self):
+        """Test tasks with all of the labels."""
+        self.assertEqual(
+            self.get_filtered_pks(label=[4, 5], label_mode='all'),
+            [3, 5],
+        )
+        self.assertEqual(
+            self.get_filtered_pks(label=[4, 6], label_mode='all'),
+            [],
+        )
+        self.assertEqual(
+            self.get_filtered_pks(label=[6], label_mode='all', status=3),
+            [4],
+        )
+
+
+class TestSearchViewCase(TestCase):
+    """Test full-text search filter."""
+
+    fixtures = [
+        'tasks/db_users.json',
+        'tasks/db_statuses.json',
+        'tasks/db_labels.json',
+        'tasks/db_tasks.json',
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setup once test data."""
+        cls.credentials = {'username': 'user_test1', 'password': '12345'}
+        cls.url = reverse('tasks')
+
+    def setUp(self):
+        """Setup always when test executed."""
+        cache.clear()
+        self.client.login(**self.credentials)
+
+    def search(self, text: str, **query) -> list:
+        """
+        Get tasks found by the list view.
+
+        Args:
+            text: search text
+            query: other filters
+
+        Returns:
+            list:
+        """
+        query['q'] = text
+        response = self.client.get(self.url, query)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return list(response.context['tasks_list'])
+
+    def test_search_by_prefix_of_every_term(self):
+        """Test every term must match as a prefix."""
+        self.assertEqual(len(self.search('IMPORT')), Tasks.objects.count())
+        self.assertEqual(
+            [task.name for task in self.search('impor task 1')],
+            ['important task 1'],
+        )
+        self.assertEqual(self.search('missing'), [])
+
+    def test_search_by_description(self):
+        """Test description is searched."""
+        task = Tasks.objects.get(name='important task')
+        task.description = 'Deploy the release'
+        task.save()
+        self.assertEqual(self.search('releas'), [task])
+
+    def test_index_follows_changes(self):
+        """Test renamed and deleted tasks leave the index."""
+        task = Tasks.objects.get(name='important task 0')
+        task.name = 'renamed'
+        task.save()
+        self.assertEqual(self.search('renamed'), [task])
+        self.assertNotIn(task, self.search('important'))
+
+        task.delete()
+        self.assertEqual(self.search('renamed'), [])
+
+    def test_search_combined_with_filters(self):
+        """Test search is combined with other filters."""
+        found = self.search('important', status=3)
+        self.assertEqual(
+            {task.pk for task in found},
+            set(
+                Tasks.objects.filter(status=3).values_list('pk', flat=True),
+            ),
+        )
+
+    @override_settings(TASKS_PAGINATION_MODE='keyset')
+    def test_relevance_order_in_keyset_mode(self):
+        """Test search results keep relevance order instead of cursors."""
+        relevant = Tasks.objects.create(
+            name='deploy deploy deploy', status_id=3, creator_id=1,
+        )
+        Tasks.objects.filter(pk=relevant.pk).update(
+            created_at=timezone.now() - timedelta(days=1),
+        )
+        Tasks.objects.create(
+            name='deploy notes',
+            description='Some notes to read first',
+            status_id=3,
+            creator_id=1,
+        )
+        response = self.client.get(self.url, {'q': 'deploy'})
+        self.assertNotIsInstance(
+            response.context['paginator'], KeysetPaginator,
+        )
+        self.assertEqual(
+            [task.name for task in response.context['tasks_list']],
+            ['deploy deploy deploy', 'deploy notes'],
+        )
+
+    def test_punctuation_only_is_ignored(self):
+        """Test text without terms does not filter."""
+        self.assertEqual(len(self.search('"*')), Tasks.objects.count())
+
+
+class TestExportViewCase(TestCase):
+    """Test streaming export of tasks."""
+
+    fixtures = [
+        'tasks/db_users.json',
+        'tasks/db_statuses.json',
+        'tasks/db_labels.json',
+        'tasks/db_tasks.json',
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setup once test data."""
+        cls.credentials = {'username': 'user_test1', 'password': '12345'}
+        cls.url = reverse('export_tasks')
+
+    def setUp(self):
+        """Setup always when test executed."""
+        self.client.login(**self.credentials)
+
+    def get_export(self, **query) -> bytes:
+        """
+        Get content of the export.
+
+        Args:
+            query: query parameters
+
+        Returns:
+            bytes:
+        """
+        response = self.client.get(self.url, query)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content)
+
+    def test_view_url(self):
+        """Test view url."""
+        self.assertEqual(reverse('export_tasks'), '/tasks/export/')
+
+    def test_export_csv(self):
+        """Test CSV has a header and a line per filtered task."""
+        content = self.get_export(status=3).decode('utf-8')
+        lines = content.splitlines()
+        header = lines[0].split(',')
+        self.assertEqual(header[:2], ['id', 'name'])
+        self.assertEqual(
+            len(lines) - 1,
+            Tasks.objects.filter(status=3).count(),
+        )
+
+    def test_export_ndjson(self):
+        """Test NDJSON has a document per task."""
+        content = self.get_export(format='ndjson', label=[4, 5])
+        lines = content.decode('utf-8').splitlines()
+        documents = [json.loads(line) for line in lines]
+        exported_ids = sorted(doc['id'] for doc in documents)
+        self.assertEqual(exported_ids, [3, 5])
+        self.assertIn('status__name', documents[0])
+
+    def test_export_gzip(self):
+        """Test the export is compressed on request."""
+        response = self.client.get(self.url, {'format': 'ndjson', 'gzip': 1})
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertIn('tasks.ndjson.gz', response['Content-Disposition'])
+        content = gzip.decompress(b''.join(response.streaming_content))
+        self.assertEqual(
+            len(content.splitlines()), Tasks.objects.count(),
+        )
+
+    def test_unknown_format(self):
+        """Test unknown format is not found."""
+        response = self.client.get(self.url, {'format': 'xml'})
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_not_auth_users_cannot_export(self):
+        """Test not authenticated users not allowed to export."""
+        self.client.logout()
+        response = self.client.get(self.url)
+        self.assertRedirects(response, reverse('login'))
+
+
+class TestBulkViewCase(TestCase):
+    """Test bulk actions on checked tasks."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setup once test data."""
+        cls.number_of_tasks = 20
+        cls.credentials = {'username': 'test', 'password': 'test'}
+        cls.user = get_user_model().objects.create_user(**cls.credentials)
+        cls.other_user = get_user_model().objects.create_user(username='other')
+        cls.status = Status.objects.create(name='open')
+        cls.new_status = Status.objects.create(name='closed')
+        cls.label = Label.objects.create(name='bug')
+        Tasks.objects.bulk_create(
+            [
+                Tasks(
+                    name=f'task{postfix}',  # noqa: WPS305
+                    status=cls.status,
+                    creator=cls.user if postfix % 2 else cls.other_user,
+                ) for postfix in range(cls.number_of_tasks)
+            ],
+        )
+        cls.task_ids = list(Tasks.objects.values_list('pk', flat=True))
+
+    def setUp(self):
+        """Setup always when test executed."""
+        cache.clear()
+        self.client.login(**self.credentials)
+
+    def post_action(self, task_ids, **form_data):
+        """
+        Send the bulk form.
+
+        Args:
+            task_ids: checked tasks
+            form_data: other fields
+
+        Returns:
+            Any:
+        """
+        return self.client.post(
+            reverse('bulk_tasks'),
+            dict(form_data, tasks=task_ids, next='/tasks/?label_mode=all'),
+            follow=True,
+            HTTP_ACCEPT_LANGUAGE='en',
+        )
+
+    def count_queries(self, task_ids) -> int:
+        """
+        Count queries of a status change.
+
+        Args:
+            task_ids: checked tasks
+
+        Returns:
+            int:
+        """
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(
+                reverse('bulk_tasks'),
+                {
+                    'tasks': task_ids,
+                    'action': 'status',
+                    'status': self.new_status.pk,
+                },
+            )
+        return len(queries.captured_queries)
+
+    def test_change_status(self):
+        """Test status of all checked tasks is changed at once."""
+        response = self.post_action(
+            self.task_ids[:5], action='status', status=self.new_status.pk,
+        )
+        self.assertRedirects(response, '/tasks/?label_mode=all')
+        self.assertEqual(
+            Tasks.objects.filter(status=self.new_status).count(), 5,
+        )
+        self.assertContains(response, 'Tasks changed: 5')
+        self.assertEqual(
+            self.count_queries(self.task_ids[5:7]),
+            self.count_queries(self.task_ids[7:]),
+        )
+
+    def test_change_executor(self):
+        """Test checked tasks are assigned and unassigned."""
+        self.post_action(
+            self.task_ids, action='executor', executor=self.other_user.pk,
+        )
+        self.assertEqual(
+            Tasks.objects.filter(executor=self.other_user).count(),
+            len(self.task_ids),
+        )
+        self.post_action(self.task_ids[:3], action='executor')
+        self.assertEqual(Tasks.objects.filter(executor=None).count(), 3)
+
+    def test_delete_only_own(self):
+        """Test tasks of other creators are reported and kept."""
+        task = Tasks.objects.get(pk=self.task_ids[0])
+        task.labels.add(self.label)
+        missing = max(self.task_ids) + 1
+        response = self.post_action(
+            self.task_ids + [missing], action='delete',
+        )
+        self.assertFalse(Tasks.objects.filter(creator=self.user).exists())
+        self.assertEqual(
+            Tasks.objects.filter(creator=self.other_user).count(),
+            len(self.task_ids) // 2,
+        )
+        self.assertContains(response, 'Tasks not found: {id}'.format(
+            id=missing,
+        ))
+        self.assertContains(
+            response, 'Tasks can only be deleted by their author',
+        )
+
+    def test_invalid_form(self):
+        """Test nothing is changed without the new status."""
+        response = self.post_action(self.task_ids, action='status')
+        self.assertContains(response, 'Choose the new status')
+        self.assertFalse(Tasks.objects.filter(status=self.new_status).exists())
+
+    def test_unsafe_next_url(self):
+        """Test redirect to another host falls back to the list."""
+        response = self.client.post(
+            reverse('bulk_tasks'),
+            {
+                'tasks': self.task_ids[:1],
+                'action': 'status',
+                'status': self.new_status.pk,
+                'next': 'https://example.com/',
+            },
+        )
+        self.assertRedirects(response, reverse('tasks'))
+
 
 class TestCreateViewCase(TestCase):
     """Test create view."""
@@ -354,6 +1097,18 @@ class TestDeleteCase(TestCase):
             ).exists()  # noqa: C812
         )
 
+    def test_task_fetched_once(self):
+        """Test the rights test and the view share the task query."""
+        for method in (self.client.get, self.client.post):
+            with CaptureQueriesContext(connection) as queries:
+                method(reverse('delete_task', args=[self.task.pk]))
+            task_selects = [
+                query for query in queries.captured_queries
+                if query['sql'].startswith('SELECT')
+                and 'FROM "tasks_tasks" WHERE' in query['sql']
+            ]
+            self.assertEqual(len(task_selects), 1)
+
     def test_get_not_auth_users_cannot_delete(self):
         """Test GET not authenticated users cannot delete."""
         self.client.logout()
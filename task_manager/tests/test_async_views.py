@@ -0,0 +1,150 @@
+"""Coroutine views tests."""
+import asyncio
+import threading
+from http import HTTPStatus
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.backends.signals import connection_created
+from django.test import TransactionTestCase
+from django.urls import resolve, reverse
+from task_manager.asgi import application
+from task_manager.async_views import run_concurrently
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Tasks
+from task_manager.tasks.views import TaskListView
+
+
+class TestAsyncViewsCase(TransactionTestCase):
+    """Test read views run their reads concurrently outside transactions."""
+
+    def setUp(self):
+        """Setup always when test executed."""
+        self.user = get_user_model().objects.create_user(username='test')
+        self.status = Status.objects.create(name='test_status')
+        self.task = Tasks.objects.create(
+            name='test_task', status=self.status, creator=self.user,
+        )
+        self.client.force_login(self.user)
+
+    def test_coroutine_views(self):
+        """Test the views are called as coroutine functions."""
+        urls = (
+            reverse('tasks'),
+            reverse('detail_task', kwargs={'pk': self.task.pk}),
+            reverse('users'),
+            reverse('detail_user', kwargs={'pk': self.user.pk}),
+        )
+        for url in urls:
+            view = resolve(url).func
+            with self.subTest(url=url):
+                self.assertTrue(asyncio.iscoroutinefunction(view))
+
+    def test_concurrent(self):
+        """Test the callables run at once in other threads."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait():  # noqa: WPS430
+            barrier.wait()
+            return threading.get_ident()
+
+        idents = async_to_sync(run_concurrently)(wait, wait)
+        self.assertEqual(len(set(idents)), 2)
+        self.assertNotIn(threading.get_ident(), idents)
+
+    def test_connections_reused(self):
+        """Test reads of many requests open a connection per thread only."""
+        created = []
+
+        def on_created(sender, **kwargs):  # noqa: WPS430
+            created.append(kwargs['connection'])
+
+        connection_created.connect(on_created)
+        self.addCleanup(connection_created.disconnect, on_created)
+        with mock.patch.dict(connection.settings_dict, CONN_MAX_AGE=60):
+            for _ in range(settings.CONCURRENT_READ_THREADS * 2):
+                async_to_sync(run_concurrently)(Status.objects.exists)
+        self.assertLessEqual(len(created), settings.CONCURRENT_READ_THREADS)
+
+    def test_in_transaction(self):
+        """Test the callables run in the thread of the transaction."""
+        with transaction.atomic():
+            idents = async_to_sync(run_concurrently)(
+                threading.get_ident, threading.get_ident,
+            )
+        self.assertEqual(set(idents), {threading.get_ident()})
+
+    def test_execute_wrappers(self):
+        """Test queries of other threads pass wrappers of the caller."""
+        queries = []
+
+        def wrapper(execute, sql, *args):  # noqa: WPS430
+            queries.append(sql)
+            return execute(sql, *args)
+
+        with connection.execute_wrapper(wrapper):
+            statuses = async_to_sync(run_concurrently)(
+                lambda: list(Status.objects.all()),
+            )[0]
+        self.assertEqual(statuses, [self.status])
+        self.assertEqual(len(queries), 1)
+
+    def test_task_list(self):
+        """Test the page, then 304 Not Modified for the client having it."""
+        response = self.client.get(reverse('tasks'))
+        self.assertContains(response, self.task.name)
+        self.assertContains(response, self.status.name)
+        response = self.client.get(
+            reverse('tasks'), HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_validators_first(self):
+        """Test the validators are probed before the page is loaded."""
+        calls = []
+        get_page_validators = TaskListView.get_page_validators
+        get_page = TaskListView.get_page
+
+        def probe(view):  # noqa: WPS430
+            calls.append('validators')
+            return get_page_validators(view)
+
+        def load(view, *args, **kwargs):  # noqa: WPS430
+            calls.append('page')
+            return get_page(view, *args, **kwargs)
+
+        with mock.patch.object(TaskListView, 'get_page_validators', probe):
+            with mock.patch.object(TaskListView, 'get_page', load):
+                self.client.get(reverse('tasks'))
+        self.assertEqual(calls, ['validators', 'page'])
+
+    def test_anonymous(self):
+        """Test the access is checked before the reads."""
+        self.client.logout()
+        response = self.client.get(reverse('tasks'))
+        self.assertRedirects(response, reverse('login'))
+
+    async def test_asgi(self):
+        """Test the page is served by the ASGI application."""
+        cookie = 'sessionid={key}'.format(
+            key=self.client.cookies['sessionid'].value,
+        )
+        communicator = ApplicationCommunicator(application, {
+            'type': 'http',
+            'method': 'GET',
+            'path': reverse('detail_task', kwargs={'pk': self.task.pk}),
+            'query_string': b'',
+            'headers': [
+                (b'host', b'testserver'),
+                (b'cookie', cookie.encode()),
+            ],
+        })
+        await communicator.send_input({'type': 'http.request'})
+        start = await communicator.receive_output(5)
+        body = await communicator.receive_output(5)
+        self.assertEqual(start['status'], HTTPStatus.OK)
+        self.assertIn(self.task.name.encode(), body['body'])
@@ -0,0 +1,108 @@
+"""Home page dashboard tests."""
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from task_manager.statuses.models import Status
+from task_manager.tasks.bulk import ACTION_EXECUTOR, apply_bulk_action
+from task_manager.tasks.models import Tasks
+
+
+class TestDashboardCase(TestCase):
+    """Test the dashboard of the logged in user."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setup once test data."""
+        cls.credentials = {'username': 'test', 'password': 'test'}
+        cls.user = get_user_model().objects.create_user(**cls.credentials)
+        cls.other_user = get_user_model().objects.create_user(username='other')
+        cls.status = Status.objects.create(name='open')
+        cls.new_status = Status.objects.create(name='closed')
+        cls.task = Tasks.objects.create(
+            name='first', status=cls.status, creator=cls.user,
+        )
+        Tasks.objects.create(
+            name='second',
+            status=cls.new_status,
+            creator=cls.other_user,
+            executor=cls.user,
+        )
+
+    def setUp(self):
+        """Setup always when test executed."""
+        cache.clear()
+        self.client.login(**self.credentials)
+
+    def get_dashboard(self) -> dict:
+        """
+        Get dashboard of the home page.
+
+        Returns:
+            dict:
+        """
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return response.context['dashboard']
+
+    def test_counts_by_status(self):
+        """Test counts of created and executed tasks by status."""
+        dashboard = self.get_dashboard()
+        self.assertEqual(
+            dashboard['created'], [{'status': self.status, 'count': 1}],
+        )
+        self.assertEqual(
+            dashboard['executed'], [{'status': self.new_status, 'count': 1}],
+        )
+        self.assertEqual(
+            [task['name'] for task in dashboard['recent']],
+            ['second', 'first'],
+        )
+
+    def test_served_from_cache(self):
+        """Test a repeated view runs no dashboard queries."""
+        self.get_dashboard()
+        with CaptureQueriesContext(connection) as queries:
+            self.get_dashboard()
+        self.assertFalse(
+            [
+                query for query in queries.captured_queries
+                if Tasks._meta.db_table in query['sql']
+            ],
+        )
+
+    def test_invalidated_on_task_change(self):
+        """Test both the previous and the new executor see the change."""
+        self.get_dashboard()
+        self.task.executor = self.other_user
+        self.task.save()
+        self.assertEqual(
+            self.get_dashboard()['recent'][0]['name'], 'first',
+        )
+        self.client.force_login(self.other_user)
+        self.assertEqual(
+            self.get_dashboard()['executed'],
+            [{'status': self.status, 'count': 1}],
+        )
+
+        apply_bulk_action(self.user, ACTION_EXECUTOR, [self.task.pk], None)
+        self.assertFalse(self.get_dashboard()['executed'])
+
+    def test_status_renamed(self):
+        """Test status names are not cached with the counts."""
+        self.get_dashboard()
+        self.status.name = 'reopened'
+        self.status.save()
+        self.assertEqual(
+            self.get_dashboard()['created'][0]['status'].name, 'reopened',
+        )
+
+    def test_anonymous(self):
+        """Test anonymous users get the description only."""
+        self.client.logout()
+        response = self.client.get(reverse('home'))
+        self.assertNotIn('dashboard', response.context)
@@ -0,0 +1,158 @@
+"""Error reporting tests."""
+import json
+import logging
+import sys
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import mock
+
+import rollbar
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+from task_manager import error_reporting
+
+
+class ReceiverHandler(BaseHTTPRequestHandler):
+    """Stand-in of the Rollbar API keeping posted items."""
+
+    def do_POST(self):  # noqa: N802
+        """Keep the item, answer after the delay of the server."""
+        length = int(self.headers['Content-Length'])
+        self.server.items.append(json.loads(self.rfile.read(length)))
+        time.sleep(self.server.delay)
+        body = json.dumps({'err': 0, 'result': {'uuid': '1'}}).encode()
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """
+        Keep the test output clean.
+
+        Args:
+            args: format and its arguments
+        """
+
+
+def fail(message: str):
+    """
+    Raise the same exception from the same line.
+
+    Args:
+        message: message of the exception
+
+    Raises:
+        ValueError: always
+    """
+    raise ValueError(message)
+
+
+class TestErrorReportingCase(TestCase):
+    """Test errors are reported in batches by a thread."""
+
+    def setUp(self):
+        """Start the receiver, point Rollbar to it."""
+        self.server = HTTPServer(('127.0.0.1', 0), ReceiverHandler)
+        self.server.items = []
+        self.server.delay = 0
+        threading.Thread(target=self.server.serve_forever).start()
+        patch = mock.patch.dict(rollbar.SETTINGS, {
+            'endpoint': 'http://127.0.0.1:{port}/api/1/'.format(
+                port=self.server.server_port,
+            ),
+            'access_token': 'test',
+            'enabled': True,
+            'handler': 'blocking',
+            'suppress_reinit_warning': True,
+        })
+        patch.start()
+        self.addCleanup(patch.stop)
+        # Rollbar is initialized by the middleware.
+        self.middleware = error_reporting.ErrorReportingMiddleware(
+            lambda request: None,
+        )
+
+    def tearDown(self):
+        """Stop the receiver."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def report(
+        self, reporter: error_reporting.ErrorReporter, message: str,
+    ) -> bool:
+        """
+        Report an exception.
+
+        Args:
+            reporter: reporter
+            message: message of the exception
+
+        Returns:
+            bool: queued
+        """
+        try:
+            fail(message)
+        except ValueError:
+            return reporter.report(sys.exc_info())
+
+    def test_deduplicated(self):
+        """Test repeated exceptions of a batch are sent once."""
+        reporter = error_reporting.ErrorReporter(
+            max_size=10, batch_size=10, flush_interval=0.5,
+        )
+        for number in range(3):
+            self.report(reporter, 'task {number}'.format(number=number))
+        try:
+            {}['other']  # noqa: WPS428
+        except KeyError:
+            reporter.report(sys.exc_info())
+        reporter.close(5)
+        posted = [entry['data'] for entry in self.server.items]
+        self.assertEqual(
+            [entry['custom']['occurrences'] for entry in posted], [3, 1],
+        )
+        self.assertNotEqual(
+            posted[0]['fingerprint'], posted[1]['fingerprint'],
+        )
+
+    def test_slow_endpoint(self):
+        """Test the request is not stalled, its data is snapshot."""
+        self.server.delay = 1
+        user = get_user_model().objects.create_user(username='test')
+        request = RequestFactory().get('/tasks/', {'status': '1'})
+        request.user = user
+        started = time.perf_counter()
+        try:
+            fail('slow')
+        except ValueError as exc:
+            self.middleware.process_exception(request, exc)
+        self.assertLess(time.perf_counter() - started, 0.5)
+        error_reporting.flush()
+        posted = self.server.items[0]['data']
+        self.assertEqual(posted['request']['GET'], {'status': '1'})
+        self.assertEqual(posted['person']['username'], 'test')
+
+    def test_full_queue(self):
+        """Test occurrences are dropped when the queue is full."""
+        sending = threading.Event()
+        released = threading.Event()
+
+        def send(occurrence, count):  # noqa: WPS430
+            sending.set()
+            released.wait(5)
+
+        reporter = error_reporting.ErrorReporter(
+            max_size=1, batch_size=1, flush_interval=0, send=send,
+        )
+        self.assertTrue(self.report(reporter, 'sent'))
+        sending.wait(5)
+        self.assertTrue(self.report(reporter, 'queued'))
+        self.assertFalse(self.report(reporter, 'dropped'))
+        with self.assertLogs(error_reporting.logger, logging.WARNING) as logs:
+            released.set()
+            reporter.close(5)
+        self.assertIn('Dropped 1 error reports', logs.output[0])
@@ -0,0 +1,193 @@
+"""Query count budget of every named URL."""
+from http import HTTPStatus
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Tuple
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, reverse
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Tasks
+from task_manager.tasks.seeding import ScaleSeeder, get_seed_prefix
+from task_manager.urls import urlpatterns
+
+# Queries of a GET with an empty cache, whatever the count of rows.
+BUDGETS = MappingProxyType({
+    'home': 6,
+    'login': 2,
+    'logout': 4,
+    'users': 4,
+    'create_user': 2,
+    'update_user': 3,
+    'delete_user': 3,
+    'detail_user': 4,
+    'statuses': 5,
+    'create_status': 2,
+    'update_status': 3,
+    'delete_status': 3,
+    'tasks': 9,
+    'create_task': 5,
+    'bulk_tasks': 2,
+    'export_tasks': 3,
+    'task_events': 2,
+    'task_row': 5,
+    'update_task': 7,
+    'delete_task': 4,
+    'detail_task': 8,
+    'labels': 5,
+    'create_label': 2,
+    'update_label': 3,
+    'delete_label': 3,
+})
+# Seeds and scales of the small and the large dataset.
+SCALES = ((1, 0.01), (2, 0.05))
+SKIPPED_NAMESPACES = frozenset(('admin',))
+# Seconds the events stream lasts, it ends instead of waiting for events.
+STREAM_TIMEOUT = 0.01
+
+
+def iter_named_urls(
+    patterns: List[Any],
+    urlconf: str = '',
+) -> Iterator[Tuple[str, str, List[str]]]:
+    """
+    Iterate over named URLs of the patterns.
+
+    Args:
+        patterns: url patterns
+        urlconf: module of the patterns
+
+    Yields:
+        Tuple: name, module of the patterns and names of URL arguments
+    """
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.app_name in SKIPPED_NAMESPACES:
+                continue
+            yield from iter_named_urls(
+                pattern.url_patterns,
+                getattr(
+                    pattern.urlconf_name, '__name__', pattern.urlconf_name,
+                ),
+            )
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield (
+                pattern.name,
+                urlconf,
+                list(pattern.pattern.converters),
+            )
+
+
+@override_settings(TASK_EVENTS_STREAM_TIMEOUT=STREAM_TIMEOUT)
+class TestQueryBudgetCase(TestCase):
+    """Test queries of pages do not grow with the data."""
+
+    def seed(self, seed: int, scale: float) -> None:
+        """
+        Add generated rows, log in as a user creating and executing tasks.
+
+        Args:
+            seed: random seed
+            scale: scale factor
+        """
+        ScaleSeeder(seed, scale).seed()
+        if seed == SCALES[0][0]:
+            self.user = get_user_model().objects.get(
+                username='{prefix}user1'.format(prefix=get_seed_prefix(seed)),
+            )
+
+    def get_url(self, name: str, urlconf: str, arg_names: List[str]) -> str:
+        """
+        Build the URL, objects belong to the logged in user.
+
+        Args:
+            name: url name
+            urlconf: module of the url pattern
+            arg_names: names of URL arguments
+
+        Returns:
+            str:
+        """
+        if not arg_names:
+            return reverse(name)
+        targets = {
+            'task_manager.tasks.urls': lambda: Tasks.objects.filter(
+                creator=self.user,
+            ).first(),
+            'task_manager.users.urls': lambda: self.user,
+            'task_manager.statuses.urls': Status.objects.first,
+            'task_manager.labels.urls': Label.objects.first,
+        }
+        return reverse(name, kwargs={'pk': targets[urlconf]().pk})
+
+    def measure(self) -> Dict[str, CaptureQueriesContext]:
+        """
+        Get every named URL with an empty cache, streams read to the end.
+
+        Returns:
+            Dict: captured queries by url name
+        """
+        measured = {}
+        for name, urlconf, arg_names in iter_named_urls(urlpatterns):
+            url = self.get_url(name, urlconf, arg_names)
+            self.client.force_login(self.user)
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+            self.assertLess(
+                response.status_code,
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                url,
+            )
+            measured[name] = queries
+        return measured
+
+    def report(self, queries: CaptureQueriesContext) -> str:
+        """
+        Format queries of a page.
+
+        Args:
+            queries: captured queries
+
+        Returns:
+            str:
+        """
+        return '\n'.join(
+            '{number}. {sql}'.format(number=number, sql=query['sql'])
+            for number, query in enumerate(queries.captured_queries, 1)
+        )
+
+    def test_every_url_has_budget(self):
+        """Test new URLs get a declared budget."""
+        names = {name for name, _urlconf, _args in iter_named_urls(urlpatterns)}
+        self.assertEqual(names, set(BUDGETS))
+
+    def test_queries_within_budget_and_constant(self):
+        """Test queries are under budget and the same for both sizes."""
+        measured = []
+        for seed, scale in SCALES:
+            self.seed(seed, scale)
+            measured.append(self.measure())
+        small, large = measured
+        for name, budget in BUDGETS.items():
+            with self.subTest(url=name):
+                self.assertEqual(
+                    len(small[name]),
+                    len(large[name]),
+                    'Queries grow with the data:\n{sql}'.format(
+                        sql=self.report(large[name]),
+                    ),
+                )
+                self.assertLessEqual(
+                    len(large[name]),
+                    budget,
+                    'Over budget of {budget}:\n{sql}'.format(
+                        budget=budget, sql=self.report(large[name]),
+                    ),
+                )
@@ -0,0 +1,120 @@
+"""Reference cache tests."""
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.filters import TasksFilter
+from task_manager.tasks.forms import TasksForm
+
+
+class TestReferenceCacheCase(TestCase):
+    """Test choices of tasks form and filter are served from the cache."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setup once test data."""
+        cls.credentials = {'username': 'test', 'password': 'test'}
+        cls.user = get_user_model().objects.create_user(**cls.credentials)
+        cls.status = Status.objects.create(name='open')
+        cls.label = Label.objects.create(name='bug')
+
+    def setUp(self):
+        """Setup always when test executed."""
+        cache.clear()
+
+    def render_filter(self) -> str:
+        """
+        Render tasks filter form.
+
+        Returns:
+            str:
+        """
+        request = SimpleNamespace(user=self.user)
+        return str(TasksFilter(data={}, request=request).form)
+
+    def test_no_queries_in_steady_state(self):
+        """Test form and filter render choices without queries."""
+        str(TasksForm())
+        self.render_filter()
+        with self.assertNumQueries(0):
+            form_html = str(TasksForm())
+            filter_html = self.render_filter()
+        for html in (form_html, filter_html):
+            self.assertIn('open', html)
+            self.assertIn('bug', html)
+
+    def test_invalidated_on_change(self):
+        """Test changed rows are listed after a write."""
+        str(TasksForm())
+        Status.objects.create(name='closed')
+        self.label.name = 'feature'
+        self.label.save()
+        form_html = str(TasksForm())
+        self.assertIn('closed', form_html)
+        self.assertIn('feature', form_html)
+
+        self.label.delete()
+        self.assertNotIn('feature', self.render_filter())
+
+    def test_login_keeps_users_cached(self):
+        """Test saving the last login does not drop cached users."""
+        str(TasksForm())
+        self.client.login(**self.credentials)
+        with self.assertNumQueries(0):
+            str(TasksForm())
+
+    def test_form_validation(self):
+        """Test submitted choices are checked against cached rows."""
+        form_data = {
+            'name': 'task',
+            'status': self.status.pk,
+            'executor': self.user.pk,
+            'labels': [self.label.pk],
+        }
+        form = TasksForm(data=form_data)
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data['status'], self.status)
+        self.assertEqual(form.cleaned_data['labels'], [self.label])
+
+        invalid_values = (
+            ('status', 0),
+            ('executor', 'x'),
+            ('labels', [self.label.pk, 0]),
+        )
+        for field, invalid_value in invalid_values:
+            form = TasksForm(data=dict(form_data, **{field: invalid_value}))
+            self.assertFalse(form.is_valid())
+            self.assertIn(field, form.errors)
+
+
+class TestOtherProcessCase(TestCase):
+    """Test rows written by another process, which bumped its own cache."""
+
+    def setUp(self):
+        """Setup always when test executed."""
+        cache.clear()
+        str(TasksForm())
+        # bulk_create sends no signals, the version stays the same.
+        Status.objects.bulk_create([Status(name='closed')])
+        self.status = Status.objects.get(name='closed')
+
+    def test_choice_validated(self):
+        """Test a choice missing from the cached rows is read."""
+        form = TasksForm(data={'name': 'task', 'status': self.status.pk})
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data['status'], self.status)
+        self.assertNotIn('closed', str(TasksForm()))
+
+    @override_settings(CACHE_SHARED=False, CACHE_VERSION_TIMEOUT=1)
+    def test_version_expires(self):
+        """Test rows are reloaded once the version of a local cache expires."""
+        cache.clear()
+        str(TasksForm())
+        expired = time.time() + 2
+        with mock.patch('time.time', return_value=expired):
+            self.assertIn('closed', str(TasksForm()))
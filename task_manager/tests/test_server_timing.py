@@ -0,0 +1,124 @@
+"""Server-Timing header tests."""
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.template.backends.django import Template
+from django.template.response import TemplateResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from task_manager.server_timing import HEADER, RequestTimings
+from task_manager.statuses.views import StatusListView
+
+# Seconds every template rendering of test_coroutine_view takes at least.
+RENDER_DELAY = 0.05
+
+render_template = Template.render
+
+
+def slow_render(template, *args, **kwargs):
+    """
+    Render the template, slowly.
+
+    Args:
+        template: template
+        args: positional arguments of the rendering
+        kwargs: keyword arguments of the rendering
+
+    Returns:
+        SafeString:
+    """
+    time.sleep(RENDER_DELAY)
+    return render_template(template, *args, **kwargs)
+
+
+class TestServerTimingCase(TestCase):
+    """Test phases of requests are reported."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setup once test data."""
+        cls.user = get_user_model().objects.create_user(username='test')
+
+    def get_metrics(self, url: str) -> dict:
+        """
+        Get the url, parse the header.
+
+        Args:
+            url: url
+
+        Returns:
+            dict: parameters by metric name
+        """
+        response = self.client.get(url)
+        metrics = {}
+        for metric in response[HEADER].split(', '):
+            name, *params = metric.split(';')
+            metrics[name] = dict(param.split('=', 1) for param in params)
+        return metrics
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1)
+    def test_template_response(self):
+        """Test db, view, template and total timings of a page."""
+        self.client.force_login(self.user)
+        metrics = self.get_metrics(reverse('statuses'))
+        self.assertEqual(list(metrics), ['db', 'view', 'tpl', 'total'])
+        self.assertRegex(metrics['db']['desc'], r'^"[1-9]\d* queries"$')
+        self.assertGreaterEqual(
+            float(metrics['total']['dur']),
+            float(metrics['tpl']['dur']),
+        )
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1)
+    def test_coroutine_view(self):
+        """Test a page rendered by a coroutine view reports its rendering."""
+        self.client.force_login(self.user)
+        with mock.patch.object(
+            Template, 'render', side_effect=slow_render, autospec=True,
+        ):
+            metrics = self.get_metrics(reverse('tasks'))
+        self.assertEqual(list(metrics), ['db', 'view', 'tpl', 'total'])
+        self.assertGreaterEqual(
+            float(metrics['tpl']['dur']), RENDER_DELAY * 1000,
+        )
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1)
+    def test_concurrent_queries(self):
+        """Test queries of concurrent threads are all counted."""
+        timings = RequestTimings()
+        queries = 100
+
+        def run_queries():  # noqa: WPS430
+            for _ in range(queries):
+                timings(mock.Mock(), 'SELECT 1', None, many=False, context={})
+
+        threads = [threading.Thread(target=run_queries) for _ in range(4)]
+        for started in threads:
+            started.start()
+        for finished in threads:
+            finished.join()
+        self.assertEqual(timings.db_count, queries * len(threads))
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1)
+    def test_rendered_response(self):
+        """Test a response rendered by the view has no template timing."""
+        self.client.force_login(self.user)
+        response = TemplateResponse(RequestFactory().get('/'), 'index.html')
+        response.render()
+        with mock.patch.object(
+            StatusListView, 'get', return_value=response,
+        ):
+            metrics = self.get_metrics(reverse('statuses'))
+        self.assertEqual(list(metrics), ['db', 'view', 'total'])
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1)
+    def test_redirect(self):
+        """Test a response without template has no template timing."""
+        metrics = self.get_metrics(reverse('tasks'))
+        self.assertEqual(list(metrics), ['db', 'view', 'total'])
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0)
+    def test_not_sampled(self):
+        """Test the header is opt-in."""
+        self.assertNotIn(HEADER, self.client.get(reverse('tasks')))
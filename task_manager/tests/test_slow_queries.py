@@ -0,0 +1,64 @@
+"""Slow query log tests."""
+import json
+import logging
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from task_manager.slow_queries import logger
+
+
+class TestSlowQueryLogCase(TestCase):
+    """Test slow queries of requests are logged as JSON lines."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setup once test data."""
+        cls.user = get_user_model().objects.create_user(username='test')
+
+    def setUp(self):
+        """Setup always when test executed."""
+        self.client.force_login(self.user)
+
+    def get_entries(self) -> list:
+        """
+        Get the task list, collect logged entries.
+
+        Returns:
+            list: decoded entries
+        """
+        with self.assertLogs(logger, logging.WARNING) as logs:
+            self.client.get(reverse('tasks'))
+            # assertLogs() fails without any record.
+            logger.warning('null')
+        return [json.loads(record.getMessage()) for record in logs.records]
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_SAMPLE_RATE=1)
+    def test_entry(self):
+        """Test entries carry the query, its duration and origin."""
+        entries = self.get_entries()[:-1]
+        self.assertTrue(entries)
+        entry = next(
+            entry for entry in entries if 'tasks_tasks' in entry['sql']
+        )
+        self.assertEqual(entry['url_name'], 'tasks')
+        self.assertEqual(entry['view'], 'task_manager.tasks.views.TaskListView')
+        self.assertEqual(entry['path'], reverse('tasks'))
+        self.assertGreaterEqual(entry['duration_ms'], 0)
+        self.assertIsInstance(entry['params'], list)
+        self.assertTrue(entry['origin'].startswith('task_manager/'))
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=10000)
+    def test_fast_queries_skipped(self):
+        """Test queries under the threshold are not logged."""
+        self.assertEqual(self.get_entries(), [None])
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_SAMPLE_RATE=0)
+    def test_sampling(self):
+        """Test queries out of the sample are not logged."""
+        self.assertEqual(self.get_entries(), [None])
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=None)
+    def test_disabled(self):
+        """Test the log is disabled without a threshold."""
+        self.assertEqual(self.get_entries(), [None])
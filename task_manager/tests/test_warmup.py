@@ -0,0 +1,33 @@
+"""Warm-up tests."""
+import gc
+import os
+
+from django.template import engines
+from django.test import SimpleTestCase
+from task_manager.warmup import SMAPS_ROLLUP, get_memory_usage, warm_up
+
+
+class TestWarmUpCase(SimpleTestCase):
+    """Test the application is warmed up before forking."""
+
+    def tearDown(self):
+        """Clean up always after test executed."""
+        gc.unfreeze()
+
+    def test_warm_up(self):
+        """Test templates, URL names and languages are loaded."""
+        report = warm_up()
+        self.assertGreater(report.templates, 0)
+        self.assertGreater(report.urls, 0)
+        self.assertEqual(report.languages, 2)
+        self.assertGreater(gc.get_freeze_count(), 0)
+        engines['django'].get_template('tasks/index.html')
+
+    def test_memory_usage(self):
+        """Test memory usage is reported where the system exposes it."""
+        usage = get_memory_usage()
+        if not os.path.exists(SMAPS_ROLLUP):
+            self.assertEqual(usage, {})
+            return
+        self.assertEqual(list(usage), ['rss', 'pss', 'shared', 'private'])
+        self.assertGreater(usage['rss'], 0)
@@ -0,0 +1,110 @@
+"""Authentication backend tests."""
+from http import HTTPStatus
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+class TestAuthSettingsCase(TestCase):
+    """Test the user is cached only with a cache shared by the workers."""
+
+    def test_process_local_cache(self):
+        """Test sessions and users are read from the database."""
+        if settings.CACHE_SHARED:
+            self.skipTest('The cache is shared')
+        self.assertEqual(
+            settings.AUTHENTICATION_BACKENDS,
+            ['django.contrib.auth.backends.ModelBackend'],
+        )
+        self.assertEqual(
+            settings.SESSION_ENGINE, 'django.contrib.sessions.backends.db',
+        )
+
+
+@override_settings(
+    AUTHENTICATION_BACKENDS=['task_manager.users.backends.CachedModelBackend'],
+    SESSION_ENGINE='django.contrib.sessions.backends.cached_db',
+)
+class TestCachedUserCase(TestCase):
+    """Test sessions and users of requests are read from the cache."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Setup once test data."""
+        cls.credentials = {'username': 'test', 'password': 'test'}
+        cls.user = get_user_model().objects.create_user(**cls.credentials)
+
+    def setUp(self):
+        """Setup always when test executed."""
+        cache.clear()
+        self.client.login(**self.credentials)
+
+    def get_home(self) -> CaptureQueriesContext:
+        """
+        Get the home page.
+
+        Returns:
+            CaptureQueriesContext: queries of the request
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('home'))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return queries
+
+    def get_tables(self, queries: CaptureQueriesContext) -> list:
+        """
+        Get session and user tables read by the queries.
+
+        Args:
+            queries: captured queries
+
+        Returns:
+            list:
+        """
+        tables = (Session._meta.db_table, get_user_model()._meta.db_table)
+        return [
+            table
+            for query in queries.captured_queries
+            for table in tables
+            if 'FROM "{table}"'.format(table=table) in query['sql']
+        ]
+
+    def test_no_session_or_user_queries(self):
+        """Test a repeated page view reads neither sessions nor users."""
+        self.assertIn(
+            get_user_model()._meta.db_table, self.get_tables(self.get_home()),
+        )
+        self.assertEqual(self.get_tables(self.get_home()), [])
+
+    def test_invalidated_on_save(self):
+        """Test a changed user is read again."""
+        self.get_home()
+        self.user.first_name = 'Renamed'
+        self.user.save()
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response.context['user'].first_name, 'Renamed')
+
+    def test_password_change_logs_out(self):
+        """Test sessions of a changed password are rejected."""
+        self.get_home()
+        self.user.set_password('changed')
+        self.user.save()
+        response = self.client.get(reverse('tasks'))
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+    def test_messages_do_not_write_session(self):
+        """Test a success message is kept out of the session."""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(reverse('create_status'), {'name': 'open'})
+        self.assertFalse([
+            query for query in queries.captured_queries
+            if 'UPDATE "{table}"'.format(
+                table=Session._meta.db_table,
+            ) in query['sql']
+        ])
@@ -4,6 +4,10 @@ from http import HTTPStatus
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.urls import reverse
+from task_manager.cache import get_version
+from task_manager.paginators import get_count_namespace
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Tasks
 from task_manager.users.views import UserListView
 from task_manager.utils import load_file_from_fixture
 
@@ -128,6 +132,13 @@ class TestLoginLogoutViewCase(TestCase):
         self.assertRedirects(response, reverse('home'))
         self.assertTrue(response.context['user'].is_authenticated)
 
+    def test_login_keeps_counts(self):
+        """Test a login does not drop cached counts of users lists."""
+        namespace = get_count_namespace(self.user_model)
+        version = get_version(namespace)
+        self.client.post(reverse('login'), data=self.user)
+        self.assertEqual(get_version(namespace), version)
+
     def test_logout(self):
         """Test logout user."""
         response = self.client.get(reverse('logout'), follow=True)
@@ -217,6 +228,24 @@ class TestDeleteCase(TestCase):
             ).exists()  # noqa: C812
         )
 
+    def test_delete_in_use(self):
+        """Test an executor of tasks is not deleted."""
+        Tasks.objects.create(
+            name='test_task',
+            status=Status.objects.create(name='test_status'),
+            creator=self.user_model.objects.create(
+                **self.users_data['user2'],
+            ),
+            executor=self.user,
+        )
+        url = reverse('delete_user', args=[self.user.pk])
+        self.assertContains(self.client.get(url), 'disabled')
+        response = self.client.post(path=url)
+        self.assertRedirects(response, reverse('users'))
+        self.assertTrue(
+            self.user_model.objects.filter(pk=self.user.pk).exists(),
+        )
+
     def test_delete_user_without_permission(self):
         """Test delete user without permission."""
         user2 = self.user_model.objects.create(
@@ -7,3 +7,7 @@ class UsersConfig(AppConfig):
 
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'task_manager.users'
+
+    def ready(self) -> None:
+        """Connect signals."""
+        from task_manager.users import signals  # noqa: F401, WPS433
@@ -0,0 +1,58 @@
+"""Authentication backends."""
+from typing import Any, Optional
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from task_manager.cache import bump_version, make_key
+
+
+def get_user_namespace(user_id: Any) -> str:
+    """
+    Get cache namespace of the user row.
+
+    Args:
+        user_id: user primary key
+
+    Returns:
+        str:
+    """
+    return 'user:{id}'.format(id=user_id)
+
+
+def invalidate_user(user_id: Any) -> None:
+    """
+    Drop the cached row of the user.
+
+    Args:
+        user_id: user primary key
+    """
+    bump_version(get_user_namespace(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """Model backend resolving the user of a session from the cache.
+
+    The users signals invalidate the row on every save, e.g. of a new
+    password, so the session hash is checked against the current one.
+    Counters moved by update() are not invalidated and may lag behind on
+    request.user.
+    """
+
+    def get_user(self, user_id) -> Optional[Any]:
+        """
+        Get the active user by primary key.
+
+        Args:
+            user_id: user primary key
+
+        Returns:
+            Optional:
+        """
+        key = make_key(get_user_namespace(user_id))
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, timeout=settings.USER_CACHE_TIMEOUT)
+        return user
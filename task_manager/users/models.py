@@ -22,6 +22,10 @@ class CustomUser(AbstractUser):
             'blank': _('ThisFieldCannotBeBlank'),
         },
     )
+    updated_at = models.DateTimeField(auto_now=True)
+    # Tasks created by and assigned to the user, kept by the tasks signals
+    created_count = models.PositiveIntegerField(default=0, editable=False)
+    assigned_count = models.PositiveIntegerField(default=0, editable=False)
 
     def get_absolute_url(self):  # noqa: D102
         return reverse_lazy('users')
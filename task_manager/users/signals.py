@@ -0,0 +1,61 @@
+"""Users signals."""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from task_manager.cache import bump_version
+from task_manager.paginators import get_count_namespace
+from task_manager.reference import invalidate_reference
+from task_manager.users.backends import invalidate_user
+from task_manager.users.models import CustomUser
+
+# Saved by every login, shown by neither lists nor reference rows.
+LOGIN_FIELDS = frozenset(('last_login',))
+
+
+def _is_login(update_fields) -> bool:
+    return bool(update_fields) and set(update_fields) <= LOGIN_FIELDS
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_users_count(sender, update_fields=None, **kwargs) -> None:
+    """
+    Invalidate cached counts of users lists, a login does not change them.
+
+    Args:
+        sender: model class
+        update_fields: fields passed to save()
+        kwargs: signal arguments
+    """
+    if _is_login(update_fields):
+        return
+    bump_version(get_count_namespace(CustomUser))
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_users_reference(sender, update_fields=None, **kwargs) -> None:
+    """
+    Drop cached user rows, a login alone does not change them.
+
+    Args:
+        sender: model class
+        update_fields: fields passed to save()
+        kwargs: signal arguments
+    """
+    if _is_login(update_fields):
+        return
+    invalidate_reference(CustomUser)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_cached_user(sender, instance, **kwargs) -> None:
+    """
+    Drop the cached row of the user resolving its sessions.
+
+    Args:
+        sender: model class
+        instance: saved or deleted user
+        kwargs: signal arguments
+    """
+    invalidate_user(instance.pk)
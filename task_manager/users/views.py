@@ -5,29 +5,43 @@ from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.views import LoginView, LogoutView
 from django.contrib.messages.views import SuccessMessageMixin
-from django.db.models.deletion import ProtectedError
-from django.http.response import HttpResponseRedirect
-from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views.generic.detail import DetailView
 from django.views.generic.edit import CreateView, DeleteView, UpdateView
 from django.views.generic.list import ListView
-from task_manager.mixins import CustomLoginRequiredMixin
+from task_manager.async_views import AsyncConditionalGetMixin
+from task_manager.mixins import (
+    CachedCountPaginationMixin,
+    CustomLoginRequiredMixin,
+    InUseListMixin,
+    ProtectedDeleteMixin,
+)
+from task_manager.tasks.models import Tasks
 from task_manager.users.forms import CustomUserCreationForm
 from task_manager.users.mixins import UserIsHimselfMixin
 
 
-class UserListView(ListView):
+class UserListView(
+    InUseListMixin,
+    AsyncConditionalGetMixin,
+    CachedCountPaginationMixin,
+    ListView,
+):
     """User listing."""
 
     model = get_user_model()
     paginate_by = 10
     context_object_name = 'users_list'
     template_name = 'users/index.html'
+    in_use_relations = ((Tasks, 'creator'), (Tasks, 'executor'))
 
 
-class UserDetailView(CustomLoginRequiredMixin, DetailView):
+class UserDetailView(
+    AsyncConditionalGetMixin,
+    CustomLoginRequiredMixin,
+    DetailView,
+):
     """User detail view."""
 
     model = get_user_model()
@@ -62,9 +76,10 @@ class UserUpdateView(
     redirect_url = reverse_lazy('users')
 
 
-class UserDeleteView(
+class UserDeleteView(  # noqa: WPS215
     CustomLoginRequiredMixin,
     UserIsHimselfMixin,
+    ProtectedDeleteMixin,
     SuccessMessageMixin,
     DeleteView,
 ):
@@ -77,24 +92,9 @@ class UserDeleteView(
     success_message = _('SuccessDeleteUser')
     error_message = _('ErrorUserNotHaveRights')
     redirect_url = reverse_lazy('users')
-
-    def post(self, request, *args, **kwargs) -> HttpResponseRedirect:
-        """
-        Override 'post' in DeletionMixin.
-
-        Args:
-            request: request
-
-        Returns:
-            Union:
-        """
-        try:
-            response = self.delete(request, *args, **kwargs)
-            messages.success(self.request, self.success_message)
-            return response
-        except ProtectedError:
-            messages.error(self.request, _('CannotDeleteUser'))
-            return redirect('users')
+    in_use_relations = UserListView.in_use_relations
+    protected_message = _('CannotDeleteUser')
+    protected_url = reverse_lazy('users')
 
 
 class UserLoginView(SuccessMessageMixin, LoginView):
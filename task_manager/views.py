@@ -1,8 +1,26 @@
 """Task manager views."""
+from typing import Any
+
 from django.views.generic.base import TemplateView
+from task_manager.tasks.dashboard import get_dashboard
 
 
 class HomePageView(TemplateView):
     """Home page view."""
 
     template_name = 'index.html'
+
+    def get_context_data(self, **kwargs) -> Any:
+        """
+        Add the dashboard of the logged in user.
+
+        Args:
+            kwargs: context arguments
+
+        Returns:
+            Any:
+        """
+        context = super().get_context_data(**kwargs)
+        if self.request.user.is_authenticated:
+            context['dashboard'] = get_dashboard(self.request.user.pk)
+        return context
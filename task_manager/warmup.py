@@ -0,0 +1,133 @@
+"""Warm-up of the application before forking workers.
+
+Everything a worker would build lazily on its first requests is built
+once in the master process: compiled templates of all template
+directories with their tag libraries, URL resolver dictionaries of every
+language and translation catalogs. Forked workers share these pages with
+the master until they write to them, gc.freeze() keeps the collector
+from touching them.
+"""
+import gc
+import os
+from typing import Dict, Iterator, NamedTuple
+
+from django.conf import settings
+from django.db import connections
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.template.utils import get_app_template_dirs
+from django.urls import get_resolver
+from django.utils import translation
+
+SMAPS_ROLLUP = '/proc/self/smaps_rollup'
+# Fields of smaps_rollup summed into the reported ones, in kB.
+MEMORY_FIELDS = (
+    ('rss', ('Rss',)),
+    ('pss', ('Pss',)),
+    ('shared', ('Shared_Clean', 'Shared_Dirty')),
+    ('private', ('Private_Clean', 'Private_Dirty')),
+)
+
+
+class WarmUpReport(NamedTuple):
+    """Counts of warmed up objects."""
+
+    templates: int
+    urls: int
+    languages: int
+
+
+def _iter_template_names() -> Iterator[str]:
+    directories = [
+        *(
+            directory
+            for engine in settings.TEMPLATES
+            for directory in engine.get('DIRS', [])
+        ),
+        *get_app_template_dirs('templates'),
+    ]
+    for directory in directories:
+        for root, _dirs, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith(('.html', '.txt')):
+                    yield os.path.relpath(
+                        os.path.join(root, filename), directory,
+                    )
+
+
+def compile_templates() -> int:
+    """
+    Compile every template, kept by the cached loader when DEBUG is off.
+
+    Returns:
+        int: count of compiled templates
+    """
+    compiled = 0
+    for name in set(_iter_template_names()):
+        for engine in engines.all():
+            try:
+                engine.get_template(name)
+            except (TemplateDoesNotExist, TemplateSyntaxError):
+                continue
+            compiled += 1
+    return compiled
+
+
+def populate_urls() -> int:
+    """
+    Build URL resolver dictionaries and load catalogs of every language.
+
+    Returns:
+        int: count of URL names
+    """
+    resolver = get_resolver()
+    names = 0
+    for language, _name in settings.LANGUAGES:
+        with translation.override(language):
+            names = len([
+                name for name in resolver.reverse_dict if isinstance(name, str)
+            ])
+            resolver.namespace_dict  # noqa: WPS428
+            resolver.app_dict  # noqa: WPS428
+    return names
+
+
+def warm_up() -> WarmUpReport:
+    """
+    Warm up the application, then freeze the objects it built.
+
+    Returns:
+        WarmUpReport:
+    """
+    report = WarmUpReport(
+        templates=compile_templates(),
+        urls=populate_urls(),
+        languages=len(settings.LANGUAGES),
+    )
+    # Connections must not be shared with forked workers.
+    connections.close_all()
+    gc.collect()
+    gc.freeze()
+    return report
+
+
+def get_memory_usage() -> Dict[str, int]:
+    """
+    Get memory usage of the current process.
+
+    Returns:
+        Dict: kB by 'rss', 'pss', 'shared' and 'private', empty when the
+            system does not report them
+    """
+    fields = {}
+    try:
+        with open(SMAPS_ROLLUP, encoding='ascii') as smaps:
+            for line in smaps:
+                name, _, size = line.partition(':')
+                if size.rstrip().endswith(' kB'):
+                    fields[name] = int(size.split()[0])
+    except OSError:
+        return {}
+    return {
+        name: sum(fields.get(field, 0) for field in summed)
+        for name, summed in MEMORY_FIELDS
+    }